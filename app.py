@@ -18,6 +18,7 @@ sys.path.insert(0, str(Path(__file__).parent))
 from config.settings import HOSPITAL_META_PATH, PRODUCTS_JSON_PATH
 from config.placeholder_queries import PLACEHOLDER_QUERIES
 from utils.ai_engine import RAGEngine, CellTagMapping
+from utils.answer_cache import get_answer_cache
 from utils.doc_processor import (
     detect_taggable_cells,
     find_placeholders_in_doc,
@@ -26,6 +27,8 @@ from utils.doc_processor import (
     TaggableCell,
     CellType,
 )
+from utils.embedding_providers import get_embedding_provider
+from utils.index_store import close_vectorstore, get_index_dir, load_lexical_index, read_manifest
 from utils.pdf_loader import build_vectorstore
 
 logging.basicConfig(level=logging.INFO)
@@ -78,6 +81,13 @@ def _init_session_state() -> None:
             st.session_state[key] = val
 
 
+def _release_vectorstore() -> None:
+    """세션의 벡터스토어와 RAG 엔진을 내려놓고, 열어 둔 인덱스 파일 핸들을 닫음."""
+    close_vectorstore(st.session_state.vectorstore)
+    st.session_state.vectorstore = None
+    st.session_state.rag_engine = None
+
+
 _init_session_state()
 
 TEMPLATES_DIR = Path("templates")
@@ -200,8 +210,7 @@ with st.sidebar:
 
         if new_product != st.session_state.selected_product:
             st.session_state.selected_product = new_product
-            st.session_state.vectorstore = None
-            st.session_state.rag_engine = None
+            _release_vectorstore()
             st.session_state.indexed_files = []
             st.session_state.indexed_chunks = 0
             st.session_state.generated_results = {}
@@ -270,8 +279,7 @@ with tab_generate:
             if existing_pdfs and st.button("🗑️ 초기화", help="저장된 PDF를 모두 삭제합니다"):
                 for pdf in existing_pdfs:
                     pdf.unlink()
-                st.session_state.vectorstore = None
-                st.session_state.rag_engine = None
+                _release_vectorstore()
                 st.session_state.indexed_files = []
                 st.session_state.indexed_chunks = 0
                 st.rerun()
@@ -287,23 +295,37 @@ with tab_generate:
                 with open(master_data_dir / uf.name, "wb") as f:
                     f.write(uf.getbuffer())
             st.success(f"{len(uploaded_files)}개 파일 저장 완료")
-            st.session_state.vectorstore = None
-            st.session_state.rag_engine = None
+            _release_vectorstore()
 
         all_pdfs = sorted(master_data_dir.glob("*.pdf"))
         if all_pdfs:
             if st.session_state.vectorstore is None:
-                if not api_key:
+                embedding_provider = get_embedding_provider(product.get("embedding_provider"))
+                if embedding_provider.requires_api_key and not api_key:
                     st.warning("Google API 키를 입력해야 인덱싱할 수 있습니다.")
                 elif st.button("🔍 인덱싱 시작", type="primary"):
                     with st.spinner(f"{len(all_pdfs)}개 PDF 인덱싱 중..."):
                         try:
+                            index_dir = get_index_dir(master_data_dir)
                             vectorstore = build_vectorstore(
                                 file_paths=[str(p) for p in all_pdfs],
                                 api_key=api_key,
+                                index_dir=index_dir,
+                                incremental=True,
+                                extractor=product.get("pdf_extractor"),
+                                embedding_provider=product.get("embedding_provider"),
                             )
                             st.session_state.vectorstore = vectorstore
-                            st.session_state.rag_engine = RAGEngine(vectorstore, api_key)
+                            manifest = read_manifest(index_dir) or {}
+                            st.session_state.rag_engine = RAGEngine(
+                                vectorstore,
+                                api_key,
+                                lexical_index=load_lexical_index(index_dir),
+                                source_patterns=product.get("source_classes"),
+                                min_similarity=embedding_provider.min_similarity,
+                                corpus_fingerprint=manifest.get("fingerprint"),
+                                answer_cache=get_answer_cache(),
+                            )
                             st.session_state.indexed_files = [p.name for p in all_pdfs]
                             st.session_state.indexed_chunks = vectorstore.index.ntotal
                             st.rerun()
@@ -342,38 +364,73 @@ with tab_generate:
                 "템플릿에 `{{placeholder}}` 태그가 삽입되어 있는지 확인하세요."
             )
         else:
-            st.info(f"양식에서 **{len(placeholders)}개 항목** 탐지 완료")
+            _, distinct_queries, _ = RAGEngine.canonicalize_queries(
+                placeholders, [PLACEHOLDER_QUERIES.get(key, key) for key in placeholders]
+            )
+            st.info(
+                f"양식에서 **{len(placeholders)}개 항목** 탐지 완료"
+                + (f" (중복 제외 질의 {len(distinct_queries)}개)" if len(distinct_queries) < len(placeholders) else "")
+            )
 
             with st.expander("탐지된 항목 목록", expanded=False):
                 for i, key in enumerate(placeholders, 1):
                     query = PLACEHOLDER_QUERIES.get(key, key)
                     st.write(f"{i}. `{{{{{key}}}}}` — {query[:60]}")
 
+            use_answer_cache = st.checkbox(
+                "저장된 답변 재사용",
+                value=True,
+                help="같은 Master Data·질의·모델로 이미 생성한 항목은 LLM을 호출하지 않고 저장된 답변을 사용합니다. "
+                "끄면 모든 항목을 새로 생성합니다.",
+            )
+
             if st.button("🤖 문서 생성", type="primary", key="gen_auto"):
                 progress = st.progress(0)
                 status = st.empty()
                 replacements: dict[str, str] = {}
                 sources_info: dict[str, list[str]] = {}
 
-                for i, key in enumerate(placeholders):
-                    query_text = PLACEHOLDER_QUERIES.get(key, key)
-                    status.write(f"처리 중: **{key}** ({i+1}/{len(placeholders)})")
-                    try:
-                        result = rag_engine.query(
-                            field_id=key,
-                            custom_query=query_text,
-                        )
-                        replacements[key] = result.answer
-                        sources_info[key] = result.sources
-                    except Exception as e:
-                        replacements[key] = f"[생성 실패: {e}]"
-                        sources_info[key] = []
-                        logger.error("질의 실패: %s — %s", key, e)
-                    progress.progress((i + 1) / len(placeholders))
+                status.write(f"{len(placeholders)}개 항목 생성 중...")
+                completed: list[int] = []
+
+                # 생성 중인 답변을 도착하는 대로 표시 (완료 후 Step 3 편집 화면으로 대체)
+                live = st.empty()
+                live_panes = live.container()
+                live_slots: dict = {}
+                live_text: dict[int, str] = {}
+
+                def _show(i: int, text: str) -> None:
+                    if i not in live_slots:
+                        live_slots[i] = live_panes.empty()
+                    live_slots[i].markdown(f"**{placeholders[i]}**  \n{text}")
+
+                def _on_token(i: int, token: str) -> None:
+                    live_text[i] = live_text.get(i, "") + token
+                    _show(i, live_text[i] + "▌")
+
+                def _on_result(i: int, result) -> None:
+                    completed.append(i)
+                    _show(i, result.answer)
+                    status.write(f"완료: **{placeholders[i]}** ({len(completed)}/{len(placeholders)})")
+                    progress.progress(len(completed) / len(placeholders))
+
+                # 검색은 한 번에, LLM 요청은 LLM_MAX_CONCURRENCY개씩 동시에 진행
+                results = rag_engine.query_batch(
+                    placeholders,
+                    [PLACEHOLDER_QUERIES.get(key, key) for key in placeholders],
+                    on_result=_on_result,
+                    use_cache=use_answer_cache,
+                    on_token=_on_token,
+                )
+                cached_count = sum(result.cached for result in results)
+                for key, result in zip(placeholders, results):
+                    replacements[key] = result.answer
+                    sources_info[key] = result.sources
 
                 st.session_state.generated_results = replacements
                 st.session_state.generated_sources = sources_info
 
+                live.empty()
                 status.empty()
                 progress.empty()
 
@@ -388,6 +445,8 @@ with tab_generate:
                     st.warning(f"⚠️ 문서 생성 완료 — 성공: {success_count}개, 실패: {fail_count}개, 정보 없음: {empty_count}개")
                 else:
                     st.info(f"📄 문서 생성 완료 — 성공: {success_count}개, 정보 없음: {empty_count}개")
+                if cached_count:
+                    st.caption(f"저장된 답변 재사용: {cached_count}개 항목 (LLM 호출 없음)")
 
     st.divider()
 
@@ -433,6 +492,28 @@ with tab_generate:
                 elif quality == "✅":
                     st.caption("📚 참조 소스: (정보 없음)")
 
+                # 이 항목만 새로 생성 — 답변을 도착하는 대로 표시
+                if rag_engine and st.button("🔄 다시 생성", key=f"regen_{i}"):
+                    regenerated: list = []
+                    try:
+                        st.write_stream(
+                            rag_engine.query_stream(
+                                key,
+                                PLACEHOLDER_QUERIES.get(key, key),
+                                use_cache=False,
+                                on_complete=regenerated.append,
+                            )
+                        )
+                    except Exception as e:
+                        st.error(f"생성 실패: {e}")
+                    if regenerated:
+                        generated[key] = regenerated[0].answer
+                        sources_data[key] = regenerated[0].sources
+                        st.session_state.generated_sources = sources_data
+                        # 편집 칸이 새 답변으로 다시 그려지도록 이전 입력값 제거
+                        st.session_state.pop(f"edit_{i}", None)
+                        st.rerun()
+
         st.session_state.generated_results = edited_results
 
         st.divider()
@@ -0,0 +1,124 @@
+"""근사 최근접 이웃(HNSW/IVF) 인덱스의 recall-지연시간 비교.
+
+flat(정확 검색) 결과를 기준으로, 검색 파라미터(efSearch/nprobe)별 recall@k와
+질의 1건당 검색 지연시간을 측정합니다. RAGEngine처럼 질의를 한 건씩 검색합니다.
+
+사용법:
+    python -m benchmarks.ann_recall --index-dir products/polivy/index
+    python -m benchmarks.ann_recall --synthetic 50000 --dim 3072
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import faiss
+import numpy as np
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_DIR))
+
+from config.settings import INDEX_HNSW_EF_CONSTRUCTION, INDEX_HNSW_M, INDEX_IVF_NLIST, RETRIEVER_K  # noqa: E402
+from utils.index_store import INDEX_NAME, apply_search_params, build_search_index, index_data_dir  # noqa: E402
+
+EF_SEARCH_GRID = (16, 32, 64, 128, 256)
+NPROBE_GRID = (1, 4, 8, 16, 32, 64)
+
+
+def load_vectors(index_dir: Path) -> tuple[np.ndarray, int]:
+    """저장된 제품 인덱스의 벡터와 거리 척도."""
+    index = faiss.read_index(str(index_data_dir(index_dir) / f"{INDEX_NAME}.faiss"))
+    return index.reconstruct_n(0, index.ntotal), index.metric_type
+
+
+def synthetic_vectors(n: int, dim: int, seed: int = 0) -> np.ndarray:
+    """군집 구조가 있는 합성 벡터 (문서 임베딩처럼 주제별로 모여 있음)."""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((max(1, n // 200), dim), dtype=np.float32)
+    vectors = centers[rng.integers(0, len(centers), n)] + 0.3 * rng.standard_normal((n, dim), dtype=np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def make_queries(vectors: np.ndarray, count: int, seed: int = 1) -> np.ndarray:
+    """저장된 벡터 주변의 질의 벡터 (질의는 관련 청크와 가깝지만 같지는 않음)."""
+    rng = np.random.default_rng(seed)
+    picked = vectors[rng.choice(len(vectors), size=min(count, len(vectors)), replace=False)]
+    noise = rng.standard_normal(picked.shape, dtype=np.float32) * picked.std()
+    return np.ascontiguousarray(picked + 0.5 * noise, dtype=np.float32)
+
+
+def timed_search(index: faiss.Index, queries: np.ndarray, k: int) -> tuple[np.ndarray, float]:
+    """질의를 한 건씩 검색하여 (결과 ID, 질의당 평균 ms)."""
+    ids = np.empty((len(queries), k), dtype=np.int64)
+    started = time.perf_counter()
+    for i, query in enumerate(queries):
+        _, ids[i] = index.search(query[None, :], k)
+    return ids, (time.perf_counter() - started) * 1000 / len(queries)
+
+
+def recall_at_k(found: np.ndarray, truth: np.ndarray) -> float:
+    """정확 검색 상위 k개 중 근사 검색이 찾은 비율."""
+    hits = sum(len(set(f) & set(t)) for f, t in zip(found, truth))
+    return hits / truth.size
+
+
+def run(vectors: np.ndarray, metric_type: int, queries: np.ndarray, k: int) -> None:
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    print(f"{len(vectors)}개 벡터 ({vectors.shape[1]}차원), 질의 {len(queries)}건, k={k}\n")
+
+    header = f"{'index':<10}{'params':<28}{'build s':>9}{'recall@k':>10}{'ms/query':>10}{'speedup':>9}"
+    print(header)
+    print("-" * len(header))
+
+    started = time.perf_counter()
+    flat = build_search_index(vectors, metric_type, "flat")
+    flat_build = time.perf_counter() - started
+    truth, flat_ms = timed_search(flat, queries, k)
+    print(f"{'flat':<10}{'exact':<28}{flat_build:>9.2f}{1.0:>10.3f}{flat_ms:>10.3f}{1.0:>8.1f}x")
+
+    configs = [
+        ("hnsw", f"M={INDEX_HNSW_M},efC={INDEX_HNSW_EF_CONSTRUCTION}", {"ef_search": ef}, f"efSearch={ef}")
+        for ef in EF_SEARCH_GRID
+    ] + [
+        ("ivf", f"nlist={INDEX_IVF_NLIST or 'auto'}", {"nprobe": nprobe}, f"nprobe={nprobe}")
+        for nprobe in NPROBE_GRID
+    ]
+    built: dict[str, tuple[faiss.Index, float]] = {}
+    for index_type, build_label, search_params, search_label in configs:
+        if index_type not in built:
+            started = time.perf_counter()
+            index = build_search_index(vectors, metric_type, index_type, min_vectors=0)
+            built[index_type] = (index, time.perf_counter() - started)
+        index, build_seconds = built[index_type]
+        apply_search_params(index, **search_params)
+        found, ms = timed_search(index, queries, k)
+        label = f"{build_label} {search_label}"
+        print(
+            f"{index_type:<10}{label:<28}{build_seconds:>9.2f}"
+            f"{recall_at_k(found, truth):>10.3f}{ms:>10.3f}{flat_ms / ms:>8.1f}x"
+        )
+
+    print("\n검색 파라미터는 INDEX_HNSW_EF_SEARCH / INDEX_IVF_NPROBE로 재구축 없이 조정할 수 있습니다.")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="HNSW/IVF 인덱스 recall-지연시간 비교")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--index-dir", type=Path, help="저장된 제품 인덱스 폴더 (예: products/polivy/index)")
+    source.add_argument("--synthetic", type=int, metavar="N", help="합성 벡터 N개로 측정")
+    parser.add_argument("--dim", type=int, default=768, help="합성 벡터 차원 (기본 768)")
+    parser.add_argument("--queries", type=int, default=200, help="질의 수 (기본 200)")
+    parser.add_argument("-k", type=int, default=RETRIEVER_K, help=f"검색 개수 (기본 RETRIEVER_K={RETRIEVER_K})")
+    args = parser.parse_args()
+
+    if args.index_dir is not None:
+        vectors, metric_type = load_vectors(args.index_dir)
+    else:
+        vectors, metric_type = synthetic_vectors(args.synthetic, args.dim), faiss.METRIC_L2
+
+    run(vectors, metric_type, make_queries(vectors, args.queries), args.k)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""임베딩 차원 축소·벡터 양자화의 검색 품질 비용 측정.
+
+전체 차원 float32 flat 검색 결과를 기준으로, 축소 차원(앞부분 절단 후 재정규화 —
+gemini-embedding-001의 MRL 특성상 EMBEDDING_DIM 요청 결과와 같은 방식)과
+저장 형식(float32/float16/int8)별 recall@k, 벡터당 바이트, 인덱스 크기를 측정합니다.
+
+사용법:
+    python -m benchmarks.embedding_compression --index-dir products/polivy/index
+    python -m benchmarks.embedding_compression --synthetic 20000 --dim 3072
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+import faiss
+import numpy as np
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_DIR))
+
+from benchmarks.ann_recall import (  # noqa: E402
+    load_vectors,
+    make_queries,
+    recall_at_k,
+    synthetic_vectors,
+    timed_search,
+)
+from config.settings import RETRIEVER_K  # noqa: E402
+from utils.index_store import INDEX_STORAGES, build_search_index  # noqa: E402
+
+DIM_GRID = (3072, 1536, 768, 512, 256)
+
+
+def truncate(vectors: np.ndarray, dim: int) -> np.ndarray:
+    """앞 dim개 성분만 남기고 L2 재정규화."""
+    cut = np.ascontiguousarray(vectors[:, :dim], dtype=np.float32)
+    norms = np.linalg.norm(cut, axis=1, keepdims=True)
+    return cut / np.where(norms == 0, 1, norms)
+
+
+def run(vectors: np.ndarray, metric_type: int, queries: np.ndarray, k: int) -> None:
+    full_dim = vectors.shape[1]
+    print(f"{len(vectors)}개 벡터 ({full_dim}차원), 질의 {len(queries)}건, k={k}\n")
+
+    baseline = build_search_index(vectors, metric_type, "flat", "float32")
+    truth, _ = timed_search(baseline, queries, k)
+    baseline_mb = faiss.serialize_index(baseline).nbytes / (1024 * 1024)
+
+    header = f"{'dim':>6}  {'storage':<9}{'B/vector':>10}{'index MB':>10}{'ratio':>8}{'recall@k':>10}{'ms/query':>10}"
+    print(header)
+    print("-" * len(header))
+    for dim in [d for d in DIM_GRID if d <= full_dim] or [full_dim]:
+        cut_vectors, cut_queries = truncate(vectors, dim), truncate(queries, dim)
+        for storage in INDEX_STORAGES:
+            index = build_search_index(cut_vectors, metric_type, "flat", storage)
+            found, ms = timed_search(index, cut_queries, k)
+            size_mb = faiss.serialize_index(index).nbytes / (1024 * 1024)
+            print(
+                f"{dim:>6}  {storage:<9}{size_mb * 1024 * 1024 / len(vectors):>10.0f}{size_mb:>10.1f}"
+                f"{baseline_mb / size_mb:>7.1f}x{recall_at_k(found, truth):>10.3f}{ms:>10.3f}"
+            )
+
+    print(
+        "\n축소 차원은 EMBEDDING_DIM(재임베딩 필요), 저장 형식은 INDEX_STORAGE로 설정합니다.\n"
+        "float32 인덱스는 다른 저장 형식으로 바로 변환되지만, float16/int8 인덱스는 양자화된 벡터를 재사용하지 않고\n"
+        "전체 재구축합니다 (임베딩 캐시에 남아 있는 청크는 API 호출 없이 재임베딩)."
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="임베딩 차원 축소·양자화 품질 비용 측정")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--index-dir", type=Path, help="저장된 제품 인덱스 폴더 (예: products/polivy/index)")
+    source.add_argument("--synthetic", type=int, metavar="N", help="합성 벡터 N개로 측정 (차원 축소 결과는 참고용)")
+    parser.add_argument("--dim", type=int, default=3072, help="합성 벡터 차원 (기본 3072)")
+    parser.add_argument("--queries", type=int, default=200, help="질의 수 (기본 200)")
+    parser.add_argument("-k", type=int, default=RETRIEVER_K, help=f"검색 개수 (기본 RETRIEVER_K={RETRIEVER_K})")
+    args = parser.parse_args()
+
+    if args.index_dir is not None:
+        vectors, metric_type = load_vectors(args.index_dir)
+    else:
+        vectors, metric_type = synthetic_vectors(args.synthetic, args.dim), faiss.METRIC_L2
+
+    run(vectors, metric_type, make_queries(vectors, args.queries), args.k)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""PDF 추출 백엔드 처리량 비교.
+
+로컬 PDF 폴더에 대해 설치된 백엔드별로 초당 페이지 수, 최대 메모리, 빈 페이지 비율을 측정합니다.
+백엔드마다 새 프로세스에서 실행하므로 앞선 백엔드의 메모리 사용량이 섞이지 않습니다.
+
+사용법:
+    python -m benchmarks.pdf_extractors products/polivy/master_data
+    python -m benchmarks.pdf_extractors products/polivy/master_data --backends pypdf2 pymupdf
+"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_DIR))
+
+from utils.pdf_extractors import DEFAULT_EXTRACTOR, EXTRACTORS, available_extractors  # noqa: E402
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+@dataclass
+class ExtractorResult:
+    """한 백엔드의 측정 결과."""
+
+    backend: str
+    extractor_id: str
+    files: int = 0
+    failed_files: int = 0
+    pages: int = 0
+    empty_pages: int = 0
+    chars: int = 0
+    seconds: float = 0.0
+    peak_mb: float = 0.0
+
+    @property
+    def pages_per_second(self) -> float:
+        return self.pages / self.seconds if self.seconds else 0.0
+
+    @property
+    def empty_rate(self) -> float:
+        return self.empty_pages / self.pages if self.pages else 0.0
+
+
+def _peak_rss_mb() -> float:
+    """현재 프로세스의 최대 RSS (MB). resource 모듈이 없으면 0."""
+    if resource is None:
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS는 바이트, Linux는 KB 단위
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _run_backend(backend: str, pdf_paths: list[Path]) -> ExtractorResult:
+    """한 백엔드로 모든 PDF를 추출하며 측정 (워커 프로세스에서 실행)."""
+    extractor = EXTRACTORS[backend]()
+    result = ExtractorResult(backend=backend, extractor_id=extractor.extractor_id)
+    baseline_mb = _peak_rss_mb()
+    if resource is None:
+        # RSS를 잴 수 없는 환경에서는 파이썬 힙 할당량으로 대체 (C 확장 메모리는 제외됨)
+        tracemalloc.start()
+
+    started = time.perf_counter()
+    for path in pdf_paths:
+        result.files += 1
+        try:
+            for text in extractor.iter_page_texts(path):
+                result.pages += 1
+                stripped = text.strip()
+                result.chars += len(stripped)
+                if not stripped:
+                    result.empty_pages += 1
+        except Exception as e:
+            result.failed_files += 1
+            print(f"  [{backend}] 추출 실패: {path.name} ({e})", file=sys.stderr)
+    result.seconds = time.perf_counter() - started
+
+    if resource is None:
+        result.peak_mb = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+        tracemalloc.stop()
+    else:
+        result.peak_mb = _peak_rss_mb() - baseline_mb
+    return result
+
+
+def run_benchmark(pdf_paths: list[Path], backends: list[str]) -> list[ExtractorResult]:
+    """백엔드마다 새 프로세스에서 측정."""
+    results = []
+    for backend in backends:
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            results.append(pool.submit(_run_backend, backend, pdf_paths).result())
+    return results
+
+
+def recommend(results: list[ExtractorResult]) -> ExtractorResult | None:
+    """실패 파일 수와 빈 페이지 비율이 기본 백엔드보다 나쁘지 않은 백엔드 중 가장 빠른 것."""
+    usable = [r for r in results if r.pages]
+    baseline = next((r for r in usable if r.backend == DEFAULT_EXTRACTOR), None)
+    if baseline is not None:
+        usable = [
+            r for r in usable
+            if r.failed_files <= baseline.failed_files and r.empty_rate <= baseline.empty_rate
+        ]
+    return max(usable, key=lambda r: r.pages_per_second, default=None)
+
+
+def print_report(results: list[ExtractorResult]) -> None:
+    header = f"{'backend':<12}{'pages':>8}{'pages/s':>10}{'peak MB':>10}{'empty':>8}{'chars':>12}{'failed':>8}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(
+            f"{r.backend:<12}{r.pages:>8}{r.pages_per_second:>10.1f}{r.peak_mb:>10.1f}"
+            f"{r.empty_rate:>8.1%}{r.chars:>12}{r.failed_files:>8}"
+        )
+    best = recommend(results)
+    if best is not None:
+        print(f"\n추천: {best.backend} ({best.extractor_id}) — products.json의 \"pdf_extractor\"로 지정")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="PDF 추출 백엔드 처리량 비교")
+    parser.add_argument("pdf_dir", type=Path, help="PDF 폴더 (예: products/polivy/master_data)")
+    parser.add_argument(
+        "--backends",
+        nargs="+",
+        choices=list(EXTRACTORS),
+        help="측정할 백엔드 (기본: 설치된 전체)",
+    )
+    args = parser.parse_args()
+
+    pdf_paths = sorted(args.pdf_dir.glob("*.pdf"))
+    if not pdf_paths:
+        sys.exit(f"PDF 파일이 없습니다: {args.pdf_dir}")
+
+    installed = available_extractors()
+    backends = args.backends or installed
+    missing = [b for b in backends if b not in installed]
+    if missing:
+        sys.exit(f"설치되지 않은 백엔드: {', '.join(missing)}")
+
+    print(f"{len(pdf_paths)}개 PDF, 백엔드: {', '.join(backends)}\n")
+    print_report(run_benchmark(pdf_paths, backends))
+
+
+if __name__ == "__main__":
+    main()
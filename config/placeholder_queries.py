@@ -118,3 +118,71 @@ PLACEHOLDER_QUERIES: dict[str, str] = {
     # ── 기타 ──
     "date": "오늘 날짜를 YYYY년 M월 D일 형식으로 답변하세요.",
 }
+
+# placeholder → 우선 검색할 문서 분류 (config/source_classes.py).
+# 지정된 분류의 청크에서만 검색하며, 제품에 해당 분류 문서가 없으면 전체 문서를 검색합니다.
+# 목록에 없는 placeholder는 전체 문서를 검색합니다.
+_LABEL = ("label",)
+_PIVOTAL = ("pivotal",)
+
+PLACEHOLDER_SOURCES: dict[str, tuple[str, ...]] = {
+    "허가사항": _LABEL,
+    "비용": ("hta",),
+
+    # 기본 정보 · 허가/규제 정보
+    "product_name_ko": _LABEL,
+    "product_name_en": _LABEL,
+    "generic_name": _LABEL,
+    "chemical_name": _LABEL,
+    "formulation": _LABEL,
+    "drug_classification": _LABEL,
+    "manufacturer": _LABEL,
+    "indication_dosage": _LABEL,
+    "approval_date": _LABEL,
+
+    # 비교/경제성
+    "cost_effectiveness": ("hta",),
+    "cost_comparison": ("hta",),
+
+    # 약리/약동학
+    "mechanism_of_action": _LABEL,
+    "indications": _LABEL,
+    "clinical_results": ("pivotal", "label"),
+    "dosage": _LABEL,
+    "pharmacokinetics": _LABEL,
+    "metabolism": _LABEL,
+    "toxicity": _LABEL,
+    "appearance": _LABEL,
+    "storage": _LABEL,
+    "drug_interactions": _LABEL,
+    "pediatric_use": _LABEL,
+
+    # 참고문헌
+    "ref_title": _PIVOTAL,
+    "ref_source": _PIVOTAL,
+    "ref_study_type": _PIVOTAL,
+    "ref_patients": _PIVOTAL,
+    "ref_patient_count": _PIVOTAL,
+    "ref_control_group": _PIVOTAL,
+    "ref_control_results": _PIVOTAL,
+    "ref_adverse_events": _PIVOTAL,
+    "ref_conclusion": _PIVOTAL,
+}
+
+# 제품 자료를 근거로 하지 않는 placeholder (예: 오늘 날짜).
+# 검색된 청크와의 유사도가 낮아도 유사도 게이트로 "정보 없음" 처리하지 않고 항상 답변을 생성합니다.
+UNGATED_PLACEHOLDERS: frozenset[str] = frozenset({"date"})
+
+# 별칭 placeholder → 같은 내용을 묻는 대표 placeholder.
+# query_batch()는 대표 placeholder의 질의로 한 번만 생성하여 별칭에도 같은 답변을 채웁니다.
+# 질의 문구가 완전히 같은 placeholder는 별칭 없이도 자동으로 합쳐지지만, 한글 섹션 태그와 영문 키처럼
+# 같은 항목을 가리키는 placeholder는 문구가 나중에 달라져도 함께 생성되도록 명시해 둡니다.
+PLACEHOLDER_ALIASES: dict[str, str] = {
+    "indication_dosage": "허가사항",
+    "application_reason": "신청사유",
+    "efficacy": "효능",
+    "safety": "안전성",
+    "cost_effectiveness": "비용",
+    "domestic_hospitals": "other_hospitals",
+    "other_advantages_2": "other_advantages",
+}
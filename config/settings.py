@@ -26,15 +26,106 @@ BASE_DIR = _get_base_dir()
 # LLM / Embedding
 GEMINI_MODEL: str = os.getenv("GEMINI_MODEL", "gemini-3.1-pro-preview")
 EMBEDDING_MODEL: str = os.getenv("EMBEDDING_MODEL", "models/gemini-embedding-001")
+# 임베딩 출력 차원 (0이면 모델 기본값, gemini-embedding-001은 3072). 768/1536 등으로 줄이면 벡터를 재정규화
+EMBEDDING_DIM: int = int(os.getenv("EMBEDDING_DIM", 0))
+# 임베딩 제공자: google(Gemini API, 기본) | local(API 키 없이 CPU 해시 벡터 — 오프라인 인덱싱·테스트용)
+# 제품별로는 products.json의 "embedding_provider"로 지정
+EMBEDDING_PROVIDER: str = os.getenv("EMBEDDING_PROVIDER", "google").lower()
+LOCAL_EMBEDDING_DIM: int = int(os.getenv("LOCAL_EMBEDDING_DIM", 1024))
 
 # RAG 청킹 설정
 CHUNK_SIZE: int = int(os.getenv("CHUNK_SIZE", 1000))
 CHUNK_OVERLAP: int = int(os.getenv("CHUNK_OVERLAP", 200))
 RETRIEVER_K: int = 5
+# 적응형 k (vector 모드) — 후보 RETRIEVER_K_MAX개 중 최상위 청크와 유사도 차이가 RETRIEVER_SCORE_MARGIN 이내인
+# 청크만 쓰되 RETRIEVER_K_MIN~RETRIEVER_K_MAX개로 제한 (최상위가 압도적이면 줄이고, 비슷한 청크가 많으면 늘림)
+RETRIEVER_K_MIN: int = int(os.getenv("RETRIEVER_K_MIN", 3))
+RETRIEVER_K_MAX: int = int(os.getenv("RETRIEVER_K_MAX", 8))
+RETRIEVER_SCORE_MARGIN: float = float(os.getenv("RETRIEVER_SCORE_MARGIN", 0.05))
+# 유사도 게이트 — 최상위 청크의 코사인 유사도가 이 값 미만이면 LLM 호출 없이 "해당 정보 없음"
+# 비워 두면 임베딩 제공자별 기본값 (유사도 분포가 모델마다 다름, google은 보정 전이라 게이트 끔)
+_MIN_SIMILARITY = os.getenv("RETRIEVER_MIN_SIMILARITY", "")
+RETRIEVER_MIN_SIMILARITY: float | None = float(_MIN_SIMILARITY) if _MIN_SIMILARITY else None
+# 검색 방식: vector(임베딩, 기본) | bm25(로컬 어휘 검색, 질의 임베딩 API 호출 없음) | hybrid(두 결과를 RRF로 결합)
+RETRIEVAL_MODE: str = os.getenv("RETRIEVAL_MODE", "vector").lower()
+# BM25 파라미터 — 단어 빈도 포화(k1), 문서 길이 정규화(b)
+BM25_K1: float = float(os.getenv("BM25_K1", 1.2))
+BM25_B: float = float(os.getenv("BM25_B", 0.75))
+# hybrid — 각 검색에서 가져올 후보 수, Reciprocal Rank Fusion 상수
+HYBRID_CANDIDATES: int = int(os.getenv("HYBRID_CANDIDATES", 20))
+RRF_K: int = int(os.getenv("RRF_K", 60))
+
+# 문서 생성 시 동시에 진행할 LLM 요청 수 (1이면 순차)
+LLM_MAX_CONCURRENCY: int = int(os.getenv("LLM_MAX_CONCURRENCY", 8))
+# 묶음 생성 — 검색된 청크의 이 비율 이상이 이미 묶음 문맥에 있는 필드는 한 번의 LLM 호출(JSON 답변)로 함께 생성
+# 0이면 비활성화. 묶음당 최대 필드 수, 묶음 문맥의 최대 청크 수
+GROUP_MIN_OVERLAP: float = float(os.getenv("GROUP_MIN_OVERLAP", 0.6))
+GROUP_MAX_FIELDS: int = int(os.getenv("GROUP_MAX_FIELDS", 6))
+GROUP_MAX_CHUNKS: int = int(os.getenv("GROUP_MAX_CHUNKS", 12))
+
+# 임베딩 파이프라인 — 배치 크기, 동시 요청 수, 분당 요청/토큰 제한(0이면 제한 없음), 429 재시도 횟수
+EMBEDDING_BATCH_SIZE: int = int(os.getenv("EMBEDDING_BATCH_SIZE", 100))
+EMBEDDING_MAX_CONCURRENCY: int = int(os.getenv("EMBEDDING_MAX_CONCURRENCY", 4))
+EMBEDDING_RPM: int = int(os.getenv("EMBEDDING_RPM", 300))
+EMBEDDING_TPM: int = int(os.getenv("EMBEDDING_TPM", 1_000_000))
+EMBEDDING_MAX_RETRIES: int = int(os.getenv("EMBEDDING_MAX_RETRIES", 6))
+
+# 인덱스 구축 시 한 번에 임베딩하여 인덱스에 추가할 청크 수 — 구축 중 최대 메모리 사용량을 결정
+INDEX_BATCH_CHUNKS: int = int(os.getenv("INDEX_BATCH_CHUNKS", EMBEDDING_BATCH_SIZE * EMBEDDING_MAX_CONCURRENCY))
+
+# PDF 텍스트 추출·청킹 병렬 워커 수 (1이면 순차 처리)
+PDF_WORKERS: int = int(os.getenv("PDF_WORKERS", min(os.cpu_count() or 1, 8)))
+# PDF 텍스트 추출 백엔드: pypdf2(기본) | pymupdf | pypdfium2 | pdfplumber
+# 제품별로는 products.json의 "pdf_extractor"로 지정 (설치되지 않은 백엔드는 pypdf2로 대체)
+PDF_EXTRACTOR: str = os.getenv("PDF_EXTRACTOR", "pypdf2")
+
+# 반복 머리말/꼬리말 제거 — 페이지 앞뒤 줄이 문서 페이지의 이 비율 이상에서 반복되면 청킹 전에 제거 (0이면 비활성화)
+BOILERPLATE_MIN_RATIO: float = float(os.getenv("BOILERPLATE_MIN_RATIO", 0.5))
+
+# 준중복 청크 제거 — 글자 5-gram Jaccard 유사도가 이 값 이상인 청크는 하나만 임베딩 (0이면 비활성화)
+DEDUP_THRESHOLD: float = float(os.getenv("DEDUP_THRESHOLD", 0.85))
+DEDUP_NUM_PERM: int = int(os.getenv("DEDUP_NUM_PERM", 128))
+
+# 인덱스 영속화 — 제품 master_data_dir과 같은 레벨에 저장 (예: products/polivy/index/)
+INDEX_DIRNAME: str = "index"
+# 증분 인덱싱에서 삭제된 벡터가 남은 벡터 수의 이 비율을 넘으면 인덱스를 압축
+INDEX_COMPACT_RATIO: float = float(os.getenv("INDEX_COMPACT_RATIO", 0.3))
+
+# 검색 인덱스 종류: flat(정확 검색, 기본) | hnsw | ivf (근사 최근접 이웃)
+# 벡터 수가 INDEX_ANN_MIN_VECTORS 미만이면 종류와 무관하게 flat 사용
+INDEX_TYPE: str = os.getenv("INDEX_TYPE", "flat").lower()
+INDEX_ANN_MIN_VECTORS: int = int(os.getenv("INDEX_ANN_MIN_VECTORS", 10_000))
+# HNSW — 그래프 이웃 수(M), 구축/검색 시 탐색 폭(efConstruction/efSearch)
+INDEX_HNSW_M: int = int(os.getenv("INDEX_HNSW_M", 32))
+INDEX_HNSW_EF_CONSTRUCTION: int = int(os.getenv("INDEX_HNSW_EF_CONSTRUCTION", 200))
+INDEX_HNSW_EF_SEARCH: int = int(os.getenv("INDEX_HNSW_EF_SEARCH", 128))
+# IVF — 클러스터 수(0이면 벡터 수 기준 자동), 검색 시 조회할 클러스터 수
+INDEX_IVF_NLIST: int = int(os.getenv("INDEX_IVF_NLIST", 0))
+INDEX_IVF_NPROBE: int = int(os.getenv("INDEX_IVF_NPROBE", 16))
+# 인덱스 벡터 저장 형식: float32(기본) | float16 (1/2 크기) | int8 (스칼라 양자화, 1/4 크기)
+INDEX_STORAGE: str = os.getenv("INDEX_STORAGE", "float32").lower()
+# 저장된 인덱스를 읽기 전용 메모리 매핑으로 열기 — 같은 호스트의 여러 프로세스가 OS 페이지 캐시 한 벌을 공유
+INDEX_MMAP: bool = os.getenv("INDEX_MMAP", "true").lower() == "true"
+# 저장된 인덱스의 청크는 디스크(SQLite)에서 읽고, 최근 조회한 청크 이 개수만 메모리에 보관
+CHUNK_CACHE_SIZE: int = int(os.getenv("CHUNK_CACHE_SIZE", 256))
 
 # 파일 경로
 PRODUCTS_JSON_PATH: Path = BASE_DIR / "products" / "products.json"
 HOSPITAL_META_PATH: Path = BASE_DIR / "templates" / "hospital_meta.json"
+CACHE_DIR: Path = BASE_DIR / "cache"
+
+# 임베딩 캐시 — (모델, 정규화 텍스트 해시) → 벡터. 0이면 캐시 비활성화
+# (인덱스 구축의 배치 체크포인트도 이 캐시에 저장되므로, 0이면 구축이 중단될 때 완료된 배치도 다시 임베딩)
+EMBEDDING_CACHE_PATH: Path = CACHE_DIR / "embeddings.sqlite"
+EMBEDDING_CACHE_MAX_MB: int = int(os.getenv("EMBEDDING_CACHE_MAX_MB", 1024))
+
+# 답변 캐시 — (코퍼스 fingerprint, 질의, 검색 청크, LLM 모델, 프롬프트 버전) → 답변. 0이면 캐시 비활성화
+ANSWER_CACHE_PATH: Path = CACHE_DIR / "answers.sqlite"
+ANSWER_CACHE_MAX_MB: int = int(os.getenv("ANSWER_CACHE_MAX_MB", 64))
+
+# PDF 페이지 텍스트 캐시 — (파일 내용 해시, 추출기 버전) → 페이지별 텍스트
+TEXT_CACHE_DIR: Path = CACHE_DIR / "pages"
+TEXT_CACHE_ENABLED: bool = os.getenv("TEXT_CACHE_ENABLED", "true").lower() == "true"
 
 # Placeholder 정규식 패턴
 PLACEHOLDER_PATTERN: re.Pattern = re.compile(r"\{\{(\w+)\}\}")
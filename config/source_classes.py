@@ -0,0 +1,30 @@
+"""Master Data 문서 분류 (출처 문서 종류).
+
+PDF 파일명을 glob 패턴(대소문자 무시)으로 분류하여, placeholder마다 검색할 문서 종류를
+제한하는 데 사용합니다. 어느 패턴에도 맞지 않는 파일은 OTHER_SOURCE_CLASS로 분류합니다.
+제품별로는 products.json의 "source_classes"(분류 → 파일명 패턴 목록)로 덮어씁니다.
+"""
+
+OTHER_SOURCE_CLASS = "other"
+
+SOURCE_CLASSES: dict[str, str] = {
+    "label": "허가사항·제품설명서",
+    "pivotal": "핵심 임상시험 논문",
+    "hta": "경제성 평가·HTA 자료",
+    OTHER_SOURCE_CLASS: "기타 자료",
+}
+
+# 분류 → 파일명 glob 패턴 (위에서부터 먼저 맞는 분류 적용)
+SOURCE_CLASS_PATTERNS: dict[str, list[str]] = {
+    "label": [
+        "*label*", "*허가*", "*설명서*", "*첨부문서*", "*smpc*", "*prescribing*",
+        "*package*insert*", "*uspi*",
+    ],
+    "hta": [
+        "*hta*", "*dossier*", "*경제성*", "*심평원*", "*nice*", "*cadth*", "*pbac*",
+        "*cost*effective*",
+    ],
+    "pivotal": [
+        "*pivotal*", "*trial*", "*study*", "*nejm*", "*lancet*", "*jco*", "*논문*", "*임상*",
+    ],
+}
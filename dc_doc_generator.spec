@@ -10,10 +10,21 @@
 
 import os
 import importlib
+from importlib.metadata import PackageNotFoundError
 from pathlib import Path
 
+from PyInstaller.utils.hooks import copy_metadata
+
 block_cipher = None
 
+# PDF 추출 백엔드는 배포 메타데이터로 설치 여부·버전을 확인하므로 함께 포함 (설치된 백엔드만)
+extractor_metadata = []
+for distribution in ("PyPDF2", "pymupdf", "pypdfium2", "pdfplumber"):
+    try:
+        extractor_metadata += copy_metadata(distribution)
+    except PackageNotFoundError:
+        pass
+
 # Streamlit 패키지 위치 찾기
 streamlit_dir = os.path.dirname(importlib.import_module("streamlit").__file__)
 
@@ -31,7 +42,7 @@ a = Analysis(
         (streamlit_dir, "streamlit"),
 
         # 데이터 파일은 exe와 같은 폴더에 별도 배치 (아래 주석 참조)
-    ],
+    ] + extractor_metadata,
     hiddenimports=[
         # Streamlit 내부 의존성
         "streamlit",
@@ -4,6 +4,7 @@ Streamlit은 `streamlit run app.py` 명령어로 실행되므로,
 exe에서는 이를 프로그래밍 방식으로 호출하는 래퍼가 필요.
 """
 
+import multiprocessing
 import os
 import sys
 from pathlib import Path
@@ -43,4 +44,6 @@ def main() -> None:
 
 
 if __name__ == "__main__":
+    # exe에서 PDF 추출 워커 프로세스(ProcessPoolExecutor)가 앱을 다시 실행하지 않도록 함
+    multiprocessing.freeze_support()
     main()
@@ -1,11 +1,33 @@
 """utils/ai_engine.py 단위 테스트."""
 
+import asyncio
 import json
 from unittest.mock import MagicMock, patch
 
 import pytest
-
-from utils.ai_engine import FieldMapping, QueryResult, RAGEngine
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from config.placeholder_queries import (
+    PLACEHOLDER_ALIASES,
+    PLACEHOLDER_QUERIES,
+    PLACEHOLDER_SOURCES,
+    UNGATED_PLACEHOLDERS,
+)
+from utils.ai_engine import (
+    NO_INFO_ANSWER,
+    RETRIEVAL_MODES,
+    FieldMapping,
+    QueryResult,
+    RAGEngine,
+    _adaptive_cut,
+    Retrieval,
+    _group_by_shared_chunks,
+)
+from utils.answer_cache import AnswerCache
+from utils.embedding_cache import CachedEmbeddings, EmbeddingCache
+from utils.embedding_providers import HashingEmbeddings
 
 
 # ───────── fixtures ─────────
@@ -100,6 +122,566 @@ class TestQuery:
         assert "polivy_label.pdf p.3" in result.sources
 
 
+# ───────── retrieval modes ─────────
+
+def _make_engine_with_index(retrieval_mode: str) -> RAGEngine:
+    """작은 실제 FAISS 인덱스로 RAGEngine 생성."""
+    texts = [
+        "폴라이비는 POLARIX 임상시험(GO29365)에서 무진행 생존기간을 개선하였다.",
+        "이상반응으로 말초신경병증과 호중구감소증이 보고되었다.",
+        "권장 용량은 1.8 mg/kg이며 21일 간격으로 투여한다.",
+    ]
+    vs = FAISS.from_texts(texts, DeterministicFakeEmbedding(size=8), ids=["c1", "c2", "c3"])
+    with patch("utils.ai_engine.ChatGoogleGenerativeAI"):
+        return RAGEngine(vs, api_key="fake-key", retrieval_mode=retrieval_mode)
+
+
+def _spy_embed_query():
+    """질의 임베딩 호출을 기록 (동작은 그대로)."""
+    return patch.object(
+        DeterministicFakeEmbedding,
+        "embed_query",
+        autospec=True,
+        side_effect=DeterministicFakeEmbedding.embed_query,
+    )
+
+
+class TestRetrievalModes:
+    def test_bm25_mode_makes_no_embedding_call(self):
+        """bm25 모드는 질의 임베딩 없이 어휘 검색으로 청크를 찾음."""
+        engine = _make_engine_with_index("bm25")
+
+        with _spy_embed_query() as embed_query:
+            docs = engine._retrieve("GO29365 결과").chunks
+
+        assert docs[0].page_content.startswith("폴라이비는 POLARIX")
+        embed_query.assert_not_called()
+
+    def test_hybrid_mode_fuses_vector_and_lexical_results(self):
+        """hybrid 모드는 벡터 검색도 수행하고, 어휘 검색 1위 청크를 포함."""
+        engine = _make_engine_with_index("hybrid")
+
+        with _spy_embed_query() as embed_query:
+            docs = engine._retrieve("말초신경병증", k=2).chunks
+
+        assert len(docs) == 2
+        assert "말초신경병증" in "".join(d.page_content for d in docs)
+        embed_query.assert_called_once()
+
+    def test_unknown_mode_raises(self):
+        """알 수 없는 검색 방식이면 ValueError."""
+        with patch("utils.ai_engine.ChatGoogleGenerativeAI"), pytest.raises(ValueError):
+            RAGEngine(_make_mock_vectorstore(), api_key="fake-key", retrieval_mode="sparse")
+
+
+# ───────── source filtering ─────────
+
+def _make_engine_with_sources(retrieval_mode: str) -> RAGEngine:
+    """허가사항·임상 논문 청크가 섞인 FAISS 인덱스로 RAGEngine 생성."""
+    texts = [
+        "보관: 2~8°C에서 냉장 보관하고 빛을 피한다.",
+        "POLARIX 임상시험에서 보관 검체를 중앙 검사하였다.",
+        "POLARIX 임상시험의 무진행 생존기간 결과.",
+    ]
+    metadatas = [
+        {"source": "polivy_label.pdf", "page": 12},
+        {"source": "POLARIX_NEJM.pdf", "page": 4},
+        {"source": "POLARIX_NEJM.pdf", "page": 5},
+    ]
+    vs = FAISS.from_texts(texts, DeterministicFakeEmbedding(size=8), metadatas=metadatas, ids=["l1", "p1", "p2"])
+    with patch("utils.ai_engine.ChatGoogleGenerativeAI"):
+        return RAGEngine(vs, api_key="fake-key", retrieval_mode=retrieval_mode)
+
+
+class TestSourceFiltering:
+    @pytest.mark.parametrize("retrieval_mode", RETRIEVAL_MODES)
+    def test_search_limited_to_source_class(self, retrieval_mode):
+        """문서 분류를 지정하면 그 분류의 청크만 검색."""
+        engine = _make_engine_with_sources(retrieval_mode)
+
+        docs = engine._retrieve("보관 검체", k=3, source_classes=("pivotal",)).chunks
+
+        assert docs and {d.metadata["source"] for d in docs} == {"POLARIX_NEJM.pdf"}
+
+    def test_missing_class_falls_back_to_all_sources(self):
+        """지정한 분류의 문서가 없으면 전체 문서를 검색."""
+        engine = _make_engine_with_sources("vector")
+
+        docs = engine._retrieve("보관", k=3, source_classes=("hta",)).chunks
+
+        assert len(docs) == 3
+
+    def test_placeholder_preferred_sources_used_by_default(self):
+        """source_classes를 생략하면 PLACEHOLDER_SOURCES 설정(storage → label)을 적용."""
+        engine = _make_engine_with_sources("hybrid")
+        engine._chain = MagicMock()
+        engine._chain.invoke.return_value = "2~8°C 냉장 보관"
+
+        result = engine.query("storage", custom_query="보관 조건")
+
+        assert result.sources == ["polivy_label.pdf p.12"]
+
+
+# ───────── batch retrieval ─────────
+
+class TestRetrieveBatch:
+    @pytest.mark.parametrize("retrieval_mode", RETRIEVAL_MODES)
+    def test_same_chunks_as_single_retrieval(self, retrieval_mode):
+        """일괄 검색 결과가 필드별 검색과 같고 입력 순서를 유지."""
+        engine = _make_engine_with_sources(retrieval_mode)
+        field_ids = ["storage", "ref_title", "efficacy_summary", "storage"]
+        queries = ["보관 조건", "POLARIX 임상시험", None, "보관 검체"]
+
+        batch = engine.retrieve_batch(field_ids, queries, k=2)
+
+        expected = [
+            engine._retrieve(engine._query_text(f, q), k=2, source_classes=PLACEHOLDER_SOURCES.get(f, ()))
+            for f, q in zip(field_ids, queries)
+        ]
+        assert [[d.id for d in r.chunks] for r in batch] == [[d.id for d in r.chunks] for r in expected]
+        for got, want in zip(batch, expected):
+            assert got.scores == pytest.approx(want.scores)
+
+    def test_one_search_per_source_filter(self):
+        """같은 문서 분류 제한을 쓰는 질의는 한 번의 FAISS 검색으로 처리."""
+        engine = _make_engine_with_sources("vector")
+        index = engine._vectorstore.index
+
+        with patch.object(engine._vectorstore, "index", wraps=index) as spy:
+            engine.retrieve_batch(["storage", "appearance", "dosage", "ref_title", "ref_source"])
+
+        assert spy.search.call_count == 2
+        assert sorted(call.args[0].shape[0] for call in spy.search.call_args_list) == [2, 3]
+
+    def test_query_uses_retrieved_chunks(self):
+        """retrieved를 넘기면 다시 검색하지 않음."""
+        engine = _make_engine_with_sources("vector")
+        engine._chain = MagicMock()
+        retrieved = engine.retrieve_batch(["storage"])[0]
+
+        with patch.object(engine, "_retrieve") as retrieve:
+            result = engine.query("storage", retrieved=retrieved)
+
+        retrieve.assert_not_called()
+        assert result.raw_chunks == retrieved.chunks
+
+
+# ───────── similarity gate / adaptive k ─────────
+
+def _make_engine_with_hashing(retrieval_mode: str = "vector", min_similarity: float | None = 0.3) -> RAGEngine:
+    """코사인 유사도가 의미 있는 로컬 해시 임베딩 인덱스로 RAGEngine 생성 (LLM은 Mock)."""
+    texts = [
+        "보관 조건: 2~8°C 냉장 보관, 차광 보관, 유효기간 36개월.",
+        "권장 용량은 1.8 mg/kg이며 21일 간격으로 6주기 투여한다.",
+        "이상반응으로 말초신경병증과 호중구감소증이 보고되었다.",
+    ]
+    vs = FAISS.from_texts(texts, HashingEmbeddings(dim=256))
+    with patch("utils.ai_engine.ChatGoogleGenerativeAI"):
+        engine = RAGEngine(vs, api_key="fake-key", retrieval_mode=retrieval_mode, min_similarity=min_similarity)
+    engine._chain = MagicMock()
+    engine._chain.invoke.return_value = "2~8°C 냉장 보관"
+    return engine
+
+
+def _hits(*scores: float) -> list[tuple[Document, float]]:
+    return [(Document(page_content=str(i)), score) for i, score in enumerate(scores)]
+
+
+class TestSimilarityGate:
+    def test_unrelated_query_skips_llm(self):
+        """최상위 유사도가 임계값 미만이면 LLM 없이 '해당 정보 없음'."""
+        engine = _make_engine_with_hashing()
+
+        result = engine.query("domestic_hospitals", custom_query="국내 상급종합병원 사용 현황")
+
+        assert result.llm_skipped and result.answer == NO_INFO_ANSWER
+        assert result.sources == [] and result.top_similarity < 0.3
+        engine._chain.invoke.assert_not_called()
+
+    def test_relevant_query_exposes_scores(self):
+        """관련 청크가 있으면 LLM을 호출하고 청크별 유사도를 결과에 포함."""
+        engine = _make_engine_with_hashing()
+
+        result = engine.query("storage", custom_query="보관 조건 냉장 보관")
+
+        assert not result.llm_skipped
+        assert result.raw_chunks[0].page_content.startswith("보관 조건")
+        assert result.top_similarity == result.scores[0] >= 0.3
+        assert result.scores == sorted(result.scores, reverse=True)
+        engine._chain.invoke.assert_called_once()
+
+    def test_no_gate_without_threshold(self):
+        """min_similarity가 없으면 검색 결과가 있는 한 LLM 호출."""
+        engine = _make_engine_with_hashing(min_similarity=None)
+
+        assert not engine.query("x", custom_query="국내 상급종합병원 사용 현황").llm_skipped
+
+    def test_placeholder_without_document_basis_is_not_gated(self):
+        """오늘 날짜처럼 문서 근거가 필요 없는 placeholder는 유사도가 낮아도 LLM 호출."""
+        engine = _make_engine_with_hashing()
+        assert "date" in UNGATED_PLACEHOLDERS
+
+        result = engine.query("date", custom_query=PLACEHOLDER_QUERIES["date"])
+
+        assert not result.llm_skipped and result.top_similarity < 0.3
+        engine._chain.invoke.assert_called_once()
+
+    def test_ungated_placeholder_in_batch(self):
+        """query_batch에서도 게이트 예외 placeholder만 생성하고 나머지는 게이트 적용."""
+        engine = _make_engine_with_hashing()
+        engine._chain = _SlowChain()
+
+        date, hospitals = engine.query_batch(
+            ["date", "domestic_hospitals"],
+            [PLACEHOLDER_QUERIES["date"], "국내 상급종합병원 사용 현황"],
+            group_min_overlap=0,
+        )
+
+        assert not date.llm_skipped and hospitals.llm_skipped
+        assert engine._chain.calls == 1
+
+    def test_bm25_without_matches_skips_llm(self):
+        """bm25 모드에서 어휘가 겹치는 청크가 없으면 LLM 호출 생략."""
+        engine = _make_engine_with_hashing("bm25")
+
+        result = engine.query("x", custom_query="FDA approval year")
+
+        assert result.llm_skipped and result.raw_chunks == []
+        engine._chain.invoke.assert_not_called()
+
+
+class TestAdaptiveK:
+    def test_dominant_top_hit_shrinks_k(self):
+        """최상위 청크가 압도적이면 k_min개만 사용."""
+        assert len(_adaptive_cut(_hits(0.9, 0.6, 0.55, 0.5, 0.5), k_min=2, k_max=6, margin=0.05)) == 2
+
+    def test_close_hits_widen_k(self):
+        """유사도가 비슷한 청크가 많을 때만 k_max개까지 늘림."""
+        hits = _hits(0.80, 0.79, 0.78, 0.78, 0.77, 0.77, 0.76, 0.60)
+        assert len(_adaptive_cut(hits, k_min=2, k_max=6, margin=0.05)) == 6
+        assert len(_adaptive_cut(hits[:4] + _hits(0.5), k_min=2, k_max=6, margin=0.05)) == 4
+
+
+# ───────── concurrent query_batch ─────────
+
+class _SlowChain:
+    """호출·동시 실행 수를 기록하고, 질문에 '실패'가 있으면 예외를 내는 비동기 체인."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.active = 0
+        self.max_active = 0
+
+    async def ainvoke(self, inputs: dict) -> str:
+        self.calls += 1
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(0.01)
+            if "실패" in inputs["question"]:
+                raise RuntimeError("quota exceeded")
+            return f"답변: {inputs['question']}"
+        finally:
+            self.active -= 1
+
+    async def astream(self, inputs: dict):
+        answer = await self.ainvoke(inputs)
+        for n, word in enumerate(answer.split(" ")):
+            await asyncio.sleep(0)
+            yield word if n == 0 else f" {word}"
+
+
+class TestQueryBatch:
+    def test_results_in_input_order_with_bounded_concurrency(self):
+        """동시 요청 수를 제한하면서 결과는 입력 순서로 반환."""
+        engine = _make_engine_with_hashing(min_similarity=None)
+        engine._chain = _SlowChain()
+        queries = [f"보관 조건 {i}" for i in range(6)]
+        finished: list[int] = []
+
+        results = engine.query_batch(
+            [f"f{i}" for i in range(6)],
+            queries,
+            max_concurrency=2,
+            on_result=lambda i, _: finished.append(i),
+            group_min_overlap=0,
+        )
+
+        assert [r.answer for r in results] == [f"답변: {q}" for q in queries]
+        assert engine._chain.max_active == 2
+        assert sorted(finished) == list(range(6))
+
+    def test_failure_captured_per_field(self):
+        """실패한 필드만 '[생성 실패: ...]'로 표시되고 나머지는 정상 생성."""
+        engine = _make_engine_with_hashing(min_similarity=None)
+        engine._chain = _SlowChain()
+
+        results = engine.query_batch(["a", "b"], ["보관 조건", "보관 조건 실패"], group_min_overlap=0)
+
+        assert results[0].answer == "답변: 보관 조건" and results[0].error is None
+        assert results[1].answer == "[생성 실패: quota exceeded]"
+        assert results[1].error == "quota exceeded" and results[1].sources == []
+
+    def test_skipped_fields_make_no_llm_call(self):
+        """유사도 게이트에 걸린 필드는 LLM 요청 없이 완료."""
+        engine = _make_engine_with_hashing()
+        engine._chain = _SlowChain()
+
+        results = engine.query_batch(["domestic_hospitals"], ["국내 상급종합병원 사용 현황"])
+
+        assert results[0].llm_skipped and engine._chain.max_active == 0
+
+
+# ───────── grouped generation ─────────
+
+class _GroupChain:
+    """묶음 프롬프트 입력을 기록하고 정해진 JSON 문자열을 반환하는 비동기 체인."""
+
+    def __init__(self, response: str) -> None:
+        self.response = response
+        self.calls: list[dict] = []
+
+    async def ainvoke(self, inputs: dict) -> str:
+        self.calls.append(inputs)
+        return self.response
+
+
+class TestGroupedGeneration:
+    def test_group_by_shared_chunks(self):
+        """청크가 겹치는 필드끼리 묶고, 필드 수·문맥 크기 제한을 지킴."""
+        keys = [["a", "b", "c"], ["x", "y"], ["a", "b", "d"], ["b", "c"], ["x", "z"]]
+
+        assert _group_by_shared_chunks(keys, min_overlap=0.6) == [[0, 2, 3], [1], [4]]
+        assert _group_by_shared_chunks(keys, min_overlap=0.5) == [[0, 2, 3], [1, 4]]
+        assert _group_by_shared_chunks(keys, min_overlap=0.6, max_fields=2) == [[0, 2], [1], [3], [4]]
+        assert _group_by_shared_chunks(keys, min_overlap=0.6, max_chunks=3) == [[0, 3], [1], [2], [4]]
+        assert _group_by_shared_chunks(keys, min_overlap=0) == [[0], [1], [2], [3], [4]]
+
+    def test_overlapping_fields_answered_in_one_call(self):
+        """겹치는 필드들은 공통 문맥 한 번의 호출로 답하고, 필드별 출처는 각자의 청크."""
+        engine = _make_engine_with_hashing(min_similarity=None)
+        engine._chain = _SlowChain()
+        engine._group_chain = _GroupChain('{"q1": "냉장 보관", "q2": "36개월"}')
+
+        results = engine.query_batch(["storage", "shelf_life"], ["보관 조건", "보관 유효기간"])
+
+        assert [r.answer for r in results] == ["냉장 보관", "36개월"]
+        assert len(engine._group_chain.calls) == 1 and engine._chain.max_active == 0
+        context = engine._group_chain.calls[0]["context"]
+        assert context.count("보관 조건: 2~8°C") == 1
+        assert "q1: 보관 조건" in engine._group_chain.calls[0]["questions"]
+        assert results[0].raw_chunks == engine.retrieve_batch(["storage"], ["보관 조건"])[0].chunks
+
+    def test_unparsed_fields_retried_individually(self):
+        """JSON에 없거나 빈 답변인 필드만 개별 호출로 다시 생성."""
+        engine = _make_engine_with_hashing(min_similarity=None)
+        engine._chain = _SlowChain()
+        engine._group_chain = _GroupChain('```json\n{"q1": "냉장 보관", "q2": ""}\n```')
+
+        results = engine.query_batch(["storage", "shelf_life"], ["보관 조건", "보관 유효기간"])
+
+        assert [r.answer for r in results] == ["냉장 보관", "답변: 보관 유효기간"]
+        assert engine._chain.max_active == 1
+
+
+# ───────── query canonicalization ─────────
+
+class TestCanonicalizeQueries:
+    def test_aliases_and_identical_queries_collapse(self):
+        """별칭과 문구가 같은 placeholder는 대표 질의 하나로 합쳐짐."""
+        keys = ["효능", "efficacy", "domestic_hospitals", "other_hospitals", "storage", "safety"]
+
+        ids, queries, slots = RAGEngine.canonicalize_queries(keys, [PLACEHOLDER_QUERIES[k] for k in keys])
+
+        assert ids == ["효능", "other_hospitals", "storage", "안전성"]
+        assert queries == [PLACEHOLDER_QUERIES[k] for k in ids]
+        assert slots == [0, 0, 1, 1, 2, 3]
+
+    def test_customized_alias_query_is_kept(self):
+        """별칭이라도 사용자가 고친 질의는 따로 생성."""
+        ids, queries, slots = RAGEngine.canonicalize_queries(
+            ["other_advantages", "other_advantages_2"], [None, "투여 편의성 측면의 장점을 설명하세요."]
+        )
+
+        assert ids == ["other_advantages", "other_advantages_2"]
+        assert slots == [0, 1]
+
+    def test_same_text_with_different_sources_not_merged(self, monkeypatch):
+        """질의 문구가 같아도 검색 문서 분류가 다르면 합치지 않음."""
+        monkeypatch.setitem(PLACEHOLDER_SOURCES, "x_label", ("label",))
+
+        _, _, slots = RAGEngine.canonicalize_queries(["x_label", "x_all"], ["같은 질의", "같은 질의"])
+
+        assert slots == [0, 1]
+
+    def test_aliases_point_to_known_placeholders(self):
+        """별칭과 대표 placeholder는 모두 PLACEHOLDER_QUERIES에 있고 검색 문서 분류가 같음."""
+        for alias, canonical in PLACEHOLDER_ALIASES.items():
+            assert alias in PLACEHOLDER_QUERIES and canonical in PLACEHOLDER_QUERIES
+            assert canonical not in PLACEHOLDER_ALIASES
+            assert PLACEHOLDER_SOURCES.get(alias) == PLACEHOLDER_SOURCES.get(canonical)
+
+    def test_batch_generates_once_per_distinct_query(self):
+        """중복 질의는 한 번만 생성하고 모든 placeholder에 같은 답변을 채움."""
+        engine = _make_engine_with_hashing(min_similarity=None)
+        engine._chain = _SlowChain()
+        keys = ["보관", "storage_copy", "용량"]
+        finished: list[int] = []
+
+        results = engine.query_batch(
+            keys,
+            ["보관 조건", "보관  조건", "권장 용량"],
+            on_result=lambda i, _: finished.append(i),
+            group_min_overlap=0,
+        )
+
+        assert engine._chain.calls == 2
+        assert [r.field_id for r in results] == keys
+        assert results[0].answer == results[1].answer == "답변: 보관 조건"
+        assert sorted(finished) == [0, 1, 2]
+
+
+# ───────── streaming ─────────
+
+class TestStreaming:
+    def test_query_stream_yields_tokens_then_result(self):
+        """답변 조각을 도착 순서대로 반환하고, 끝나면 출처를 포함한 QueryResult로 콜백."""
+        engine = _make_engine_with_hashing()
+        engine._chain.stream.return_value = iter(["2~8°C ", "냉장 ", "보관"])
+        completed: list[QueryResult] = []
+
+        tokens = list(engine.query_stream("storage", "보관 조건 냉장 보관", on_complete=completed.append))
+
+        assert tokens == ["2~8°C ", "냉장 ", "보관"]
+        (result,) = completed
+        assert result.answer == "2~8°C 냉장 보관" and result.sources
+        assert result.raw_chunks[0].page_content.startswith("보관 조건")
+        engine._chain.invoke.assert_not_called()
+
+    def test_query_stream_without_llm_yields_whole_answer(self):
+        """관련 청크가 없으면 LLM 없이 '해당 정보 없음' 한 조각."""
+        engine = _make_engine_with_hashing()
+        completed: list[QueryResult] = []
+
+        tokens = list(engine.query_stream("domestic_hospitals", "국내 상급종합병원 사용 현황", on_complete=completed.append))
+
+        assert tokens == [NO_INFO_ANSWER] and completed[0].llm_skipped
+        engine._chain.stream.assert_not_called()
+
+    def test_batch_streams_tokens_per_field(self):
+        """일괄 생성에서 필드별 답변 조각이 순서대로 전달되고 이어 붙이면 최종 답변."""
+        engine = _make_engine_with_hashing(min_similarity=None)
+        engine._chain = _SlowChain()
+        keys = ["보관", "보관_별칭", "용량"]
+        streamed: dict[int, str] = {}
+
+        results = engine.query_batch(
+            keys,
+            ["보관 조건", "보관 조건", "권장 용량"],
+            group_min_overlap=0,
+            on_token=lambda i, token: streamed.__setitem__(i, streamed.get(i, "") + token),
+        )
+
+        assert streamed == {i: r.answer for i, r in enumerate(results)}
+        assert streamed[0] == "답변: 보관 조건"
+
+
+# ───────── answer cache ─────────
+
+def _with_answer_cache(engine: RAGEngine, path, fingerprint: str = "fp1") -> RAGEngine:
+    """엔진에 임시 파일 답변 캐시를 연결."""
+    engine._corpus_fingerprint = fingerprint
+    engine._answer_cache = AnswerCache(path, max_bytes=1 << 20)
+    return engine
+
+
+class TestAnswerCaching:
+    def test_repeated_query_uses_cached_answer(self, tmp_path):
+        """같은 질의는 두 번째부터 LLM 없이 캐시된 답변과 같은 출처를 반환."""
+        engine = _with_answer_cache(_make_engine_with_hashing(), tmp_path / "a.sqlite")
+
+        first = engine.query("storage", custom_query="보관 조건 냉장 보관")
+        second = engine.query("storage", custom_query="보관 조건 냉장 보관")
+
+        assert not first.cached and second.cached
+        assert second.answer == first.answer and second.raw_chunks == first.raw_chunks
+        engine._chain.invoke.assert_called_once()
+
+    def test_fingerprint_change_invalidates(self, tmp_path):
+        """코퍼스 fingerprint가 바뀌면 캐시된 답변을 쓰지 않음."""
+        path = tmp_path / "a.sqlite"
+        _with_answer_cache(_make_engine_with_hashing(), path, "fp1").query("storage", custom_query="보관 조건")
+
+        engine = _with_answer_cache(_make_engine_with_hashing(), path, "fp2")
+        result = engine.query("storage", custom_query="보관 조건")
+
+        assert not result.cached
+        engine._chain.invoke.assert_called_once()
+
+    def test_bypass_regenerates_and_refreshes(self, tmp_path):
+        """use_cache=False이면 새로 생성하고, 새 답변을 캐시에 저장."""
+        engine = _with_answer_cache(_make_engine_with_hashing(), tmp_path / "a.sqlite")
+        engine.query("storage", custom_query="보관 조건")
+        engine._chain.invoke.return_value = "냉장 보관 (갱신)"
+
+        bypassed = engine.query("storage", custom_query="보관 조건", use_cache=False)
+        cached = engine.query("storage", custom_query="보관 조건")
+
+        assert not bypassed.cached and bypassed.answer == "냉장 보관 (갱신)"
+        assert cached.cached and cached.answer == "냉장 보관 (갱신)"
+
+    def test_batch_for_new_hospital_makes_no_llm_calls(self, tmp_path):
+        """이미 생성한 항목들은 다음 일괄 생성에서 LLM을 호출하지 않음 (묶음 생성 답변 포함)."""
+        path = tmp_path / "a.sqlite"
+        fields, queries = ["storage", "shelf_life", "dosage"], ["보관 조건", "보관 유효기간", "권장 용량 투여"]
+        first = _with_answer_cache(_make_engine_with_hashing(min_similarity=None), path)
+        first._chain = _SlowChain()
+        first._group_chain = _GroupChain('{"q1": "냉장 보관", "q2": "36개월", "q3": "1.8 mg/kg"}')
+        first.query_batch(fields, queries)
+
+        # 같은 저장 인덱스를 연 새 세션
+        with patch("utils.ai_engine.ChatGoogleGenerativeAI"):
+            engine = RAGEngine(first._vectorstore, api_key="fake-key")
+        _with_answer_cache(engine, path)
+        engine._chain = _SlowChain()
+        engine._group_chain = _GroupChain("{}")
+        results = engine.query_batch(fields, queries)
+
+        assert all(r.cached for r in results)
+        assert [r.answer for r in results] == ["냉장 보관", "36개월", "1.8 mg/kg"]
+        assert engine._chain.max_active == 0 and engine._group_chain.calls == []
+
+    def test_no_fingerprint_disables_cache(self, tmp_path):
+        """corpus_fingerprint 없이 만든 엔진은 답변 캐시를 쓰지 않음."""
+        vs = FAISS.from_texts(["보관 조건: 냉장 보관"], HashingEmbeddings(dim=64))
+        with patch("utils.ai_engine.ChatGoogleGenerativeAI"):
+            engine = RAGEngine(vs, api_key="fake-key", answer_cache=AnswerCache(tmp_path / "a.sqlite", 1 << 20))
+        assert engine._answer_key("보관 조건", Retrieval(vs.similarity_search("보관", k=1), [1.0])) is None
+
+
+# ───────── query embedding cache ─────────
+
+class TestQueryEmbeddingCache:
+    def test_fixed_query_vectors_reused(self, tmp_path):
+        """다른 세션에서 저장된 고정 질의 벡터를 재사용하여 질의 임베딩 호출이 없음."""
+        query_text = PLACEHOLDER_QUERIES["storage"]
+        CachedEmbeddings(
+            DeterministicFakeEmbedding(size=8), EmbeddingCache(tmp_path / "c.sqlite", 1 << 20), "m"
+        ).embed_query(query_text)
+        embedding = CachedEmbeddings(
+            DeterministicFakeEmbedding(size=8), EmbeddingCache(tmp_path / "c.sqlite", 1 << 20), "m"
+        )
+        vs = FAISS.from_texts(["2~8°C 냉장 보관"], embedding)
+
+        with patch("utils.ai_engine.ChatGoogleGenerativeAI"):
+            engine = RAGEngine(vs, api_key="fake-key")
+        with _spy_embed_query() as embed_query:
+            docs = engine._retrieve(query_text).chunks
+
+        assert docs[0].page_content == "2~8°C 냉장 보관"
+        embed_query.assert_not_called()
+
+
 # ───────── analyze_template_fields ─────────
 
 class TestAnalyzeTemplateFields:
@@ -0,0 +1,50 @@
+"""utils/answer_cache.py 단위 테스트."""
+
+from utils.answer_cache import AnswerCache, answer_key
+
+
+# ───────── answer_key ─────────
+
+class TestAnswerKey:
+    def test_query_whitespace_is_normalized(self):
+        """질의의 공백 차이만 있으면 같은 키."""
+        assert answer_key("fp", "폴라이비  효능\n", ["c1"], "m", "v1") == answer_key("fp", "폴라이비 효능", ["c1"], "m", "v1")
+
+    def test_every_component_is_part_of_key(self):
+        """fingerprint·질의·청크·모델·프롬프트 버전 중 하나라도 다르면 다른 키."""
+        base = answer_key("fp", "효능", ["c1", "c2"], "m", "v1")
+        assert base != answer_key("fp2", "효능", ["c1", "c2"], "m", "v1")
+        assert base != answer_key("fp", "안전성", ["c1", "c2"], "m", "v1")
+        assert base != answer_key("fp", "효능", ["c2", "c1"], "m", "v1")
+        assert base != answer_key("fp", "효능", ["c1", "c2"], "m2", "v1")
+        assert base != answer_key("fp", "효능", ["c1", "c2"], "m", "v2")
+
+
+# ───────── AnswerCache ─────────
+
+class TestAnswerCache:
+    def test_put_then_get(self, tmp_path):
+        """저장한 답변을 조회하고, 없는 키는 None."""
+        cache = AnswerCache(tmp_path / "a.sqlite", max_bytes=1 << 20)
+        cache.put("k1", "2~8°C 냉장 보관")
+
+        assert cache.get("k1") == "2~8°C 냉장 보관"
+        assert cache.get("k2") is None
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_persists_across_instances(self, tmp_path):
+        """다른 인스턴스(다른 프로세스)에서도 저장된 답변을 조회."""
+        AnswerCache(tmp_path / "a.sqlite", max_bytes=1 << 20).put("k1", "답변")
+        assert AnswerCache(tmp_path / "a.sqlite", max_bytes=1 << 20).get("k1") == "답변"
+
+    def test_lru_eviction(self, tmp_path):
+        """용량을 넘으면 가장 오래 조회되지 않은 답변부터 축출."""
+        cache = AnswerCache(tmp_path / "a.sqlite", max_bytes=25)
+        cache.put("old", "a" * 10)
+        cache.put("recent", "b" * 10)
+        cache.get("old")
+        cache.put("new", "c" * 10)
+
+        assert cache.get("recent") is None
+        assert cache.get("old") is not None and cache.get("new") is not None
+        assert len(cache) == 2
@@ -0,0 +1,86 @@
+"""utils/chunk_store.py 단위 테스트."""
+
+import sqlite3
+
+import pytest
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from utils.chunk_store import SqliteDocstore, write_chunk_store
+
+
+# ───────── fixtures ─────────
+
+def _make_vectorstore() -> FAISS:
+    """provenance metadata가 있는 소형 FAISS 벡터스토어."""
+    docs = [
+        Document(page_content="폴라이비 효능", metadata={"source": "a.pdf", "page": 1}),
+        Document(
+            page_content="폴라이비 안전성",
+            metadata={"source": "a.pdf", "page": 2, "provenance": [{"source": "a.pdf", "page": 2}, {"source": "b.pdf", "page": 5}]},
+        ),
+        Document(page_content="폴라이비 용법", metadata={"source": "b.pdf", "page": 1}),
+    ]
+    return FAISS.from_documents(docs, DeterministicFakeEmbedding(size=8), ids=["c1", "c2", "c3"])
+
+
+@pytest.fixture
+def store(tmp_path):
+    write_chunk_store(tmp_path / "chunks.sqlite", _make_vectorstore())
+    store = SqliteDocstore(tmp_path / "chunks.sqlite", cache_size=2)
+    yield store
+    store.close()
+
+
+# ───────── SqliteDocstore ─────────
+
+class TestSqliteDocstore:
+    def test_roundtrip_preserves_text_and_metadata(self, store):
+        """본문과 metadata(provenance 포함)가 그대로 복원되고 Document.id가 채워짐."""
+        doc = store.search("c2")
+        assert doc.page_content == "폴라이비 안전성"
+        assert doc.metadata["provenance"][1] == {"source": "b.pdf", "page": 5}
+        assert doc.id == "c2"
+
+    def test_missing_id_returns_message(self, store):
+        """없는 ID는 InMemoryDocstore처럼 안내 문자열을 반환."""
+        assert isinstance(store.search("nope"), str)
+
+    def test_position_ids_follow_index_order(self, store):
+        """위치 → 청크 ID 매핑이 FAISS 인덱스 순서와 같음."""
+        assert store.index_to_docstore_id[0] == "c1"
+        assert list(store.index_to_docstore_id.values()) == ["c1", "c2", "c3"]
+        assert len(store.index_to_docstore_id) == 3
+        with pytest.raises(KeyError):
+            store.index_to_docstore_id[3]
+
+    def test_lru_keeps_only_recent_chunks(self, store):
+        """캐시는 cache_size개까지만 보관하고 가장 오래 조회되지 않은 청크부터 버림."""
+        first = store.search("c1")
+        store.search("c2")
+        store.search("c3")
+
+        assert list(store._cache) == ["c2", "c3"]
+        assert store.search("c1") is not first
+
+    def test_to_memory_is_editable(self, store):
+        """to_memory()로 변환한 docstore에는 청크를 추가할 수 있음."""
+        docstore, index_to_id = store.to_memory()
+        docstore.add({"c4": Document(page_content="추가")})
+        assert index_to_id == {0: "c1", 1: "c2", 2: "c3"}
+        assert docstore.search("c4").page_content == "추가"
+
+    def test_search_through_faiss(self, store, tmp_path):
+        """FAISS 벡터스토어의 docstore로 쓰면 검색 결과를 디스크에서 읽음."""
+        vs = _make_vectorstore()
+        vs.docstore, vs.index_to_docstore_id = store, store.index_to_docstore_id
+
+        assert vs.similarity_search("폴라이비 용법", k=1)[0].page_content == "폴라이비 용법"
+        with pytest.raises(ValueError):
+            vs.add_texts(["읽기 전용"])
+
+    def test_missing_file_raises(self, tmp_path):
+        """파일이 없으면 sqlite3.Error."""
+        with pytest.raises(sqlite3.Error):
+            SqliteDocstore(tmp_path / "nothing.sqlite")
@@ -0,0 +1,59 @@
+"""utils/dedup.py 단위 테스트."""
+
+from utils.dedup import MinHashDeduplicator, add_provenance, remove_provenance
+
+_LABEL = (
+    "폴라이비는 이전에 치료받은 적이 없는 미만성 거대 B세포 림프종 성인 환자에서 "
+    "리툭시맙, 사이클로포스파미드, 독소루비신, 프레드니손과 병용 투여한다. "
+    "권장 용량은 1.8 mg/kg이며 21일마다 6주기 동안 90분간 정맥 주입한다."
+)
+
+
+class TestMinHashDeduplicator:
+    def test_identical_text_is_found(self):
+        """같은 텍스트는 공백이 달라도 중복으로 판정."""
+        dedup = MinHashDeduplicator(threshold=0.85)
+        dedup.add("a", dedup.signature(_LABEL))
+
+        assert dedup.find(dedup.signature("  " + _LABEL.replace(" ", "\n", 3))) == "a"
+
+    def test_minor_revision_is_found(self):
+        """한 단어만 바뀐 개정판은 중복으로 판정."""
+        dedup = MinHashDeduplicator(threshold=0.85)
+        dedup.add("a", dedup.signature(_LABEL))
+
+        assert dedup.find(dedup.signature(_LABEL.replace("90분간", "30분간"))) == "a"
+
+    def test_different_text_is_not_found(self):
+        """내용이 다른 텍스트는 중복이 아님."""
+        dedup = MinHashDeduplicator(threshold=0.85)
+        dedup.add("a", dedup.signature(_LABEL))
+
+        assert dedup.find(dedup.signature("이상반응으로 호중구감소증, 말초신경병증, 빈혈이 보고되었다.")) is None
+
+    def test_removed_chunk_is_not_found(self):
+        """제거한 청크는 더 이상 후보가 아님."""
+        dedup = MinHashDeduplicator(threshold=0.85)
+        signature = dedup.signature(_LABEL)
+        dedup.add("a", signature)
+        dedup.remove("a")
+
+        assert dedup.find(signature) is None
+        assert len(dedup) == 0
+
+    def test_signature_is_deterministic(self):
+        """같은 시드의 인스턴스는 같은 서명을 만듦 (재시작 후 재구축에도 동일)."""
+        assert (MinHashDeduplicator().signature(_LABEL) == MinHashDeduplicator().signature(_LABEL)).all()
+
+
+class TestProvenance:
+    def test_add_and_remove(self):
+        """출처 목록은 자신의 출처로 시작하고, 다른 파일 출처만 제거됨."""
+        metadata = {"source": "a.pdf", "page": 1}
+        assert add_provenance(metadata, "b.pdf", 4)
+        assert not add_provenance(metadata, "b.pdf", 4)
+        assert metadata["provenance"] == [{"source": "a.pdf", "page": 1}, {"source": "b.pdf", "page": 4}]
+
+        remove_provenance(metadata, "b.pdf")
+
+        assert "provenance" not in metadata
@@ -0,0 +1,122 @@
+"""utils/embedding_cache.py 단위 테스트."""
+
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from utils.embedding_cache import CachedEmbeddings, EmbeddingCache, cache_key
+
+
+# ───────── fixtures ─────────
+
+class _CountingEmbedding(DeterministicFakeEmbedding):
+    """embed_documents에 전달된 텍스트 수와 embed_query 호출 수를 세는 가짜 임베딩."""
+
+    embedded: int = 0
+    queried: int = 0
+
+    def embed_documents(self, texts):
+        self.embedded += len(texts)
+        return super().embed_documents(texts)
+
+    def embed_query(self, text):
+        self.queried += 1
+        return super().embed_query(text)
+
+
+# ───────── cache_key ─────────
+
+class TestCacheKey:
+    def test_whitespace_is_normalized(self):
+        """공백 차이만 있는 텍스트는 같은 키."""
+        assert cache_key("m", "폴라이비  효능\n") == cache_key("m", "폴라이비 효능")
+
+    def test_model_is_part_of_key(self):
+        """모델이 다르면 다른 키."""
+        assert cache_key("m1", "text") != cache_key("m2", "text")
+
+
+# ───────── EmbeddingCache ─────────
+
+class TestEmbeddingCache:
+    def test_put_then_get(self, tmp_path):
+        """저장한 벡터를 그대로 조회."""
+        cache = EmbeddingCache(tmp_path / "c.sqlite", max_bytes=1 << 20)
+        cache.put_many("m", ["a"], [[0.5, 1.5]])
+
+        (vector,) = cache.get_many("m", ["a"])
+
+        assert vector.tolist() == [0.5, 1.5]
+
+    def test_hit_miss_counters(self, tmp_path):
+        """적중/미스 카운터가 증가."""
+        cache = EmbeddingCache(tmp_path / "c.sqlite", max_bytes=1 << 20)
+        cache.put_many("m", ["a"], [[1.0]])
+        cache.get_many("m", ["a", "b"])
+
+        stats = cache.stats()
+
+        assert (stats.hits, stats.misses) == (1, 1)
+        assert cache.lifetime_stats().hits == 1
+
+    def test_lru_eviction(self, tmp_path):
+        """용량을 넘으면 가장 오래 사용되지 않은 항목부터 축출."""
+        cache = EmbeddingCache(tmp_path / "c.sqlite", max_bytes=40)  # float32 4차원 벡터 2개 + α
+        cache.put_many("m", ["old"], [[1.0] * 4])
+        cache.put_many("m", ["recent"], [[2.0] * 4])
+        cache.get_many("m", ["old"])  # old를 최근 사용으로 갱신
+        cache.put_many("m", ["new"], [[3.0] * 4])
+
+        old, recent, new = cache.get_many("m", ["old", "recent", "new"])
+
+        assert recent is None
+        assert old is not None and new is not None
+
+
+# ───────── CachedEmbeddings ─────────
+
+class TestCachedEmbeddings:
+    def test_identical_chunks_embedded_once(self, tmp_path):
+        """같은 청크는 한 번만 원본 임베딩으로 전송."""
+        inner = _CountingEmbedding(size=8)
+        embedding = CachedEmbeddings(inner, EmbeddingCache(tmp_path / "c.sqlite", 1 << 20), "m")
+
+        first = embedding.embed_documents(["a", "b", "a"])
+        second = embedding.embed_documents(["b", "a"])
+
+        assert inner.embedded == 2
+        assert first[0] == first[2] == second[1]
+
+    def test_query_vectors_persist_across_instances(self, tmp_path):
+        """같은 질의는 프로세스가 바뀌어도 다시 임베딩하지 않고, 문구가 바뀌면 새로 임베딩."""
+        cache = EmbeddingCache(tmp_path / "c.sqlite", 1 << 20)
+        inner = _CountingEmbedding(size=8)
+        first = CachedEmbeddings(inner, cache, "m").embed_query("보관 조건")
+
+        restarted = CachedEmbeddings(inner, EmbeddingCache(tmp_path / "c.sqlite", 1 << 20), "m")
+        assert restarted.preload_queries(["보관 조건", "보관  조건", "유효기간"]) == 1
+        assert restarted.embed_query("보관 조건") == first
+        assert inner.queried == 1
+
+        restarted.embed_query("보관 조건과 유효기간")
+        assert inner.queried == 2
+
+    def test_query_and_document_vectors_are_separate(self, tmp_path):
+        """같은 텍스트라도 질의 벡터는 문서 벡터 캐시를 재사용하지 않음."""
+        inner = _CountingEmbedding(size=8)
+        embedding = CachedEmbeddings(inner, EmbeddingCache(tmp_path / "c.sqlite", 1 << 20), "m")
+
+        embedding.embed_documents(["효능"])
+        embedding.embed_query("효능")
+
+        assert inner.embedded == 1 and inner.queried == 1
+
+    def test_embed_queries_sends_only_misses(self, tmp_path):
+        """일괄 질의 임베딩은 캐시에 없는 질의만 원본으로 보내고 저장."""
+        inner = _CountingEmbedding(size=8)
+        embedding = CachedEmbeddings(inner, EmbeddingCache(tmp_path / "c.sqlite", 1 << 20), "m")
+        single = embedding.embed_query("보관")
+
+        vectors = embedding.embed_queries(["효능", "보관", "효능"])
+
+        assert inner.queried == 2
+        assert vectors[1] == single and vectors[0] == vectors[2]
+        assert embedding.embed_queries(["효능"]) == [vectors[0]] and inner.queried == 2
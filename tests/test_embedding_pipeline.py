@@ -0,0 +1,144 @@
+"""utils/embedding_pipeline.py 단위 테스트."""
+
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from langchain_google_genai import GoogleGenerativeAIEmbeddings
+
+from utils.embedding_cache import CachedEmbeddings, EmbeddingCache
+from utils.embedding_pipeline import (
+    BatchedEmbeddings,
+    NormalizedEmbeddings,
+    TokenBucket,
+    embed_queries,
+    embedding_model_id,
+    is_rate_limit_error,
+)
+
+
+# ───────── fixtures ─────────
+
+class _FlakyEmbedding(DeterministicFakeEmbedding):
+    """지정한 텍스트가 포함된 배치에서 예외를 던지는 가짜 임베딩."""
+
+    fail_on: str = ""
+    error_message: str = "500 Internal error"
+    failures_left: int = 0
+    calls: int = 0
+
+    def embed_documents(self, texts):
+        self.calls += 1
+        if self.fail_on in texts and self.failures_left != 0:
+            self.failures_left -= 1
+            raise RuntimeError(self.error_message)
+        return super().embed_documents(texts)
+
+
+# ───────── TokenBucket / 오류 분류 ─────────
+
+class TestTokenBucket:
+    def test_unlimited_never_waits(self):
+        """0이면 제한 없음."""
+        bucket = TokenBucket(0)
+        assert all(bucket.acquire(10_000) == 0.0 for _ in range(100))
+
+    def test_waits_when_exhausted(self):
+        """허용량을 다 쓰면 대기 시간 발생."""
+        bucket = TokenBucket(60)  # 초당 1
+        bucket.acquire(60)
+        with patch("utils.embedding_pipeline.time.sleep") as mock_sleep:
+            bucket.acquire(1)
+        assert mock_sleep.called
+
+    def test_rate_limit_error_detection(self):
+        assert is_rate_limit_error(RuntimeError("429 Resource has been exhausted"))
+        assert not is_rate_limit_error(RuntimeError("400 Bad request"))
+
+
+# ───────── BatchedEmbeddings ─────────
+
+class TestBatchedEmbeddings:
+    def test_order_preserved_across_batches(self):
+        """여러 배치로 나뉘어도 입력 순서대로 벡터 반환."""
+        inner = DeterministicFakeEmbedding(size=8)
+        texts = [f"chunk {i}" for i in range(25)]
+        embedding = BatchedEmbeddings(inner, batch_size=4, max_concurrency=3, requests_per_minute=0, tokens_per_minute=0)
+
+        assert embedding.embed_documents(texts) == inner.embed_documents(texts)
+        assert embedding.last_stats.batches == 7
+
+    def test_rate_limit_is_retried(self):
+        """429는 백오프 후 재시도."""
+        inner = _FlakyEmbedding(size=8, fail_on="b", error_message="429 quota", failures_left=2)
+        embedding = BatchedEmbeddings(inner, batch_size=1, max_concurrency=1, requests_per_minute=0, tokens_per_minute=0)
+
+        with patch("utils.embedding_pipeline.time.sleep"):
+            vectors = embedding.embed_documents(["a", "b"])
+
+        assert len(vectors) == 2
+        assert embedding.last_stats.retries == 2
+
+    def test_completed_batches_are_checkpointed_on_failure(self):
+        """실패해도 완료된 배치는 콜백으로 전달."""
+        inner = _FlakyEmbedding(size=8, fail_on="c", failures_left=-1)
+        embedding = BatchedEmbeddings(inner, batch_size=1, max_concurrency=1, requests_per_minute=0, tokens_per_minute=0)
+        saved: list[str] = []
+
+        with pytest.raises(RuntimeError, match="임베딩 실패"):
+            embedding.embed_documents(["a", "b", "c", "d"], on_batch=lambda texts, _: saved.extend(texts))
+
+        assert saved[:2] == ["a", "b"]
+        assert "c" not in saved
+
+    def test_cache_resumes_after_failure(self, tmp_path):
+        """실패 후 재실행하면 완료된 배치는 캐시에서 재사용."""
+        inner = _FlakyEmbedding(size=8, fail_on="c", failures_left=1)
+        batched = BatchedEmbeddings(inner, batch_size=1, max_concurrency=1, requests_per_minute=0, tokens_per_minute=0)
+        embedding = CachedEmbeddings(batched, EmbeddingCache(tmp_path / "c.sqlite", 1 << 20), "m")
+
+        with pytest.raises(RuntimeError):
+            embedding.embed_documents(["a", "b", "c"])
+        inner.calls = 0
+        embedding.embed_documents(["a", "b", "c"])
+
+        assert inner.calls == 1
+
+
+# ───────── 차원 축소 ─────────
+
+class TestReducedDimension:
+    def test_vectors_are_unit_length(self):
+        """문서·질의 벡터 모두 단위 벡터로 재정규화."""
+        embedding = NormalizedEmbeddings(DeterministicFakeEmbedding(size=16))
+
+        vectors = np.array(embedding.embed_documents(["a", "b"]) + [embedding.embed_query("c")])
+
+        assert np.allclose(np.linalg.norm(vectors, axis=1), 1.0, atol=1e-5)
+
+    def test_model_id_includes_reduced_dimension(self):
+        """축소 차원이면 식별자에 차원이 붙어 캐시·인덱스가 구분됨."""
+        assert embedding_model_id("m", 0) == "m"
+        assert embedding_model_id("m", 768) == "m@768"
+
+
+# ───────── 질의 일괄 임베딩 ─────────
+
+class TestEmbedQueries:
+    def test_matches_embed_query_through_wrappers(self):
+        """래퍼를 거친 일괄 질의 벡터가 embed_query 결과와 같음."""
+        embedding = BatchedEmbeddings(NormalizedEmbeddings(DeterministicFakeEmbedding(size=16)))
+
+        vectors = embed_queries(embedding, ["효능", "보관"])
+
+        assert np.allclose(vectors, [embedding.embed_query("효능"), embedding.embed_query("보관")])
+
+    def test_gemini_uses_one_query_batch_request(self):
+        """Gemini 임베딩은 질의용 task type의 배치 요청 한 번으로 임베딩."""
+        gemini = MagicMock(spec=GoogleGenerativeAIEmbeddings)
+        gemini.embed_documents.return_value = [[1.0, 0.0], [0.0, 1.0]]
+
+        assert embed_queries(gemini, ["효능", "보관"]) == [[1.0, 0.0], [0.0, 1.0]]
+        gemini.embed_documents.assert_called_once_with(["효능", "보관"], task_type="RETRIEVAL_QUERY")
+        gemini.embed_query.assert_not_called()
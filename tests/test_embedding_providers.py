@@ -0,0 +1,96 @@
+"""utils/embedding_providers.py 단위 테스트."""
+
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from utils.embedding_cache import CachedEmbeddings, EmbeddingCache
+from utils.embedding_pipeline import BatchedEmbeddings
+from utils.embedding_providers import EmbeddingProvider, HashingEmbeddings, get_embedding_provider
+
+
+# ───────── HashingEmbeddings ─────────
+
+class TestHashingEmbeddings:
+    def test_unit_length_and_dimension(self):
+        """설정한 차원의 단위 벡터."""
+        vector = np.array(HashingEmbeddings(dim=256).embed_query("폴라이비 POLARIX 임상시험"))
+        assert vector.shape == (256,)
+        assert np.isclose(np.linalg.norm(vector), 1.0)
+
+    def test_deterministic_across_instances(self):
+        """같은 텍스트는 인스턴스와 무관하게 같은 벡터 (문서·질의 동일)."""
+        text = "말초신경병증과 호중구감소증"
+        assert HashingEmbeddings(dim=64).embed_documents([text])[0] == HashingEmbeddings(dim=64).embed_query(text)
+
+    def test_shared_terms_are_closer(self):
+        """용어를 공유하는 텍스트가 무관한 텍스트보다 가까움."""
+        embedding = HashingEmbeddings(dim=1024)
+        query, related, unrelated = (
+            np.array(v)
+            for v in embedding.embed_documents(
+                ["POLARIX 무진행 생존기간", "POLARIX 시험의 무진행 생존기간 결과", "약제위원회 신청 양식 제출 일정"]
+            )
+        )
+        assert query @ related > query @ unrelated
+
+    def test_empty_text_is_zero_vector(self):
+        """토큰이 없는 텍스트는 0 벡터 (정규화 시 0으로 나누지 않음)."""
+        assert not any(HashingEmbeddings(dim=8).embed_query("  ---  "))
+
+
+# ───────── get_embedding_provider ─────────
+
+class TestGetEmbeddingProvider:
+    def test_local_needs_no_api_key(self):
+        """local 제공자는 API 키가 필요 없고 식별자에 차원이 포함됨."""
+        provider = get_embedding_provider("local")
+        assert not provider.requires_api_key
+        assert provider.model_id.endswith(f"@{provider.dim}")
+        assert isinstance(provider.create(), HashingEmbeddings)
+
+    def test_google_needs_api_key(self):
+        """google 제공자는 API 키가 필요."""
+        assert get_embedding_provider("google").requires_api_key
+
+    def test_min_similarity_default_and_override(self, monkeypatch):
+        """유사도 게이트 임계값은 제공자별 기본값이며 RETRIEVER_MIN_SIMILARITY 설정이 우선."""
+        assert get_embedding_provider("google").min_similarity is None
+        assert get_embedding_provider("local").min_similarity == 0.05
+        monkeypatch.setattr("utils.embedding_providers.RETRIEVER_MIN_SIMILARITY", 0.7)
+        assert get_embedding_provider("google").min_similarity == 0.7
+        assert get_embedding_provider("local").min_similarity == 0.7
+
+    def test_incomplete_provider_cannot_be_instantiated(self):
+        """model_id·create를 구현하지 않은 제공자는 생성 시점에 TypeError."""
+        class _Incomplete(EmbeddingProvider):
+            name = "incomplete"
+
+            def create(self, api_key=None):
+                return HashingEmbeddings()
+
+        with pytest.raises(TypeError):
+            _Incomplete()
+
+    def test_unknown_provider_raises(self):
+        """알 수 없는 제공자 이름이면 ValueError."""
+        with pytest.raises(ValueError):
+            get_embedding_provider("openai")
+
+    def test_google_checkpoints_only_with_cache(self, tmp_path):
+        """배치 체크포인트는 임베딩 캐시가 담당하므로, 캐시가 꺼져 있으면 체크포인트 없는 파이프라인."""
+        provider = get_embedding_provider("google")
+        cache = EmbeddingCache(tmp_path / "emb.sqlite", 1024 * 1024)
+        with patch("utils.embedding_providers.GoogleGenerativeAIEmbeddings", lambda **_: DeterministicFakeEmbedding(size=8)):
+            with patch("utils.embedding_providers.get_embedding_cache", return_value=cache):
+                cached = provider.create("key")
+            with patch("utils.embedding_providers.get_embedding_cache", return_value=None):
+                bare = provider.create("key")
+
+        texts = ["완료된 배치 A", "완료된 배치 B"]
+        cached.embed_documents(texts)
+        assert isinstance(cached, CachedEmbeddings)
+        assert all(v is not None for v in cache.get_many(provider.model_id, texts))
+        assert isinstance(bare, BatchedEmbeddings)
@@ -0,0 +1,338 @@
+"""utils/index_store.py 단위 테스트."""
+
+import json
+import sqlite3
+
+import faiss
+import numpy as np
+import pytest
+from langchain_community.docstore.in_memory import InMemoryDocstore
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from utils.chunk_store import CHUNK_STORE_FILENAME, SqliteDocstore
+from utils.index_store import (
+    build_search_index,
+    close_vectorstore,
+    compact_index,
+    compute_corpus_fingerprint,
+    file_content_hash,
+    filtered_search_params,
+    get_index_dir,
+    index_data_dir,
+    load_index,
+    load_index_for_update,
+    load_lexical_index,
+    needs_compaction,
+    optimize_index,
+    read_manifest,
+    reopen_saved_index,
+    save_index,
+)
+
+
+# ───────── fixtures ─────────
+
+def _make_vectorstore() -> FAISS:
+    """가짜 임베딩으로 만든 소형 FAISS 벡터스토어."""
+    docs = [
+        Document(page_content="폴라이비 효능", metadata={"source": "a.pdf", "page": 1}),
+        Document(page_content="폴라이비 안전성", metadata={"source": "a.pdf", "page": 2}),
+    ]
+    return FAISS.from_documents(docs, DeterministicFakeEmbedding(size=8))
+
+
+# ───────── fingerprint ─────────
+
+class TestFingerprint:
+    def test_same_input_same_fingerprint(self):
+        """동일한 입력이면 fingerprint가 같음."""
+        hashes = {"a.pdf": "h1", "b.pdf": "h2"}
+        assert compute_corpus_fingerprint(hashes) == compute_corpus_fingerprint(dict(reversed(hashes.items())))
+
+    def test_content_change_changes_fingerprint(self):
+        """파일 내용 해시가 바뀌면 fingerprint도 바뀜."""
+        assert compute_corpus_fingerprint({"a.pdf": "h1"}) != compute_corpus_fingerprint({"a.pdf": "h2"})
+
+    def test_chunk_settings_change_fingerprint(self):
+        """청킹 설정이나 임베딩 모델이 바뀌면 fingerprint도 바뀜."""
+        hashes = {"a.pdf": "h1"}
+        base = compute_corpus_fingerprint(hashes, chunk_size=1000, chunk_overlap=200, embedding_model="m1")
+        assert base != compute_corpus_fingerprint(hashes, chunk_size=500, chunk_overlap=200, embedding_model="m1")
+        assert base != compute_corpus_fingerprint(hashes, chunk_size=1000, chunk_overlap=100, embedding_model="m1")
+        assert base != compute_corpus_fingerprint(hashes, chunk_size=1000, chunk_overlap=200, embedding_model="m2")
+
+    def test_extractor_change_changes_fingerprint(self):
+        """PDF 추출 백엔드가 바뀌면 fingerprint도 바뀜."""
+        hashes = {"a.pdf": "h1"}
+        assert compute_corpus_fingerprint(hashes, extractor_id="pypdf2-3.0.1-v1") != compute_corpus_fingerprint(
+            hashes, extractor_id="pymupdf-1.24.0-v1"
+        )
+
+    def test_file_content_hash(self, tmp_path):
+        """내용이 같은 파일은 같은 해시."""
+        (tmp_path / "a.pdf").write_bytes(b"same")
+        (tmp_path / "b.pdf").write_bytes(b"same")
+        assert file_content_hash(tmp_path / "a.pdf") == file_content_hash(tmp_path / "b.pdf")
+
+
+# ───────── save / load ─────────
+
+class TestSaveLoad:
+    def test_index_dir_is_next_to_master_data(self):
+        """인덱스 폴더가 master_data와 같은 레벨에 위치."""
+        assert get_index_dir("products/polivy/master_data/").as_posix() == "products/polivy/index"
+
+    def test_roundtrip_with_matching_fingerprint(self, tmp_path):
+        """fingerprint가 일치하면 저장된 인덱스를 로드."""
+        vs = _make_vectorstore()
+        save_index(vs, tmp_path, "fp1", {"a.pdf": "h1"})
+
+        loaded = load_index(tmp_path, "fp1", DeterministicFakeEmbedding(size=8))
+
+        assert loaded is not None
+        assert loaded.index.ntotal == 2
+        assert read_manifest(tmp_path)["chunks"] == 2
+
+    def test_mismatched_fingerprint_returns_none(self, tmp_path):
+        """fingerprint가 다르면 None 반환."""
+        save_index(_make_vectorstore(), tmp_path, "fp1", {"a.pdf": "h1"})
+        assert load_index(tmp_path, "fp2", DeterministicFakeEmbedding(size=8)) is None
+
+    def test_missing_index_returns_none(self, tmp_path):
+        """저장된 인덱스가 없으면 None 반환."""
+        assert load_index(tmp_path / "nothing", "fp1", DeterministicFakeEmbedding(size=8)) is None
+
+    def test_loaded_chunks_stay_on_disk(self, tmp_path):
+        """로드한 인덱스의 청크는 디스크 docstore에서 읽고, 증분 인덱싱용 로드는 메모리 docstore."""
+        save_index(_make_vectorstore(), tmp_path, "fp1", {"a.pdf": "h1"})
+
+        loaded = load_index(tmp_path, "fp1", DeterministicFakeEmbedding(size=8))
+        updatable, _ = load_index_for_update(tmp_path, DeterministicFakeEmbedding(size=8))
+
+        assert isinstance(loaded.docstore, SqliteDocstore)
+        assert loaded.similarity_search("폴라이비 효능", k=1)[0].metadata == {"source": "a.pdf", "page": 1}
+        assert isinstance(updatable.docstore, InMemoryDocstore)
+        assert not (tmp_path / "index.pkl").exists()
+
+    def test_each_save_writes_a_new_version(self, tmp_path):
+        """저장할 때마다 새 버전 폴더에 쓰고 열려 있는 이전 버전 파일은 건드리지 않으며, 직전 버전까지만 남김."""
+        save_index(_make_vectorstore(), tmp_path, "fp1", {"a.pdf": "h1"})
+        first = index_data_dir(tmp_path)
+        reader = load_index(tmp_path, "fp1", DeterministicFakeEmbedding(size=8))
+        before = (first / CHUNK_STORE_FILENAME).stat()
+
+        save_index(_make_vectorstore(), tmp_path, "fp2", {"a.pdf": "h2"})
+        second = index_data_dir(tmp_path)
+
+        assert second != first and second.parent == tmp_path
+        after = (first / CHUNK_STORE_FILENAME).stat()
+        assert (after.st_ino, after.st_mtime_ns) == (before.st_ino, before.st_mtime_ns)
+        assert reader.similarity_search("폴라이비 효능", k=1)[0].page_content == "폴라이비 효능"
+
+        save_index(_make_vectorstore(), tmp_path, "fp3", {"a.pdf": "h3"})
+
+        assert not first.exists() and second.exists()
+        assert load_index(tmp_path, "fp3", DeterministicFakeEmbedding(size=8)).index.ntotal == 2
+
+    def test_legacy_layout_loads_and_is_cleaned_up(self, tmp_path):
+        """버전 폴더가 없는 이전 레이아웃도 로드하고, 다음 저장 때 최상위 파일을 정리."""
+        save_index(_make_vectorstore(), tmp_path, "fp1", {"a.pdf": "h1"})
+        manifest = read_manifest(tmp_path)
+        for path in index_data_dir(tmp_path, manifest).iterdir():
+            path.rename(tmp_path / path.name)
+        manifest.pop("version")
+        (tmp_path / "manifest.json").write_text(json.dumps(manifest), encoding="utf-8")
+
+        legacy = load_index(tmp_path, "fp1", DeterministicFakeEmbedding(size=8))
+        assert legacy is not None and legacy.index.ntotal == 2
+        close_vectorstore(legacy)
+
+        save_index(_make_vectorstore(), tmp_path, "fp2", {"a.pdf": "h2"})
+
+        assert not (tmp_path / CHUNK_STORE_FILENAME).exists()
+        assert (index_data_dir(tmp_path) / CHUNK_STORE_FILENAME).exists()
+
+    def test_reopen_closes_previous_docstore(self, tmp_path):
+        """저장한 인덱스를 다시 열면 이전 디스크 docstore의 파일 핸들을 닫음."""
+        save_index(_make_vectorstore(), tmp_path, "fp1", {"a.pdf": "h1"})
+        vs = load_index(tmp_path, "fp1", DeterministicFakeEmbedding(size=8))
+        previous = vs.docstore
+
+        reopen_saved_index(vs, tmp_path)
+
+        with pytest.raises(sqlite3.ProgrammingError):
+            previous.search("x")
+        assert vs.docstore is not previous
+        assert vs.similarity_search("폴라이비 효능", k=1)[0].page_content == "폴라이비 효능"
+
+    def test_close_vectorstore_releases_docstore(self, tmp_path):
+        """close_vectorstore()는 디스크 docstore만 닫고, 메모리 docstore와 None은 무시."""
+        save_index(_make_vectorstore(), tmp_path, "fp1", {"a.pdf": "h1"})
+        vs = load_index(tmp_path, "fp1", DeterministicFakeEmbedding(size=8))
+
+        close_vectorstore(vs)
+        close_vectorstore(vs)
+        close_vectorstore(_make_vectorstore())
+        close_vectorstore(None)
+
+        with pytest.raises(sqlite3.ProgrammingError):
+            len(vs.docstore)
+
+    def test_lexical_index_saved_alongside(self, tmp_path):
+        """인덱스와 같은 청크로 만든 BM25 인덱스가 함께 저장됨."""
+        vs = _make_vectorstore()
+        save_index(vs, tmp_path, "fp1", {"a.pdf": "h1"})
+
+        lexical = load_lexical_index(tmp_path)
+
+        assert lexical is not None and lexical.matches(vs)
+        assert vs.docstore.search(lexical.search("안전성", k=1)[0][0]).page_content == "폴라이비 안전성"
+
+    def test_mmap_load_matches_in_memory_load(self, tmp_path):
+        """메모리 매핑으로 로드해도 검색 결과가 같음."""
+        save_index(_make_vectorstore(), tmp_path, "fp1", {"a.pdf": "h1"})
+        embedding = DeterministicFakeEmbedding(size=8)
+
+        mapped = load_index(tmp_path, "fp1", embedding, mmap=True)
+        in_memory = load_index(tmp_path, "fp1", embedding, mmap=False)
+
+        query = "폴라이비 안전성"
+        assert mapped.similarity_search(query, k=2) == in_memory.similarity_search(query, k=2)
+
+    def test_resave_keeps_mapped_reader_valid(self, tmp_path):
+        """매핑 중인 인덱스 위에 다시 저장해도 기존 프로세스는 옛 파일을 계속 읽음."""
+        save_index(_make_vectorstore(), tmp_path, "fp1", {"a.pdf": "h1"})
+        mapped = load_index(tmp_path, "fp1", DeterministicFakeEmbedding(size=8), mmap=True)
+
+        updated, _ = load_index_for_update(tmp_path, DeterministicFakeEmbedding(size=8))
+        updated.add_texts(["폴라이비 용법"], metadatas=[{"source": "b.pdf", "page": 1}])
+        save_index(updated, tmp_path, "fp2", {"a.pdf": "h1", "b.pdf": "h2"})
+
+        assert mapped.index.ntotal == 2
+        assert mapped.similarity_search("폴라이비 효능", k=1)[0].page_content == "폴라이비 효능"
+        assert load_index(tmp_path, "fp2", DeterministicFakeEmbedding(size=8)).index.ntotal == 3
+
+
+# ───────── compaction ─────────
+
+class TestCompaction:
+    def test_needs_compaction_threshold(self):
+        """삭제 누적량이 비율을 넘을 때만 압축."""
+        assert not needs_compaction(0, 100)
+        assert needs_compaction(90, 100)
+
+    def test_compact_keeps_vectors(self):
+        """압축 후에도 남은 벡터와 검색 결과가 유지됨."""
+        vs = _make_vectorstore()
+        vs.delete([vs.index_to_docstore_id[0]])
+
+        compact_index(vs)
+
+        assert vs.index.ntotal == 1
+        assert vs.similarity_search("폴라이비 안전성", k=1)[0].page_content == "폴라이비 안전성"
+
+    @pytest.mark.parametrize("storage", ["float16", "int8"])
+    def test_compacting_quantized_index_restores_original_vectors(self, storage):
+        """양자화 인덱스를 압축하면 복원값을 다시 양자화하지 않고 원래 벡터의 float32 flat 인덱스가 됨."""
+        vs = _make_vectorstore()
+        exact = vs.index.reconstruct_n(0, 2)
+        optimize_index(vs, "flat", storage)
+
+        compact_index(vs)
+
+        assert type(vs.index) is faiss.IndexFlat
+        assert np.array_equal(vs.index.reconstruct_n(0, 2), exact)
+
+    def test_update_of_quantized_index_keeps_original_vectors(self, tmp_path, monkeypatch):
+        """같은 양자화 저장 형식으로 증분 갱신할 때도 원래 벡터로 복원하여 갱신."""
+        monkeypatch.setattr("utils.index_store.INDEX_STORAGE", "int8")
+        vs = _make_vectorstore()
+        exact = vs.index.reconstruct_n(0, 2)
+        optimize_index(vs, "flat", "int8")
+        save_index(vs, tmp_path, "fp1", {"a.pdf": "h1"}, {"a.pdf": list(vs.index_to_docstore_id.values())})
+
+        loaded, _ = load_index_for_update(tmp_path, DeterministicFakeEmbedding(size=8))
+
+        assert type(loaded.index) is faiss.IndexFlat
+        assert np.array_equal(loaded.index.reconstruct_n(0, 2), exact)
+
+
+# ───────── search index types ─────────
+
+def _random_vectors(n: int, dim: int = 16) -> np.ndarray:
+    return np.random.default_rng(0).random((n, dim), dtype=np.float32)
+
+
+class TestSearchIndex:
+    @pytest.mark.parametrize("index_type, expected", [("hnsw", faiss.IndexHNSWFlat), ("ivf", faiss.IndexIVFFlat)])
+    def test_ann_index_finds_stored_vectors(self, index_type, expected):
+        """근사 인덱스도 저장된 벡터 자신을 최근접으로 찾고, 벡터를 복원할 수 있음."""
+        vectors = _random_vectors(500)
+
+        index = build_search_index(vectors, index_type=index_type, min_vectors=0)
+
+        assert isinstance(index, expected)
+        _, ids = index.search(vectors[:20], 1)
+        assert (ids[:, 0] == np.arange(20)).mean() >= 0.9
+        assert np.allclose(index.reconstruct_n(0, 3), vectors[:3])
+
+    def test_small_corpus_falls_back_to_flat(self):
+        """벡터 수가 min_vectors 미만이면 flat."""
+        index = build_search_index(_random_vectors(50), index_type="hnsw", min_vectors=100)
+        assert isinstance(index, faiss.IndexFlat)
+
+    @pytest.mark.parametrize("storage, expected_bytes", [("float16", 2), ("int8", 1)])
+    def test_compressed_storage(self, storage, expected_bytes):
+        """float16/int8 저장은 벡터당 크기가 줄고 복원 오차가 작음."""
+        vectors = _random_vectors(300, dim=32)
+
+        index = build_search_index(vectors, index_type="flat", storage=storage)
+
+        assert isinstance(index, faiss.IndexScalarQuantizer)
+        assert index.code_size == 32 * expected_bytes
+        assert np.abs(index.reconstruct_n(0, 300) - vectors).max() < 0.01
+        _, ids = index.search(vectors[:20], 1)
+        assert (ids[:, 0] == np.arange(20)).all()
+
+    def test_compressed_storage_applies_to_small_corpus(self):
+        """벡터 수가 적어 flat으로 남아도 저장 형식은 적용됨."""
+        vs = _make_vectorstore()
+        assert optimize_index(vs, "flat", "int8")
+        assert isinstance(vs.index, faiss.IndexScalarQuantizer)
+        assert not optimize_index(_make_vectorstore(), "flat", "float32")
+
+    @pytest.mark.parametrize("index_type", ["flat", "hnsw", "ivf"])
+    def test_filtered_search_only_returns_selected(self, index_type):
+        """사전 필터 파라미터로 검색하면 선택한 위치의 벡터만 반환."""
+        vectors = _random_vectors(500)
+        index = build_search_index(vectors, index_type=index_type, min_vectors=0)
+        selected = np.arange(1, 500, 2)
+
+        _, ids = index.search(vectors[:10], 5, params=filtered_search_params(index, selected))
+
+        assert set(ids[ids != -1].tolist()) <= set(selected.tolist())
+        assert (ids[1::2, 0] == np.arange(1, 10, 2)).all()
+
+    def test_unknown_storage_raises(self):
+        """알 수 없는 저장 형식은 ValueError."""
+        with pytest.raises(ValueError, match="알 수 없는 벡터 저장 형식"):
+            build_search_index(_random_vectors(10), storage="int4")
+
+    def test_unknown_index_type_raises(self):
+        """알 수 없는 인덱스 종류는 ValueError."""
+        with pytest.raises(ValueError, match="알 수 없는 인덱스 종류"):
+            build_search_index(_random_vectors(10), index_type="lsh")
+
+    def test_ann_index_is_updated_as_flat(self, tmp_path, monkeypatch):
+        """근사 인덱스로 저장해도 증분 갱신용 로드는 같은 벡터의 flat 인덱스."""
+        monkeypatch.setattr("utils.index_store.INDEX_ANN_MIN_VECTORS", 0)
+        vs = _make_vectorstore()
+        assert optimize_index(vs, "hnsw")
+        save_index(vs, tmp_path, "fp1", {"a.pdf": "h1"}, {"a.pdf": list(vs.index_to_docstore_id.values())})
+
+        loaded, _ = load_index_for_update(tmp_path, DeterministicFakeEmbedding(size=8))
+
+        assert isinstance(loaded.index, faiss.IndexFlat)
+        assert np.allclose(loaded.index.reconstruct_n(0, 2), vs.index.reconstruct_n(0, 2))
@@ -0,0 +1,93 @@
+"""utils/lexical_index.py 단위 테스트."""
+
+from langchain_community.vectorstores import FAISS
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from utils.lexical_index import BM25Index, reciprocal_rank_fusion, tokenize
+
+
+# ───────── fixtures ─────────
+
+_DOCS = [
+    ("c1", "폴라이비는 POLARIX 임상시험(GO29365)에서 무진행 생존기간을 개선하였다."),
+    ("c2", "이상반응으로 말초신경병증과 호중구감소증이 보고되었다."),
+    ("c3", "권장 용량은 1.8 mg/kg이며 21일 간격으로 6주기 투여한다."),
+    ("c4", "국내 상급종합병원의 약제위원회 통과 현황을 정리하였다."),
+]
+
+
+# ───────── tokenize ─────────
+
+class TestTokenize:
+    def test_korean_uses_character_bigrams(self):
+        """한글은 글자 bigram으로 나뉘어 조사가 붙어도 어간 bigram이 겹침."""
+        assert tokenize("폴라이비는") == ["폴라", "라이", "이비", "비는"]
+        assert set(tokenize("폴라이비")) <= set(tokenize("폴라이비는"))
+
+    def test_english_and_numbers_are_words(self):
+        """영문·숫자는 소문자 단어 단위, 소수점은 유지."""
+        assert tokenize("POLARIX GO29365 1.8 mg/kg") == ["polarix", "go29365", "1.8", "mg", "kg"]
+
+    def test_single_syllable_kept(self):
+        """한 글자 한글 단어도 토큰으로 남음."""
+        assert tokenize("약 투여") == ["약", "투여"]
+
+
+# ───────── BM25Index ─────────
+
+class TestBM25Index:
+    def test_exact_term_ranks_first(self):
+        """임상시험명·약품명 같은 정확한 용어가 있는 청크가 최상위."""
+        index = BM25Index.build(_DOCS)
+        assert index.search("GO29365 결과", k=2)[0][0] == "c1"
+        assert index.search("말초신경병증 발생률", k=2)[0][0] == "c2"
+
+    def test_unmatched_chunks_are_excluded(self):
+        """질의 토큰이 없는 청크는 결과에서 제외."""
+        index = BM25Index.build(_DOCS)
+        assert [doc_id for doc_id, _ in index.search("POLARIX", k=4)] == ["c1"]
+        assert index.search("xyz", k=4) == []
+
+    def test_mask_limits_search(self):
+        """mask에 없는 청크는 점수가 있어도 제외."""
+        index = BM25Index.build(_DOCS)
+        mask = index.mask({"c2", "c3", "unknown"})
+
+        assert mask.tolist() == [False, True, True, False]
+        assert [doc_id for doc_id, _ in index.search("POLARIX 용량", k=4, mask=mask)] == ["c3"]
+
+    def test_save_load_roundtrip(self, tmp_path):
+        """저장 후 로드해도 검색 결과가 같음."""
+        index = BM25Index.build(_DOCS)
+        index.save(tmp_path / "lexical.npz")
+
+        loaded = BM25Index.load(tmp_path / "lexical.npz")
+
+        assert loaded.search("용량 1.8 mg", k=3) == index.search("용량 1.8 mg", k=3)
+
+    def test_missing_or_corrupt_file_returns_none(self, tmp_path):
+        """파일이 없거나 손상되었으면 None."""
+        assert BM25Index.load(tmp_path / "nothing.npz") is None
+        (tmp_path / "broken.npz").write_bytes(b"not an npz")
+        assert BM25Index.load(tmp_path / "broken.npz") is None
+
+    def test_matches_vectorstore_chunks(self):
+        """벡터스토어와 청크 구성이 같을 때만 matches()가 True."""
+        vs = FAISS.from_texts(
+            [text for _, text in _DOCS], DeterministicFakeEmbedding(size=8), ids=[i for i, _ in _DOCS]
+        )
+        assert BM25Index.from_vectorstore(vs).matches(vs)
+        assert not BM25Index.build(_DOCS[:3]).matches(vs)
+
+
+# ───────── reciprocal rank fusion ─────────
+
+class TestReciprocalRankFusion:
+    def test_chunks_found_by_both_rank_first(self):
+        """양쪽 검색에 모두 나온 청크가 한쪽에서만 1위인 청크보다 앞섬."""
+        fused = reciprocal_rank_fusion([["a", "b", "c"], ["d", "b", "a"]], k=3)
+        assert fused == ["a", "b", "d"]
+
+    def test_limits_to_k(self):
+        """상위 k개만 반환."""
+        assert len(reciprocal_rank_fusion([["a", "b", "c"], ["d"]], k=2)) == 2
@@ -0,0 +1,74 @@
+"""utils/pdf_extractors.py 단위 테스트."""
+
+from importlib.metadata import PackageNotFoundError
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from utils.pdf_extractors import (
+    DEFAULT_EXTRACTOR,
+    EXTRACTORS,
+    PdfExtractor,
+    PyPDF2Extractor,
+    PyMuPDFExtractor,
+    available_extractors,
+    get_extractor,
+)
+
+
+class TestGetExtractor:
+    def test_default_is_pypdf2(self):
+        """설정 기본값은 PyPDF2 백엔드."""
+        assert isinstance(get_extractor(), PyPDF2Extractor)
+        assert DEFAULT_EXTRACTOR in available_extractors()
+
+    def test_name_is_case_insensitive(self):
+        """백엔드 이름은 대소문자를 구분하지 않음."""
+        assert isinstance(get_extractor("PyPDF2"), PyPDF2Extractor)
+
+    def test_unknown_name_raises(self):
+        """알 수 없는 백엔드 이름은 ValueError."""
+        with pytest.raises(ValueError, match="알 수 없는 PDF 추출 백엔드"):
+            get_extractor("acrobat")
+
+    def test_missing_backend_falls_back_to_default(self):
+        """설치되지 않은 백엔드는 PyPDF2로 대체."""
+        with patch.object(PyMuPDFExtractor, "is_available", return_value=False):
+            assert isinstance(get_extractor("pymupdf"), PyPDF2Extractor)
+
+    def test_extractor_id_includes_name_and_version(self):
+        """식별자에 백엔드 이름과 패키지 버전이 포함되어 백엔드별로 다름."""
+        import PyPDF2
+
+        assert get_extractor().extractor_id == f"pypdf2-{PyPDF2.__version__}-v1"
+        assert len({cls.name for cls in EXTRACTORS.values()}) == len(EXTRACTORS)
+
+    def test_missing_distribution_metadata_falls_back_to_module_version(self):
+        """배포 메타데이터가 없어도(PyInstaller exe) 모듈 __version__으로 식별하고 사용 가능으로 판단."""
+        import PyPDF2
+
+        with patch("utils.pdf_extractors.version", side_effect=PackageNotFoundError("PyPDF2")):
+            assert PyPDF2Extractor.is_available()
+            assert get_extractor().extractor_id == f"pypdf2-{PyPDF2.__version__}-v1"
+
+    def test_incomplete_backend_cannot_be_instantiated(self):
+        """iter_page_texts를 구현하지 않은 백엔드는 생성 시점에 TypeError."""
+        class _Incomplete(PdfExtractor):
+            name = "incomplete"
+
+        with pytest.raises(TypeError):
+            _Incomplete()
+
+
+class TestPyPDF2Extractor:
+    def test_empty_pages_are_yielded_as_empty_strings(self, tmp_path):
+        """텍스트가 없는 페이지도 빈 문자열로 반환하여 페이지 번호가 유지됨."""
+        pdf_file = tmp_path / "test.pdf"
+        pdf_file.write_bytes(b"%PDF-1.4 dummy")
+        pages = [MagicMock(), MagicMock()]
+        pages[0].extract_text.return_value = None
+        pages[1].extract_text.return_value = "본문"
+        reader = MagicMock(pages=pages)
+
+        with patch("utils.pdf_extractors.PyPDF2.PdfReader", return_value=reader):
+            assert list(PyPDF2Extractor().iter_page_texts(pdf_file)) == ["", "본문"]
@@ -1,12 +1,39 @@
 """utils/pdf_loader.py 단위 테스트."""
 
 import io
+from functools import partial
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
+import faiss
+import numpy as np
 import pytest
-
-from utils.pdf_loader import chunk_documents, extract_text_from_pdf
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from utils.pdf_loader import (
+    BoilerplateStats,
+    _iter_file_chunks,
+    _StreamingIndexer,
+    build_vectorstore,
+    chunk_documents,
+    count_chunks_from_paths,
+    extract_text_from_pdf,
+    iter_cached_pdf_pages,
+    strip_boilerplate,
+)
+from utils.embedding_pipeline import BatchedEmbeddings
+from utils.index_store import (
+    ORIGINAL_VECTORS_FILENAME,
+    compute_corpus_fingerprint,
+    file_content_hash,
+    index_data_dir,
+    index_spec,
+    optimize_index,
+    read_manifest,
+)
+from utils.pdf_extractors import available_extractors, get_extractor
+from utils.text_store import PageTextStore
 
 
 # ───────── fixtures ─────────
@@ -23,6 +50,37 @@ def _make_mock_reader(pages_text: list[str]):
     return mock_reader
 
 
+def _write_text_pdf(path: Path, pages_text: list[str]) -> Path:
+    """페이지별 텍스트를 담은 최소 구성의 실제 PDF 파일 생성 (ASCII 텍스트만)."""
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # Pages 객체는 페이지 목록이 정해진 뒤 채움
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    kids = []
+    for text in pages_text:
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET"
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents {len(objects)} 0 R "
+            "/Resources << /Font << /F1 3 0 R >> >> >>"
+        )
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+
+    out = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n".encode()
+    xref_offset = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += "".join(f"{o:010d} 00000 n \n" for o in offsets).encode()
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n".encode()
+    path.write_bytes(out)
+    return path
+
+
 # ───────── extract_text_from_pdf ─────────
 
 class TestExtractTextFromPdf:
@@ -32,7 +90,7 @@ class TestExtractTextFromPdf:
         pdf_file.write_bytes(b"dummy")
 
         mock_reader = _make_mock_reader(["Page 1 content", "Page 2 content"])
-        with patch("utils.pdf_loader.PyPDF2.PdfReader", return_value=mock_reader):
+        with patch("utils.pdf_extractors.PyPDF2.PdfReader", return_value=mock_reader):
             docs = extract_text_from_pdf(pdf_file)
 
         assert len(docs) == 2
@@ -45,7 +103,7 @@ class TestExtractTextFromPdf:
         pdf_file.write_bytes(b"dummy")
 
         mock_reader = _make_mock_reader(["Content"])
-        with patch("utils.pdf_loader.PyPDF2.PdfReader", return_value=mock_reader):
+        with patch("utils.pdf_extractors.PyPDF2.PdfReader", return_value=mock_reader):
             docs = extract_text_from_pdf(pdf_file)
 
         assert docs[0].metadata["source"] == "sample.pdf"
@@ -57,7 +115,7 @@ class TestExtractTextFromPdf:
         pdf_file.write_bytes(b"dummy")
 
         mock_reader = _make_mock_reader(["", "Valid content", ""])
-        with patch("utils.pdf_loader.PyPDF2.PdfReader", return_value=mock_reader):
+        with patch("utils.pdf_extractors.PyPDF2.PdfReader", return_value=mock_reader):
             docs = extract_text_from_pdf(pdf_file)
 
         assert len(docs) == 1
@@ -69,11 +127,117 @@ class TestExtractTextFromPdf:
         pdf_file.write_bytes(b"dummy")
 
         mock_reader = _make_mock_reader(["", "   ", None])
-        with patch("utils.pdf_loader.PyPDF2.PdfReader", return_value=mock_reader):
+        with patch("utils.pdf_extractors.PyPDF2.PdfReader", return_value=mock_reader):
             with pytest.raises(ValueError, match="텍스트를 추출할 수 없습니다"):
                 extract_text_from_pdf(pdf_file)
 
 
+# ───────── extractor backends ─────────
+
+class TestExtractorBackends:
+    @pytest.mark.parametrize("backend", available_extractors())
+    def test_installed_backends_extract_same_pages(self, tmp_path, backend):
+        """설치된 백엔드는 모두 같은 페이지 구성과 텍스트를 반환."""
+        pdf_file = _write_text_pdf(tmp_path / "label.pdf", ["Storage below 25C", "Keep away from light"])
+
+        docs = extract_text_from_pdf(pdf_file, get_extractor(backend))
+
+        assert [d.metadata["page"] for d in docs] == [1, 2]
+        assert [" ".join(d.page_content.split()) for d in docs] == ["Storage below 25C", "Keep away from light"]
+
+    def test_text_cache_is_per_backend(self, tmp_path):
+        """페이지 텍스트 캐시는 백엔드별로 따로 저장됨."""
+        pdf_file = _write_text_pdf(tmp_path / "label.pdf", ["Storage below 25C"])
+        store = PageTextStore(tmp_path / "pages")
+        list(iter_cached_pdf_pages(pdf_file, store, get_extractor("pypdf2")))
+
+        other = MagicMock(extractor_id="other-1.0-v1")
+        other.iter_page_texts.return_value = iter(["Other text"])
+        (page,) = iter_cached_pdf_pages(pdf_file, store, other)
+
+        assert page.page_content == "Other text"
+
+
+# ───────── iter_cached_pdf_pages ─────────
+
+class TestCachedPages:
+    def test_second_pass_skips_pdf_parsing(self, tmp_path):
+        """저장소에 기록된 PDF는 다시 파싱하지 않음."""
+        pdf_file = _write_text_pdf(tmp_path / "label.pdf", ["Storage below 25C", "Keep away from light"])
+        store = PageTextStore(tmp_path / "pages")
+        first = [d.page_content for d in iter_cached_pdf_pages(pdf_file, store)]
+
+        with patch("utils.pdf_extractors.PyPDF2.PdfReader") as mock_reader:
+            second = list(iter_cached_pdf_pages(pdf_file, store))
+
+        mock_reader.assert_not_called()
+        assert [d.page_content for d in second] == first
+        assert second[1].metadata == {"source": "label.pdf", "page": 2}
+
+    def test_same_content_under_new_name_uses_new_source(self, tmp_path):
+        """내용이 같은 파일을 다른 이름으로 올려도 source는 새 파일명."""
+        store = PageTextStore(tmp_path / "pages")
+        original = _write_text_pdf(tmp_path / "v1.pdf", ["Same text"])
+        list(iter_cached_pdf_pages(original, store))
+        copy = tmp_path / "v2.pdf"
+        copy.write_bytes(original.read_bytes())
+
+        (page,) = iter_cached_pdf_pages(copy, store)
+
+        assert page.metadata["source"] == "v2.pdf"
+
+
+# ───────── strip_boilerplate ─────────
+
+def _journal_pages(bodies: list[str]) -> list[Document]:
+    """머리말·쪽 번호·저작권 꼬리말이 반복되는 가짜 논문 페이지 (본문은 여러 줄)."""
+    return [
+        Document(
+            page_content=f"Blood. 2019;133(8)\n{body}\n{i + 1}\n© 2019 by The American Society of Hematology",
+            metadata={"source": "paper.pdf", "page": i + 1},
+        )
+        for i, body in enumerate(bodies)
+    ]
+
+
+class TestStripBoilerplate:
+    def test_repeated_header_and_footer_are_removed(self):
+        """모든 페이지에 반복되는 머리말과 꼬리말(쪽 번호 포함)은 제거되고 본문은 유지."""
+        bodies = [
+            "Polatuzumab improved PFS.\nHazard ratio 0.73.\nMedian follow-up 28 months.",
+            "Peripheral neuropathy was reported.\nMostly grade 1-2.\nDose reductions were rare.",
+            "OS data are immature.\nNo new safety signals.\nSee supplementary table S4.",
+        ]
+        stats = BoilerplateStats()
+
+        pages = list(strip_boilerplate(_journal_pages(bodies), stats=stats))
+
+        assert [p.page_content for p in pages] == bodies
+        assert [p.metadata["page"] for p in pages] == [1, 2, 3]
+        assert stats.lines_removed == 9
+        assert 0 < stats.removed_ratio < 1
+
+    def test_short_documents_are_untouched(self):
+        """반복을 판단하기에 페이지가 너무 적으면 그대로 둠."""
+        pages = _journal_pages(["A", "B"])
+        assert list(strip_boilerplate(pages)) == pages
+
+    def test_page_with_only_boilerplate_is_dropped(self):
+        """반복 문구만 있던 페이지는 생략."""
+        pages = _journal_pages(["Efficacy\nresults\nhere", "Safety\nresults\nhere", "Cost\nanalysis\nhere"])
+        pages.append(Document(
+            page_content="Blood. 2019;133(8)\n© 2019 by The American Society of Hematology",
+            metadata={"source": "paper.pdf", "page": 4},
+        ))
+
+        assert [p.metadata["page"] for p in strip_boilerplate(pages)] == [1, 2, 3]
+
+    def test_disabled_with_zero_ratio(self):
+        """min_ratio가 0이면 제거하지 않음."""
+        pages = _journal_pages(["A", "B", "C"])
+        assert [p.page_content for p in strip_boilerplate(pages, min_ratio=0)] == [p.page_content for p in pages]
+
+
 # ───────── chunk_documents ─────────
 
 class TestChunkDocuments:
@@ -120,3 +284,387 @@ class TestChunkDocuments:
         for chunk in chunks:
             assert chunk.metadata["source"] == "myfile.pdf"
             assert chunk.metadata["page"] == 5
+
+
+# ───────── build_vectorstore (증분 인덱싱) ─────────
+
+class _CountingEmbedding(DeterministicFakeEmbedding):
+    """embed_documents에 전달된 텍스트 수를 세는 가짜 임베딩."""
+
+    embedded: int = 0
+
+    def embed_documents(self, texts):
+        self.embedded += len(texts)
+        return super().embed_documents(texts)
+
+
+def _fake_pages(path, extractor=None):
+    """파일명 기반 가짜 페이지 Document."""
+    name = Path(path).name
+    return iter([Document(page_content=f"{name} 본문 {i}", metadata={"source": name, "page": i + 1}) for i in range(3)])
+
+
+_SHARED_TEXT = "공통 허가사항: 권장 용량은 1.8 mg/kg이며 21일마다 6주기 동안 정맥 주입한다."
+
+
+def _shared_pages(path, extractor=None):
+    """2페이지가 모든 파일에 공통인 가짜 페이지 Document."""
+    name = Path(path).name
+    texts = [f"{name} 고유 본문", _SHARED_TEXT]
+    return iter([Document(page_content=t, metadata={"source": name, "page": i + 1}) for i, t in enumerate(texts)])
+
+
+def _stored_docs(vs) -> list[Document]:
+    """벡터스토어에 저장된 청크 Document 목록 (메모리·디스크 docstore 공통)."""
+    return [vs.docstore.search(doc_id) for doc_id in vs.index_to_docstore_id.values()]
+
+
+class TestIncrementalBuild:
+    def _build(self, paths, index_dir, embedding, pages=_fake_pages):
+        with patch("utils.embedding_providers.GoogleGenerativeAIEmbeddings", return_value=embedding), \
+             patch("utils.embedding_providers.get_embedding_cache", return_value=None), \
+             patch("utils.pdf_loader.get_embedding_cache", return_value=None), \
+             patch("utils.pdf_loader.get_text_store", return_value=None), \
+             patch("utils.pdf_loader.PDF_WORKERS", 1), \
+             patch("utils.pdf_loader.iter_pdf_pages", side_effect=pages):
+            return build_vectorstore(paths, api_key="fake-key", index_dir=index_dir, incremental=True)
+
+    def _pdfs(self, tmp_path, *names):
+        paths = []
+        for name in names:
+            pdf = tmp_path / name
+            pdf.write_bytes(name.encode())
+            paths.append(pdf)
+        return paths
+
+    def test_added_file_is_the_only_one_embedded(self, tmp_path):
+        """새 PDF를 추가하면 그 파일의 청크만 임베딩."""
+        a, b = self._pdfs(tmp_path, "a.pdf", "b.pdf")
+        index_dir = tmp_path / "index"
+        self._build([a], index_dir, _CountingEmbedding(size=8))
+
+        embedding = _CountingEmbedding(size=8)
+        vs = self._build([a, b], index_dir, embedding)
+
+        assert embedding.embedded == 3
+        assert vs.index.ntotal == 6
+
+    def test_removed_file_vectors_are_deleted(self, tmp_path):
+        """삭제된 PDF의 벡터는 인덱스에서 제거."""
+        a, b = self._pdfs(tmp_path, "a.pdf", "b.pdf")
+        index_dir = tmp_path / "index"
+        self._build([a, b], index_dir, _CountingEmbedding(size=8))
+
+        embedding = _CountingEmbedding(size=8)
+        vs = self._build([a], index_dir, embedding)
+
+        assert embedding.embedded == 0
+        assert vs.index.ntotal == 3
+        assert {d.metadata["source"] for d in _stored_docs(vs)} == {"a.pdf"}
+
+    def test_duplicate_chunks_are_merged(self, tmp_path):
+        """여러 파일에 같은 내용이 있으면 한 번만 임베딩하고 출처를 합침."""
+        a, b = self._pdfs(tmp_path, "a.pdf", "b.pdf")
+        embedding = _CountingEmbedding(size=8)
+
+        vs = self._build([a, b], tmp_path / "index", embedding, pages=_shared_pages)
+
+        assert embedding.embedded == 3
+        (shared,) = [d for d in _stored_docs(vs) if d.page_content == _SHARED_TEXT]
+        assert shared.metadata["provenance"] == [{"source": "a.pdf", "page": 2}, {"source": "b.pdf", "page": 2}]
+
+    def test_removing_owner_restores_duplicate_from_peer(self, tmp_path):
+        """병합 대상 청크의 파일이 삭제되면 중복이던 파일의 청크가 다시 인덱싱됨."""
+        a, b = self._pdfs(tmp_path, "a.pdf", "b.pdf")
+        index_dir = tmp_path / "index"
+        self._build([a, b], index_dir, _CountingEmbedding(size=8), pages=_shared_pages)
+
+        vs = self._build([b], index_dir, _CountingEmbedding(size=8), pages=_shared_pages)
+
+        assert vs.index.ntotal == 2
+        (shared,) = [d for d in _stored_docs(vs) if d.page_content == _SHARED_TEXT]
+        assert shared.metadata["source"] == "b.pdf"
+        assert "provenance" not in shared.metadata
+
+    def test_unchanged_corpus_loads_without_embedding(self, tmp_path):
+        """코퍼스가 그대로면 저장된 인덱스를 재사용."""
+        (a,) = self._pdfs(tmp_path, "a.pdf")
+        index_dir = tmp_path / "index"
+        self._build([a], index_dir, _CountingEmbedding(size=8))
+
+        embedding = _CountingEmbedding(size=8)
+        vs = self._build([a], index_dir, embedding)
+
+        assert embedding.embedded == 0
+        assert vs.index.ntotal == 3
+
+    def test_local_provider_builds_without_api_key(self, tmp_path):
+        """local 임베딩 제공자는 API 키 없이 인덱싱하고, 제공자가 바뀌면 저장된 벡터를 재사용하지 않음."""
+        (a,) = self._pdfs(tmp_path, "a.pdf")
+        index_dir = tmp_path / "index"
+        with patch("utils.pdf_loader.get_embedding_cache", return_value=None), \
+             patch("utils.pdf_loader.get_text_store", return_value=None), \
+             patch("utils.pdf_loader.PDF_WORKERS", 1), \
+             patch("utils.pdf_loader.iter_pdf_pages", side_effect=_fake_pages):
+            vs = build_vectorstore([a], api_key="", index_dir=index_dir, embedding_provider="local")
+
+        assert vs.index.ntotal == 3
+        assert read_manifest(index_dir)["embedding_model"].startswith("local-hashing")
+
+        embedding = _CountingEmbedding(size=8)
+        self._build([a], index_dir, embedding)
+        assert embedding.embedded == 3
+
+    def test_each_file_is_hashed_and_parsed_once(self, tmp_path):
+        """텍스트 저장소가 있으면 파일 내용 해시는 파일당 한 번, PDF 파싱도 한 번."""
+        a, b = self._pdfs(tmp_path, "a.pdf", "b.pdf")
+        store = PageTextStore(tmp_path / "text")
+        with patch("utils.embedding_providers.GoogleGenerativeAIEmbeddings", return_value=_CountingEmbedding(size=8)), \
+             patch("utils.embedding_providers.get_embedding_cache", return_value=None), \
+             patch("utils.pdf_loader.get_embedding_cache", return_value=None), \
+             patch("utils.pdf_loader.get_text_store", return_value=store), \
+             patch("utils.pdf_loader.PDF_WORKERS", 1), \
+             patch("utils.pdf_loader.iter_pdf_pages", side_effect=_fake_pages) as parse, \
+             patch("utils.pdf_loader.file_content_hash", side_effect=file_content_hash) as digest:
+            build_vectorstore([a, b], api_key="fake-key", index_dir=tmp_path / "index", incremental=True)
+
+        assert digest.call_count == 2
+        assert parse.call_count == 2
+
+    def test_each_file_is_parsed_once_without_text_store(self, tmp_path):
+        """텍스트 저장소가 꺼져 있어도 반복 문구 판정의 두 번째 순회는 PDF를 다시 파싱하지 않음."""
+        a, b = self._pdfs(tmp_path, "a.pdf", "b.pdf")
+        parsed = []
+
+        def _pages(path, extractor=None):
+            parsed.append(Path(path).name)
+            return _fake_pages(path)
+
+        vs = self._build([a, b], tmp_path / "index", _CountingEmbedding(size=8), pages=_pages)
+
+        assert parsed == ["a.pdf", "b.pdf"]
+        assert vs.index.ntotal == 6
+
+    def _build_int8(self, paths, index_dir, embedding):
+        """INDEX_STORAGE=int8 설정으로 구축 (기본값 인자는 import 시점에 묶이므로 호출 지점을 패치)."""
+        with patch("utils.pdf_loader.optimize_index", side_effect=lambda vs: optimize_index(vs, "flat", "int8")), \
+             patch("utils.index_store.INDEX_STORAGE", "int8"), \
+             patch(
+                 "utils.pdf_loader.compute_corpus_fingerprint",
+                 side_effect=partial(compute_corpus_fingerprint, index_config=index_spec(storage="int8")),
+             ):
+            return self._build(paths, index_dir, embedding)
+
+    @staticmethod
+    def _exact_vectors(texts):
+        return np.asarray(DeterministicFakeEmbedding(size=8).embed_documents(texts), dtype=np.float32)
+
+    def test_added_file_to_quantized_index_is_the_only_one_embedded(self, tmp_path):
+        """양자화 저장 인덱스에 새 PDF를 추가해도 그 파일의 청크만 임베딩하고, 원래 벡터는 그대로 보존."""
+        a, b = self._pdfs(tmp_path, "a.pdf", "b.pdf")
+        index_dir = tmp_path / "index"
+        self._build_int8([a], index_dir, DeterministicFakeEmbedding(size=8))
+
+        embedding = _CountingEmbedding(size=8)
+        vs = self._build_int8([a, b], index_dir, embedding)
+
+        assert embedding.embedded == 3
+        assert vs.index.ntotal == 6
+        manifest = read_manifest(index_dir)
+        assert manifest["index_storage"] == "int8" and manifest["original_vectors"]
+        originals = faiss.read_index(str(index_data_dir(index_dir) / ORIGINAL_VECTORS_FILENAME))
+        texts = [d.page_content for d in _stored_docs(vs)]
+        assert np.array_equal(originals.reconstruct_n(0, originals.ntotal), self._exact_vectors(texts))
+
+    def test_quantized_index_switches_storage_from_original_vectors(self, tmp_path):
+        """int8로 저장한 인덱스를 float32 설정으로 다시 구축하면 재임베딩 없이 원래 벡터로 변환."""
+        (a,) = self._pdfs(tmp_path, "a.pdf")
+        index_dir = tmp_path / "index"
+        self._build_int8([a], index_dir, DeterministicFakeEmbedding(size=8))
+        assert read_manifest(index_dir)["index_storage"] == "int8"
+
+        embedding = _CountingEmbedding(size=8)
+        vs = self._build([a], index_dir, embedding)
+
+        assert embedding.embedded == 0
+        assert read_manifest(index_dir)["index_storage"] == "float32"
+        assert not (index_data_dir(index_dir) / ORIGINAL_VECTORS_FILENAME).exists()
+        texts = [d.page_content for d in _stored_docs(vs)]
+        assert np.array_equal(vs.index.reconstruct_n(0, vs.index.ntotal), self._exact_vectors(texts))
+
+    def test_quantized_index_without_originals_is_rebuilt_for_new_storage(self, tmp_path):
+        """원래 벡터가 없는 이전 int8 인덱스는 저장 형식이 바뀌면 양자화 벡터 대신 재임베딩으로 재구축."""
+        (a,) = self._pdfs(tmp_path, "a.pdf")
+        index_dir = tmp_path / "index"
+        self._build_int8([a], index_dir, DeterministicFakeEmbedding(size=8))
+        (index_data_dir(index_dir) / ORIGINAL_VECTORS_FILENAME).unlink()
+
+        embedding = _CountingEmbedding(size=8)
+        vs = self._build([a], index_dir, embedding)
+
+        assert embedding.embedded == 3
+        assert read_manifest(index_dir)["index_storage"] == "float32"
+        texts = [d.page_content for d in _stored_docs(vs)]
+        assert np.array_equal(vs.index.reconstruct_n(0, vs.index.ntotal), self._exact_vectors(texts))
+
+    def test_google_provider_requires_api_key(self, tmp_path):
+        """Gemini 임베딩은 API 키가 없으면 ValueError."""
+        with pytest.raises(ValueError):
+            build_vectorstore(self._pdfs(tmp_path, "a.pdf"), api_key="", embedding_provider="google")
+
+
+# ───────── _iter_file_chunks (병렬 추출) ─────────
+
+class TestParallelLoad:
+    def test_pool_results_in_input_order(self, tmp_path):
+        """프로세스 풀 결과가 입력 순서대로 반환되고 chunk_id가 순차 처리와 같음."""
+        paths = [
+            _write_text_pdf(tmp_path / f"doc{i}.pdf", [f"Document {i} page {p}" for p in range(i + 1)])
+            for i in range(4)
+        ]
+
+        parallel = {name: [c.metadata["chunk_id"] for c in chunks] for name, chunks in _iter_file_chunks(paths, workers=4)}
+        sequential = {name: [c.metadata["chunk_id"] for c in chunks] for name, chunks in _iter_file_chunks(paths, workers=1)}
+
+        assert list(parallel) == [p.name for p in paths]
+        assert parallel == sequential
+
+    def test_pool_with_text_store_chunks_from_store(self, tmp_path):
+        """텍스트 저장소가 있으면 워커는 추출만 하고, 청크는 저장소에서 읽어 순차 처리와 같게 생성."""
+        paths = [_write_text_pdf(tmp_path / f"doc{i}.pdf", [f"Document {i} page {p}" for p in range(3)]) for i in range(3)]
+        store = PageTextStore(tmp_path / "text")
+
+        parallel = {name: [c.metadata["chunk_id"] for c in chunks] for name, chunks in _iter_file_chunks(paths, 3, store)}
+        sequential = {name: [c.metadata["chunk_id"] for c in chunks] for name, chunks in _iter_file_chunks(paths, workers=1)}
+
+        assert parallel == sequential
+        assert len(list((tmp_path / "text").rglob("*.jsonl.gz"))) == 3
+
+    def test_broken_file_does_not_abort_build(self, tmp_path):
+        """손상된 PDF가 있어도 나머지 파일은 처리."""
+        good = _write_text_pdf(tmp_path / "good.pdf", ["Valid content"])
+        bad = tmp_path / "bad.pdf"
+        bad.write_bytes(b"not a pdf")
+
+        indexer = _StreamingIndexer(DeterministicFakeEmbedding(size=8))
+        indexer.add_files([bad, good], workers=2)
+        indexer.flush()
+
+        assert indexer.failed_files == ["bad.pdf"]
+        assert indexer.vectorstore.index.ntotal == 1
+
+
+# ───────── _StreamingIndexer ─────────
+
+class _BatchRecordingEmbedding(DeterministicFakeEmbedding):
+    """embed_documents 호출별 배치 크기를 기록하는 가짜 임베딩."""
+
+    batch_sizes: list[int] = []
+
+    def embed_documents(self, texts):
+        self.batch_sizes.append(len(texts))
+        return super().embed_documents(texts)
+
+
+class TestStreamingIndexer:
+    def test_embeds_in_bounded_batches(self, tmp_path):
+        """청크는 batch_size 이하 단위로 임베딩되어 인덱스에 추가."""
+        embedding = _BatchRecordingEmbedding(size=8, batch_sizes=[])
+        indexer = _StreamingIndexer(embedding, batch_size=2)
+
+        with patch("utils.pdf_loader.iter_pdf_pages", side_effect=_fake_pages):
+            indexer.add_files([tmp_path / "a.pdf", tmp_path / "b.pdf"], workers=1)
+        indexer.flush()
+
+        assert max(embedding.batch_sizes) <= 2
+        assert indexer.vectorstore.index.ntotal == 6
+        assert indexer.file_chunks["a.pdf"] == ["a.pdf_p1_c0", "a.pdf_p2_c1", "a.pdf_p3_c2"]
+
+    def test_file_failing_midway_is_removed(self, tmp_path):
+        """순회 도중 실패한 파일은 이미 추가된 청크까지 제거."""
+        def _pages(path, extractor=None):
+            yield from _fake_pages(path)
+            if Path(path).name == "bad.pdf":
+                raise ValueError("손상된 페이지")
+
+        indexer = _StreamingIndexer(DeterministicFakeEmbedding(size=8), batch_size=2)
+        with patch("utils.pdf_loader.iter_pdf_pages", side_effect=_pages):
+            indexer.add_files([tmp_path / "bad.pdf", tmp_path / "good.pdf"], workers=1)
+        indexer.flush()
+
+        assert indexer.failed_files == ["bad.pdf"]
+        assert {d.metadata["source"] for d in indexer.vectorstore.docstore._dict.values()} == {"good.pdf"}
+
+    def test_warns_when_indexing_without_checkpoint(self, caplog):
+        """임베딩 캐시 없이 배치 파이프라인으로 인덱싱하면 체크포인트가 없다고 경고."""
+        with caplog.at_level("WARNING", logger="utils.pdf_loader"):
+            _StreamingIndexer(DeterministicFakeEmbedding(size=8))
+        assert not caplog.records
+
+        with caplog.at_level("WARNING", logger="utils.pdf_loader"):
+            _StreamingIndexer(BatchedEmbeddings(DeterministicFakeEmbedding(size=8)))
+        assert "체크포인트" in caplog.text
+
+    @pytest.mark.parametrize("use_store", [False, True])
+    def test_large_document_pages_are_not_held_in_memory(self, tmp_path, use_store):
+        """페이지가 많은 문서도 메모리에 동시에 머무는 페이지 수는 batch_size 이하."""
+        live = {"now": 0, "peak": 0}
+
+        class _TrackedPage(Document):
+            def __init__(self, **kwargs):
+                super().__init__(**kwargs)
+                live["now"] += 1
+                live["peak"] = max(live["peak"], live["now"])
+
+            def __del__(self):
+                live["now"] -= 1
+
+        def _pages(path, extractor=None):
+            for i in range(300):
+                yield _TrackedPage(
+                    page_content=f"Blood. 2019;133(8)\n본문 {i} 내용\n결과 {i} 요약\n{i + 1}",
+                    metadata={"source": Path(path).name, "page": i + 1},
+                )
+
+        pdf = tmp_path / "big.pdf"
+        pdf.write_bytes(b"dummy")
+        batch_size = 4
+        store = PageTextStore(tmp_path / "text") if use_store else None
+        indexer = _StreamingIndexer(DeterministicFakeEmbedding(size=8), batch_size=batch_size, text_store=store)
+        with (
+            patch("utils.pdf_loader.iter_pdf_pages", side_effect=_pages),
+            patch("utils.pdf_loader.Document", _TrackedPage),
+        ):
+            indexer.add_files([pdf], workers=1)
+        indexer.flush()
+
+        assert 0 < live["peak"] <= batch_size
+        assert indexer.vectorstore.index.ntotal == 300
+        assert not any("Blood" in d.page_content for d in indexer.vectorstore.docstore._dict.values())
+
+
+# ───────── count_chunks_from_paths ─────────
+
+class TestCountChunks:
+    def _count(self, paths, pages):
+        with patch("utils.pdf_loader.get_text_store", return_value=None), \
+             patch("utils.pdf_loader.iter_pdf_pages", side_effect=pages):
+            return count_chunks_from_paths(paths)
+
+    def test_counts_chunks_and_skips_textless_files(self, tmp_path):
+        """텍스트 없는 파일(ValueError)은 조용히 건너뛰고 나머지 청크를 셈."""
+        def _pages(path, extractor=None):
+            if Path(path).name == "empty.pdf":
+                raise ValueError("텍스트 없음")
+            return _fake_pages(path)
+
+        assert self._count([tmp_path / "a.pdf", tmp_path / "empty.pdf"], _pages) == 3
+
+    def test_unexpected_error_is_logged(self, tmp_path, caplog):
+        """예상 밖의 오류는 삼키지 않고 경고 로그로 남김."""
+        def _pages(path, extractor=None):
+            raise RuntimeError("손상된 xref")
+
+        with caplog.at_level("WARNING", logger="utils.pdf_loader"):
+            assert self._count([tmp_path / "broken.pdf"], _pages) == 0
+        assert any("broken.pdf" in r.getMessage() and "손상된 xref" in r.getMessage() for r in caplog.records)
@@ -0,0 +1,69 @@
+"""utils/source_filter.py 단위 테스트."""
+
+from langchain_community.vectorstores import FAISS
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from utils.index_store import load_index, save_index
+from utils.source_filter import SourcePartitions, classify_source
+
+
+# ───────── fixtures ─────────
+
+def _make_vectorstore() -> FAISS:
+    """허가사항·논문·기타 자료 청크와 두 출처가 병합된 청크를 가진 벡터스토어."""
+    metadatas = [
+        {"source": "Polivy_Label_2024.pdf", "page": 1},
+        {"source": "polarix_nejm.pdf", "page": 2},
+        {"source": "brochure.pdf", "page": 1},
+        {
+            "source": "polarix_nejm.pdf",
+            "page": 3,
+            "provenance": [
+                {"source": "polarix_nejm.pdf", "page": 3},
+                {"source": "Polivy_Label_2024.pdf", "page": 9},
+            ],
+        },
+    ]
+    texts = ["허가 적응증", "무진행 생존기간", "제품 소개", "이상반응 빈도"]
+    return FAISS.from_texts(texts, DeterministicFakeEmbedding(size=8), metadatas=metadatas)
+
+
+# ───────── classify_source ─────────
+
+class TestClassifySource:
+    def test_default_patterns(self):
+        """파일명 패턴으로 분류하며 대소문자와 폴더 경로는 무시."""
+        assert classify_source("materials/Polivy_LABEL.pdf") == "label"
+        assert classify_source("C:\\data\\POLARIX_NEJM_2022.pdf") == "pivotal"
+        assert classify_source("NICE_TA874.pdf") == "hta"
+        assert classify_source("brochure.pdf") == "other"
+
+    def test_custom_patterns(self):
+        """products.json의 source_classes 패턴으로 덮어쓸 수 있음."""
+        patterns = {"label": ["polivy_pi_*.pdf"]}
+        assert classify_source("polivy_pi_kr.pdf", patterns) == "label"
+        assert classify_source("polivy_label.pdf", patterns) == "other"
+
+
+# ───────── SourcePartitions ─────────
+
+class TestSourcePartitions:
+    def test_positions_by_class(self):
+        """분류별 인덱스 위치를 모으고, 병합된 청크는 모든 출처 분류에 속함."""
+        partitions = SourcePartitions.from_vectorstore(_make_vectorstore())
+
+        assert partitions.classes == ["label", "other", "pivotal"]
+        assert partitions.positions(["label"]).tolist() == [0, 3]
+        assert partitions.positions(["label", "pivotal"]).tolist() == [0, 1, 3]
+        assert len(partitions.positions(["hta"])) == 0
+
+    def test_disk_docstore_gives_same_partitions(self, tmp_path):
+        """저장된 인덱스(디스크 docstore)에서도 같은 파티션."""
+        vs = _make_vectorstore()
+        save_index(vs, tmp_path, "fp1", {"a.pdf": "h1"})
+        loaded = load_index(tmp_path, "fp1", DeterministicFakeEmbedding(size=8))
+
+        partitions = SourcePartitions.from_vectorstore(loaded)
+
+        assert partitions.positions(["pivotal"]).tolist() == [1, 3]
+        assert partitions.ids(["pivotal"]) == {vs.index_to_docstore_id[1], vs.index_to_docstore_id[3]}
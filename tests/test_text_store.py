@@ -0,0 +1,39 @@
+"""utils/text_store.py 단위 테스트."""
+
+import pytest
+
+from utils.text_store import PageTextStore
+
+
+class TestPageTextStore:
+    def test_roundtrip(self, tmp_path):
+        """기록한 페이지를 순서대로 읽음."""
+        store = PageTextStore(tmp_path)
+        with store.writer("abcd", "ext-v1") as writer:
+            writer.add(1, "첫 페이지")
+            writer.add(3, "셋째 페이지")
+
+        assert list(store.iter_pages("abcd", "ext-v1")) == [(1, "첫 페이지"), (3, "셋째 페이지")]
+
+    def test_missing_returns_none(self, tmp_path):
+        """기록이 없으면 None."""
+        assert PageTextStore(tmp_path).iter_pages("abcd", "ext-v1") is None
+
+    def test_extractor_version_is_part_of_key(self, tmp_path):
+        """추출기 버전이 다르면 별도 항목."""
+        store = PageTextStore(tmp_path)
+        with store.writer("abcd", "ext-v1") as writer:
+            writer.add(1, "text")
+
+        assert store.iter_pages("abcd", "ext-v2") is None
+
+    def test_failed_write_is_not_stored(self, tmp_path):
+        """기록 도중 예외가 나면 저장되지 않고 임시 파일도 남지 않음."""
+        store = PageTextStore(tmp_path)
+        with pytest.raises(RuntimeError):
+            with store.writer("abcd", "ext-v1") as writer:
+                writer.add(1, "partial")
+                raise RuntimeError("추출 실패")
+
+        assert store.iter_pages("abcd", "ext-v1") is None
+        assert not any(p.is_file() for p in tmp_path.rglob("*"))
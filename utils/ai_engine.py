@@ -1,10 +1,15 @@
 """RAG 엔진: FAISS + Gemini 기반 의약품 DC 자료 질의응답."""
 
+import asyncio
+import hashlib
 import json
 import logging
 import re
-from dataclasses import dataclass, field
+from collections.abc import Callable, Iterator, Sequence
+from dataclasses import dataclass, field, replace
 
+import faiss
+import numpy as np
 from langchain_core.documents import Document
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.prompts import ChatPromptTemplate
@@ -12,12 +17,41 @@ from langchain_core.runnables import RunnablePassthrough
 from langchain_community.vectorstores import FAISS
 from langchain_google_genai import ChatGoogleGenerativeAI
 
-from config.settings import GEMINI_MODEL, RETRIEVER_K
+from config.placeholder_queries import (
+    PLACEHOLDER_ALIASES,
+    PLACEHOLDER_QUERIES,
+    PLACEHOLDER_SOURCES,
+    UNGATED_PLACEHOLDERS,
+)
+from config.settings import (
+    GEMINI_MODEL,
+    GROUP_MAX_CHUNKS,
+    GROUP_MAX_FIELDS,
+    GROUP_MIN_OVERLAP,
+    HYBRID_CANDIDATES,
+    LLM_MAX_CONCURRENCY,
+    RETRIEVAL_MODE,
+    RETRIEVER_K,
+    RETRIEVER_K_MAX,
+    RETRIEVER_K_MIN,
+    RETRIEVER_SCORE_MARGIN,
+)
 from config.standard_fields import FIELD_QUERIES, STANDARD_FIELDS
+from utils.answer_cache import AnswerCache, answer_key
 from utils.doc_processor import TaggableCell
+from utils.embedding_cache import CachedEmbeddings, normalize_text
+from utils.embedding_pipeline import embed_queries
+from utils.index_store import distances_to_similarity, filtered_search_params
+from utils.lexical_index import BM25Index, reciprocal_rank_fusion_scores
+from utils.source_filter import SourcePartitions
 
 logger = logging.getLogger(__name__)
 
+RETRIEVAL_MODES = ("vector", "bm25", "hybrid")
+
+# 근거가 없을 때의 답변 (프롬프트 규칙과 같은 문구)
+NO_INFO_ANSWER = "해당 정보 없음"
+
 _RAG_PROMPT_TEMPLATE = """당신은 의약품 약제위원회(DC) 자료 작성을 돕는 전문가입니다.
 제공된 의약품 Master Data에서 관련 정보를 찾아 한국어로 답변하세요.
 
@@ -37,10 +71,100 @@ _RAG_PROMPT_TEMPLATE = """당신은 의약품 약제위원회(DC) 자료 작성
 답변:"""
 
 
+_GROUPED_PROMPT_TEMPLATE = """당신은 의약품 약제위원회(DC) 자료 작성을 돕는 전문가입니다.
+제공된 의약품 Master Data에서 관련 정보를 찾아 아래 여러 질문에 각각 한국어로 답변하세요.
+
+규칙:
+- 반드시 제공된 문서 내용에 근거하여 작성할 것
+- 근거가 없는 질문은 "해당 정보 없음"이라고만 답변
+- 마크다운 형식(**, ##, *, - 등)을 사용하지 말 것. 순수 텍스트로만 작성
+- 불필요한 서론, 머리말, "답변:" 같은 접두어 없이 바로 내용만 작성
+- 병원 약제위원회 제출용으로 적합한 문어체 사용
+- 숫자, 퍼센트, 통계값은 원문 그대로 정확히 인용
+- 각 답변은 해당 질문에만 답하고 다른 질문의 내용을 섞지 말 것
+
+참고 문서:
+{context}
+
+질문 목록:
+{questions}
+
+반드시 아래 JSON 형식으로만 응답하세요. 질문 ID마다 답변 문자열 하나:
+{{"q1": "답변", "q2": "답변", ...}}"""
+
+# 답변 캐시 키의 프롬프트 버전 — 답변 생성 프롬프트가 바뀌면 이전 캐시 답변은 쓰이지 않음
+PROMPT_VERSION = hashlib.sha256(
+    f"{_RAG_PROMPT_TEMPLATE}\0{_GROUPED_PROMPT_TEMPLATE}".encode("utf-8")
+).hexdigest()[:16]
+
+
 def _format_docs(docs: list[Document]) -> str:
     """검색된 Document 목록을 프롬프트용 텍스트로 변환."""
     return "\n\n".join(doc.page_content for doc in docs)
 
+
+def _chunk_key(doc: Document) -> str:
+    """묶음 문맥에서 같은 청크를 식별하는 키."""
+    return doc.id or doc.page_content
+
+
+def _group_by_shared_chunks(
+    chunk_keys: list[list[str]],
+    min_overlap: float = GROUP_MIN_OVERLAP,
+    max_fields: int = GROUP_MAX_FIELDS,
+    max_chunks: int = GROUP_MAX_CHUNKS,
+) -> list[list[int]]:
+    """검색된 청크가 많이 겹치는 필드끼리 묶음 (입력 순서대로 탐욕적으로 배정).
+
+    필드 청크 중 min_overlap 비율 이상이 이미 묶음 문맥에 있는 묶음 중 가장 많이 겹치는 곳에 넣되,
+    묶음은 max_fields개 필드, 문맥은 max_chunks개 청크를 넘지 않습니다.
+
+    Args:
+        chunk_keys: 필드별 검색된 청크 키 목록.
+        min_overlap: 묶음에 넣을 최소 겹침 비율 (0 이하이면 묶지 않음).
+        max_fields: 묶음당 최대 필드 수.
+        max_chunks: 묶음 문맥의 최대 청크 수.
+
+    Returns:
+        필드 위치 묶음 목록 (묶이지 않은 필드는 1개짜리 묶음).
+    """
+    groups: list[tuple[list[int], set[str]]] = []
+    for i, keys in enumerate(chunk_keys):
+        key_set = set(keys)
+        best: tuple[float, int] | None = None
+        if min_overlap > 0 and key_set:
+            for g, (members, context) in enumerate(groups):
+                if len(members) >= max_fields or len(context | key_set) > max_chunks:
+                    continue
+                overlap = len(key_set & context) / len(key_set)
+                if overlap >= min_overlap and (best is None or overlap > best[0]):
+                    best = (overlap, g)
+        if best is None:
+            groups.append(([i], key_set))
+        else:
+            members, context = groups[best[1]]
+            members.append(i)
+            context |= key_set
+    return [members for members, _ in groups]
+
+
+def _adaptive_cut(
+    hits: list[tuple[Document, float]],
+    k_min: int = RETRIEVER_K_MIN,
+    k_max: int = RETRIEVER_K_MAX,
+    margin: float = RETRIEVER_SCORE_MARGIN,
+) -> list[tuple[Document, float]]:
+    """유사도 내림차순 후보에서 최상위와 유사도 차이가 margin 이내인 청크만 남김 (k_min~k_max개).
+
+    최상위 청크가 압도적이면 k_min개로 줄이고, 비슷한 청크가 많을 때만 k_max개까지 늘립니다.
+    """
+    if not hits:
+        return hits
+    best = hits[0][1]
+    close = sum(1 for _, score in hits if score >= best - margin)
+    return hits[:min(max(close, k_min), k_max)]
+
+
 _FIELD_ANALYSIS_PROMPT = """아래는 병원 약제위원회(DC) 신청 양식의 내용입니다.
 이 양식에서 작성해야 할 항목들을 파악하고, 아래 표준 필드 목록 중 가장 적합한 것에 매핑하세요.
 
@@ -69,6 +193,35 @@ class QueryResult:
     answer: str
     sources: list[str] = field(default_factory=list)
     raw_chunks: list[Document] = field(default_factory=list)
+    # raw_chunks와 같은 순서의 검색 점수 (vector: 코사인 유사도, bm25: BM25 점수, hybrid: RRF 점수)
+    scores: list[float] = field(default_factory=list)
+    # 벡터 검색 최상위 청크의 코사인 유사도 (bm25 모드는 None)
+    top_similarity: float | None = None
+    # 관련 청크가 없어 LLM을 호출하지 않고 NO_INFO_ANSWER로 답했는지 여부
+    llm_skipped: bool = False
+    # 답변 캐시에서 가져와 LLM을 호출하지 않았는지 여부
+    cached: bool = False
+    # query_batch()에서 이 필드의 질의가 실패했을 때의 오류 메시지
+    error: str | None = None
+
+
+@dataclass
+class Retrieval:
+    """필드 하나의 검색 결과 (RAGEngine.retrieve_batch())."""
+
+    chunks: list[Document]
+    scores: list[float]
+    top_similarity: float | None = None
+
+
+@dataclass
+class _SourceFilter:
+    """문서 분류로 제한한 검색 대상 (분류 조합별로 한 번 만들어 재사용)."""
+
+    positions: np.ndarray
+    ids: set[str]
+    search_params: faiss.SearchParameters
+    lexical_mask: np.ndarray | None = None
 
 
 @dataclass
@@ -131,19 +284,54 @@ _TAG_GENERATION_PROMPT = """병원 약제위원회(DC) 신청 양식의 각 셀
 class RAGEngine:
     """FAISS 벡터스토어와 Gemini LLM을 결합한 RAG 질의응답 엔진."""
 
-    def __init__(self, vectorstore: FAISS | None, api_key: str) -> None:
+    def __init__(
+        self,
+        vectorstore: FAISS | None,
+        api_key: str,
+        lexical_index: BM25Index | None = None,
+        retrieval_mode: str = RETRIEVAL_MODE,
+        source_patterns: dict[str, list[str]] | None = None,
+        min_similarity: float | None = None,
+        corpus_fingerprint: str | None = None,
+        answer_cache: AnswerCache | None = None,
+    ) -> None:
         """RAGEngine 초기화.
 
         Args:
             vectorstore: 인덱싱된 FAISS 벡터스토어. None이면 LLM 전용 모드.
             api_key: Google API 키.
+            lexical_index: 벡터스토어와 같은 청크로 만든 BM25 인덱스 (index_store.load_lexical_index()).
+                bm25/hybrid 모드에서 없거나 청크 구성이 다르면 벡터스토어 docstore로 새로 구축.
+            retrieval_mode: "vector" | "bm25" (질의 임베딩 없음) | "hybrid" (RRF 결합).
+            source_patterns: 문서 분류 → 파일명 glob 패턴 (products.json의 source_classes).
+                None이면 config.source_classes.SOURCE_CLASS_PATTERNS.
+            min_similarity: 최상위 청크의 코사인 유사도가 이 값 미만이면 LLM을 호출하지 않고
+                NO_INFO_ANSWER로 답함 (EmbeddingProvider.min_similarity). None이면 검색 결과가 있으면 항상 호출.
+            corpus_fingerprint: 벡터스토어를 만든 코퍼스의 fingerprint (인덱스 manifest).
+            answer_cache: 생성한 답변을 저장·재사용할 AnswerCache. corpus_fingerprint도 있어야 사용.
+
+        Raises:
+            ValueError: 알 수 없는 retrieval_mode인 경우.
         """
+        if retrieval_mode not in RETRIEVAL_MODES:
+            raise ValueError(
+                f"알 수 없는 검색 방식: {retrieval_mode} (사용 가능: {', '.join(RETRIEVAL_MODES)})"
+            )
+        self._retrieval_mode = retrieval_mode
+        self._source_patterns = source_patterns
+        self._min_similarity = min_similarity
+        self._corpus_fingerprint = corpus_fingerprint
+        self._answer_cache = answer_cache if corpus_fingerprint else None
+        # 첫 분류 제한 질의에서 구성
+        self._partitions: SourcePartitions | None = None
+        self._source_filters: dict[frozenset[str], _SourceFilter | None] = {}
         self._llm = ChatGoogleGenerativeAI(
             model=GEMINI_MODEL,
             google_api_key=api_key,
             temperature=0.1,
         )
 
+        self._lexical: BM25Index | None = None
         if vectorstore is not None:
             self._retriever = vectorstore.as_retriever(
                 search_kwargs={"k": RETRIEVER_K}
@@ -155,49 +343,190 @@ class RAGEngine:
                 | self._llm
                 | StrOutputParser()
             )
+            self._group_chain = (
+                ChatPromptTemplate.from_template(_GROUPED_PROMPT_TEMPLATE)
+                | self._llm
+                | StrOutputParser()
+            )
+            if retrieval_mode != "bm25":
+                self._preload_query_embeddings(vectorstore)
+            if retrieval_mode != "vector":
+                if lexical_index is None or not lexical_index.matches(vectorstore):
+                    lexical_index = BM25Index.from_vectorstore(vectorstore)
+                self._lexical = lexical_index
         else:
             self._retriever = None
             self._vectorstore = None
             self._chain = None
+            self._group_chain = None
+
+    @staticmethod
+    def _preload_query_embeddings(vectorstore: FAISS) -> None:
+        """고정 질의(PLACEHOLDER_QUERIES·FIELD_QUERIES)의 저장된 질의 벡터를 미리 로드."""
+        embedding = vectorstore.embeddings
+        if not isinstance(embedding, CachedEmbeddings):
+            return
+        queries = [*PLACEHOLDER_QUERIES.values(), *FIELD_QUERIES.values()]
+        loaded = embedding.preload_queries(queries)
+        logger.info("질의 임베딩 캐시: 고정 질의 %d개 중 %d개 로드", len(set(queries)), loaded)
 
     def query(
         self,
         field_id: str,
         custom_query: str | None = None,
+        source_classes: Sequence[str] | None = None,
+        retrieved: Retrieval | None = None,
+        use_cache: bool = True,
     ) -> QueryResult:
         """표준 필드 ID 또는 커스텀 질의로 RAG 답변을 생성.
 
+        관련 청크가 없거나 최상위 유사도가 min_similarity 미만이면 LLM을 호출하지 않습니다
+        (문서 근거가 필요 없는 UNGATED_PLACEHOLDERS는 제외).
+        같은 코퍼스·질의·검색 청크·모델·프롬프트로 생성한 답변이 답변 캐시에 있으면 그 답변을 사용합니다.
+
         Args:
-            field_id: STANDARD_FIELDS의 필드 ID.
+            field_id: STANDARD_FIELDS의 필드 ID 또는 PLACEHOLDER_QUERIES 키.
             custom_query: 커스텀 질의 텍스트. None이면 FIELD_QUERIES 기본값 사용.
+            source_classes: 검색할 문서 분류 (예: ("label",)). None이면 PLACEHOLDER_SOURCES의
+                field_id 설정, 빈 값이면 전체 문서. 해당 분류의 청크가 없으면 전체 문서를 검색.
+            retrieved: retrieve_batch()로 미리 검색한 결과. 있으면 검색을 생략.
+            use_cache: False이면 캐시된 답변을 쓰지 않고 새로 생성 (생성한 답변은 캐시에 다시 저장).
 
         Returns:
-            QueryResult (답변 텍스트, 출처 목록, 원본 청크 포함).
+            QueryResult (답변 텍스트, 출처 목록, 원본 청크와 검색 점수 포함).
         """
-        query_text = custom_query or FIELD_QUERIES.get(
-            field_id,
-            f"Please provide information about {field_id}.",
-        )
-
-        logger.info("RAG 질의 시작: field_id=%s", field_id)
-
-        if self._chain is None or self._retriever is None:
-            raise RuntimeError("vectorstore가 초기화되지 않았습니다. PDF 인덱싱을 먼저 수행하세요.")
+        query_text, source_classes = self._prepare_query(field_id, custom_query, source_classes)
 
         # 관련 청크 검색
-        source_docs: list[Document] = self._retriever.invoke(query_text)
-        context = _format_docs(source_docs)
+        if retrieved is None:
+            retrieved = self._retrieve(query_text, source_classes=source_classes)
+        result = self._result_without_llm(field_id, query_text, retrieved, use_cache)
+        if result is not None:
+            return result
 
         # 답변 생성
         answer: str = self._chain.invoke({
-            "context": context,
+            "context": _format_docs(retrieved.chunks),
             "question": query_text,
         })
+        self._store_answer(query_text, retrieved, answer)
+        return self._build_result(field_id, answer, retrieved)
+
+    async def aquery(
+        self,
+        field_id: str,
+        custom_query: str | None = None,
+        source_classes: Sequence[str] | None = None,
+        retrieved: Retrieval | None = None,
+        use_cache: bool = True,
+        on_token: Callable[[str], None] | None = None,
+    ) -> QueryResult:
+        """query()의 비동기 버전 — 검색은 스레드에서, 답변 생성은 LLM 비동기 호출로 수행.
 
+        on_token이 있으면 LLM 응답을 스트리밍으로 받아 도착하는 답변 조각마다 호출합니다.
+        LLM을 호출하지 않은 답변(정보 없음·캐시 답변)은 전체 답변으로 한 번 호출합니다.
+        """
+        query_text, source_classes = self._prepare_query(field_id, custom_query, source_classes)
+
+        if retrieved is None:
+            retrieved = await asyncio.to_thread(self._retrieve, query_text, None, source_classes)
+        result = self._result_without_llm(field_id, query_text, retrieved, use_cache)
+        if result is not None:
+            if on_token is not None:
+                on_token(result.answer)
+            return result
+
+        inputs = {"context": _format_docs(retrieved.chunks), "question": query_text}
+        if on_token is None:
+            answer: str = await self._chain.ainvoke(inputs)
+        else:
+            parts: list[str] = []
+            async for token in self._chain.astream(inputs):
+                parts.append(token)
+                on_token(token)
+            answer = "".join(parts)
+        self._store_answer(query_text, retrieved, answer)
+        return self._build_result(field_id, answer, retrieved)
+
+    def query_stream(
+        self,
+        field_id: str,
+        custom_query: str | None = None,
+        source_classes: Sequence[str] | None = None,
+        use_cache: bool = True,
+        on_complete: Callable[[QueryResult], None] | None = None,
+    ) -> Iterator[str]:
+        """query()의 스트리밍 버전 — 답변 조각을 LLM에서 도착하는 대로 반환 (st.write_stream용).
+
+        LLM을 호출하지 않은 답변(정보 없음·캐시 답변)은 전체 답변 한 조각으로 반환합니다.
+        인자는 query()와 같습니다.
+
+        Args:
+            on_complete: 답변이 끝나면 출처를 포함한 QueryResult로 호출되는 콜백.
+
+        Yields:
+            답변 텍스트 조각 (이어 붙이면 QueryResult.answer).
+        """
+        query_text, source_classes = self._prepare_query(field_id, custom_query, source_classes)
+        retrieved = self._retrieve(query_text, source_classes=source_classes)
+
+        result = self._result_without_llm(field_id, query_text, retrieved, use_cache)
+        if result is None:
+            parts: list[str] = []
+            for token in self._chain.stream({"context": _format_docs(retrieved.chunks), "question": query_text}):
+                parts.append(token)
+                yield token
+            answer = "".join(parts)
+            self._store_answer(query_text, retrieved, answer)
+            result = self._build_result(field_id, answer, retrieved)
+        else:
+            yield result.answer
+        if on_complete is not None:
+            on_complete(result)
+
+    def _result_without_llm(
+        self,
+        field_id: str,
+        query_text: str,
+        retrieved: Retrieval,
+        use_cache: bool,
+    ) -> QueryResult | None:
+        """LLM 없이 답할 수 있으면 그 결과 (관련 청크 없음 → 정보 없음, 캐시 적중 → 캐시 답변)."""
+        if self._is_hopeless(field_id, retrieved):
+            return self._no_info_result(field_id, retrieved)
+        if use_cache:
+            return self._cached_result(field_id, query_text, retrieved)
+        return None
+
+    def _prepare_query(
+        self,
+        field_id: str,
+        custom_query: str | None,
+        source_classes: Sequence[str] | None,
+    ) -> tuple[str, Sequence[str]]:
+        """질의 텍스트와 검색할 문서 분류를 결정.
+
+        Raises:
+            RuntimeError: vectorstore가 없는 LLM 전용 모드인 경우.
+        """
+        logger.info("RAG 질의 시작: field_id=%s", field_id)
+
+        if self._chain is None or self._retriever is None:
+            raise RuntimeError("vectorstore가 초기화되지 않았습니다. PDF 인덱싱을 먼저 수행하세요.")
+
+        if source_classes is None:
+            source_classes = PLACEHOLDER_SOURCES.get(field_id, ())
+        return self._query_text(field_id, custom_query), source_classes
+
+    @staticmethod
+    def _build_result(field_id: str, answer: str, retrieved: Retrieval) -> QueryResult:
+        """LLM 답변과 검색 결과로 QueryResult 구성."""
+        # 중복 병합된 청크는 provenance에 모든 출처가 있음
         sources = list(
             {
-                f"{doc.metadata.get('source', 'unknown')} p.{doc.metadata.get('page', '?')}"
-                for doc in source_docs
+                f"{origin.get('source', 'unknown')} p.{origin.get('page', '?')}"
+                for doc in retrieved.chunks
+                for origin in doc.metadata.get("provenance") or [doc.metadata]
             }
         )
 
@@ -205,22 +534,459 @@ class RAGEngine:
             field_id=field_id,
             answer=answer,
             sources=sorted(sources),
-            raw_chunks=source_docs,
+            raw_chunks=retrieved.chunks,
+            scores=retrieved.scores,
+            top_similarity=retrieved.top_similarity,
         )
 
+    @staticmethod
+    def _no_info_result(field_id: str, retrieved: Retrieval) -> QueryResult:
+        """관련 청크가 없을 때 LLM 호출 없이 만드는 QueryResult."""
+        logger.info(
+            "관련 청크 없음 (최고 유사도 %s), LLM 호출 생략: field_id=%s", retrieved.top_similarity, field_id
+        )
+        return QueryResult(
+            field_id=field_id,
+            answer=NO_INFO_ANSWER,
+            raw_chunks=retrieved.chunks,
+            scores=retrieved.scores,
+            top_similarity=retrieved.top_similarity,
+            llm_skipped=True,
+        )
+
+    def _answer_key(self, query_text: str, retrieved: Retrieval) -> str | None:
+        """답변 캐시 키. 답변 캐시를 쓰지 않으면 None."""
+        if self._answer_cache is None:
+            return None
+        return answer_key(
+            self._corpus_fingerprint,
+            query_text,
+            [_chunk_key(doc) for doc in retrieved.chunks],
+            GEMINI_MODEL,
+            PROMPT_VERSION,
+        )
+
+    def _cached_result(self, field_id: str, query_text: str, retrieved: Retrieval) -> QueryResult | None:
+        """답변 캐시에 있는 답변으로 만든 QueryResult. 없으면 None."""
+        key = self._answer_key(query_text, retrieved)
+        answer = self._answer_cache.get(key) if key else None
+        if answer is None:
+            return None
+        logger.info("답변 캐시 적중, LLM 호출 생략: field_id=%s", field_id)
+        result = self._build_result(field_id, answer, retrieved)
+        result.cached = True
+        return result
+
+    def _store_answer(self, query_text: str, retrieved: Retrieval, answer: str) -> None:
+        """생성한 답변을 답변 캐시에 저장 (캐시를 쓰지 않으면 무시)."""
+        key = self._answer_key(query_text, retrieved)
+        if key:
+            self._answer_cache.put(key, answer)
+
+    def _is_hopeless(self, field_id: str, retrieved: Retrieval) -> bool:
+        """LLM을 호출해도 근거가 없을 검색 결과인지 (청크 없음 또는 유사도 게이트 미달).
+
+        UNGATED_PLACEHOLDERS(예: 오늘 날짜)는 문서 근거가 필요 없으므로 항상 False입니다.
+        """
+        if field_id in UNGATED_PLACEHOLDERS:
+            return False
+        if not retrieved.chunks:
+            return True
+        return (
+            self._min_similarity is not None
+            and retrieved.top_similarity is not None
+            and retrieved.top_similarity < self._min_similarity
+        )
+
+    @staticmethod
+    def _query_text(field_id: str, custom_query: str | None = None) -> str:
+        """질의 텍스트 (커스텀 질의 → FIELD_QUERIES → 기본 문구)."""
+        return custom_query or FIELD_QUERIES.get(
+            field_id,
+            f"Please provide information about {field_id}.",
+        )
+
+    @staticmethod
+    def canonicalize_queries(
+        field_ids: Sequence[str],
+        custom_queries: Sequence[str | None] | None = None,
+    ) -> tuple[list[str], list[str | None], list[int]]:
+        """필드 목록을 서로 다른 질의만 남긴 대표 필드 목록으로 축약.
+
+        별칭 placeholder(PLACEHOLDER_ALIASES)는 대표 placeholder로 바꾸되, 커스텀 질의가 별칭의 기본 문구와
+        다르면(사용자가 고친 질의) 그대로 둡니다. 정규화한 질의 텍스트와 검색 문서 분류가 같은 필드는 하나로 합칩니다.
+
+        Args:
+            field_ids: 필드 ID 또는 PLACEHOLDER_QUERIES 키 목록.
+            custom_queries: field_ids와 같은 순서의 커스텀 질의 (None 항목은 기본 질의).
+
+        Returns:
+            (대표 필드 ID 목록, 대표 커스텀 질의 목록, 입력 필드별 대표 목록 내 위치).
+        """
+        custom_queries = list(custom_queries or [None] * len(field_ids))
+        canonical_ids: list[str] = []
+        canonical_queries: list[str | None] = []
+        slots: list[int] = []
+        seen: dict[tuple[str, frozenset[str]], int] = {}
+        for field_id, custom_query in zip(field_ids, custom_queries):
+            canonical = PLACEHOLDER_ALIASES.get(field_id)
+            if canonical is not None and custom_query in (None, PLACEHOLDER_QUERIES.get(field_id)):
+                field_id, custom_query = canonical, PLACEHOLDER_QUERIES.get(canonical)
+            key = (
+                normalize_text(RAGEngine._query_text(field_id, custom_query)),
+                frozenset(PLACEHOLDER_SOURCES.get(field_id, ())),
+            )
+            if key not in seen:
+                seen[key] = len(canonical_ids)
+                canonical_ids.append(field_id)
+                canonical_queries.append(custom_query)
+            slots.append(seen[key])
+        return canonical_ids, canonical_queries, slots
+
+    def retrieve_batch(
+        self,
+        field_ids: Sequence[str],
+        custom_queries: Sequence[str | None] | None = None,
+        k: int | None = None,
+    ) -> list[Retrieval]:
+        """여러 필드의 관련 청크를 한 번에 검색.
+
+        캐시에 없는 질의 벡터를 한 번의 요청으로 임베딩한 뒤, 같은 문서 분류 제한을 쓰는 질의끼리
+        질의 행렬 하나로 FAISS 검색합니다. 필드마다 query()를 호출하는 것과 같은 청크를 반환합니다.
+
+        Args:
+            field_ids: 필드 ID 또는 PLACEHOLDER_QUERIES 키 목록 (문서 분류 제한은 PLACEHOLDER_SOURCES).
+            custom_queries: field_ids와 같은 순서의 커스텀 질의 (None 항목은 기본 질의).
+            k: 필드당 검색할 청크 수. None이면 vector 모드는 적응형 k, 그 외는 RETRIEVER_K.
+
+        Returns:
+            입력 순서의 필드별 검색 결과 (query(retrieved=)에 전달).
+
+        Raises:
+            RuntimeError: vectorstore가 없는 LLM 전용 모드인 경우.
+        """
+        if self._vectorstore is None:
+            raise RuntimeError("vectorstore가 초기화되지 않았습니다. PDF 인덱싱을 먼저 수행하세요.")
+
+        custom_queries = custom_queries or [None] * len(field_ids)
+        query_texts = [self._query_text(f, q) for f, q in zip(field_ids, custom_queries)]
+        source_filters = [self._source_filter(PLACEHOLDER_SOURCES.get(f, ())) for f in field_ids]
+
+        if self._retrieval_mode == "bm25":
+            return [self._lexical_retrieval(t, k, sf) for t, sf in zip(query_texts, source_filters)]
+
+        candidates = (k or RETRIEVER_K_MAX) if self._retrieval_mode == "vector" else HYBRID_CANDIDATES
+        vectors = self._embed_queries(query_texts)
+        # 같은 검색 대상(사전 필터)을 쓰는 질의끼리 묶어 한 번에 검색
+        groups: dict[int, list[int]] = {}
+        for i, source_filter in enumerate(source_filters):
+            groups.setdefault(id(source_filter), []).append(i)
+        vector_hits: list[list[tuple[Document, float]]] = [[] for _ in field_ids]
+        for members in groups.values():
+            found = self._search_vectors(vectors[members], candidates, source_filters[members[0]])
+            for i, hits in zip(members, found):
+                vector_hits[i] = hits
+
+        if self._retrieval_mode == "vector":
+            return [self._vector_retrieval(hits, k) for hits in vector_hits]
+        return [
+            self._fuse(text, hits, k or RETRIEVER_K, source_filter)
+            for text, hits, source_filter in zip(query_texts, vector_hits, source_filters)
+        ]
+
+    def _retrieve(
+        self,
+        query_text: str,
+        k: int | None = None,
+        source_classes: Sequence[str] = (),
+    ) -> Retrieval:
+        """검색 방식에 따라 관련 청크를 검색 (source_classes가 있으면 해당 문서 분류 안에서만).
+
+        k가 None이면 vector 모드는 적응형 k(_adaptive_cut), 그 외는 RETRIEVER_K개.
+        """
+        source_filter = self._source_filter(source_classes)
+        if self._retrieval_mode == "bm25":
+            return self._lexical_retrieval(query_text, k, source_filter)
+        if self._retrieval_mode == "vector":
+            hits = self._vector_search(query_text, k or RETRIEVER_K_MAX, source_filter)
+            return self._vector_retrieval(hits, k)
+
+        hits = self._vector_search(query_text, HYBRID_CANDIDATES, source_filter)
+        return self._fuse(query_text, hits, k or RETRIEVER_K, source_filter)
+
+    def _vector_retrieval(self, hits: list[tuple[Document, float]], k: int | None) -> Retrieval:
+        """벡터 검색 결과 (k가 None이면 적응형 k 적용)."""
+        top_similarity = hits[0][1] if hits else None
+        if k is None:
+            hits = _adaptive_cut(hits)
+        return Retrieval([doc for doc, _ in hits], [score for _, score in hits], top_similarity)
+
+    def _lexical_retrieval(self, query_text: str, k: int | None, source_filter: _SourceFilter | None) -> Retrieval:
+        """BM25 점수 상위 k개 청크."""
+        docstore = self._vectorstore.docstore
+        hits = self._lexical.search(query_text, k or RETRIEVER_K, self._lexical_mask(source_filter))
+        return Retrieval([docstore.search(doc_id) for doc_id, _ in hits], [score for _, score in hits])
+
+    def _fuse(
+        self,
+        query_text: str,
+        vector_hits: list[tuple[Document, float]],
+        k: int,
+        source_filter: _SourceFilter | None,
+    ) -> Retrieval:
+        """벡터 검색 후보와 BM25 후보를 RRF로 결합한 상위 k개 청크 (hybrid)."""
+        lexical_ids = [
+            doc_id
+            for doc_id, _ in self._lexical.search(query_text, HYBRID_CANDIDATES, self._lexical_mask(source_filter))
+        ]
+        by_id = {doc.id: doc for doc, _ in vector_hits}
+        fused = reciprocal_rank_fusion_scores([list(by_id), lexical_ids])[:k]
+        docstore = self._vectorstore.docstore
+        return Retrieval(
+            [by_id.get(doc_id) or docstore.search(doc_id) for doc_id, _ in fused],
+            [score for _, score in fused],
+            vector_hits[0][1] if vector_hits else None,
+        )
+
+    def _lexical_mask(self, source_filter: _SourceFilter | None) -> np.ndarray | None:
+        """BM25 검색 대상 mask (분류 제한이 없으면 None)."""
+        if source_filter is None:
+            return None
+        if source_filter.lexical_mask is None:
+            source_filter.lexical_mask = self._lexical.mask(source_filter.ids)
+        return source_filter.lexical_mask
+
+    def _vector_search(
+        self,
+        query_text: str,
+        k: int,
+        source_filter: _SourceFilter | None,
+    ) -> list[tuple[Document, float]]:
+        """임베딩 유사도 상위 k개 (청크, 코사인 유사도). source_filter가 있으면 해당 위치의 벡터만 검색."""
+        return self._search_vectors(self._embed_queries([query_text]), k, source_filter)[0]
+
+    def _embed_queries(self, query_texts: list[str]) -> np.ndarray:
+        """질의 행렬 (n, dim) float32. 벡터스토어가 L2 정규화를 쓰면 같은 방식으로 정규화."""
+        vectors = np.asarray(embed_queries(self._vectorstore.embeddings, query_texts), dtype=np.float32)
+        if self._vectorstore._normalize_L2:
+            faiss.normalize_L2(vectors)
+        return vectors
+
+    def _search_vectors(
+        self,
+        vectors: np.ndarray,
+        k: int,
+        source_filter: _SourceFilter | None,
+    ) -> list[list[tuple[Document, float]]]:
+        """질의 행렬을 한 번에 검색하여 질의별 상위 k개 (청크, 코사인 유사도)."""
+        vectorstore = self._vectorstore
+        params = None
+        if source_filter is not None:
+            k = min(k, len(source_filter.positions))
+            params = source_filter.search_params
+        distances, indices = vectorstore.index.search(np.ascontiguousarray(vectors), k, params=params)
+        similarities = distances_to_similarity(vectorstore.index, distances)
+        return [
+            [
+                (vectorstore.docstore.search(vectorstore.index_to_docstore_id[int(i)]), float(score))
+                for i, score in zip(row, row_scores)
+                if i != -1
+            ]
+            for row, row_scores in zip(indices, similarities)
+        ]
+
+    def _source_filter(self, source_classes: Sequence[str]) -> _SourceFilter | None:
+        """문서 분류 조합의 검색 대상. 분류가 없거나 해당 청크가 없으면 None (전체 검색)."""
+        key = frozenset(source_classes)
+        if not key:
+            return None
+        if key not in self._source_filters:
+            if self._partitions is None:
+                self._partitions = SourcePartitions.from_vectorstore(self._vectorstore, self._source_patterns)
+            positions = self._partitions.positions(key)
+            if len(positions) == 0:
+                logger.info("문서 분류 %s에 해당하는 청크가 없어 전체 문서를 검색합니다", sorted(key))
+                self._source_filters[key] = None
+            else:
+                self._source_filters[key] = _SourceFilter(
+                    positions=positions,
+                    ids=self._partitions.ids(key),
+                    search_params=filtered_search_params(self._vectorstore.index, positions),
+                )
+        return self._source_filters[key]
+
     def query_batch(
         self,
-        field_ids: list[str],
+        field_ids: Sequence[str],
+        custom_queries: Sequence[str | None] | None = None,
+        max_concurrency: int = LLM_MAX_CONCURRENCY,
+        on_result: Callable[[int, QueryResult], None] | None = None,
+        group_min_overlap: float = GROUP_MIN_OVERLAP,
+        use_cache: bool = True,
+        on_token: Callable[[int, str], None] | None = None,
     ) -> list[QueryResult]:
-        """여러 필드에 대해 순차적으로 RAG 질의를 수행.
+        """aquery_batch()를 실행하는 동기 버전 (이벤트 루프가 실행 중인 스레드에서는 호출 불가).
+
+        콜백은 호출한 스레드에서 실행되므로 Streamlit 요소를 직접 갱신할 수 있습니다.
+        """
+        return asyncio.run(
+            self.aquery_batch(
+                field_ids, custom_queries, max_concurrency, on_result, group_min_overlap, use_cache, on_token
+            )
+        )
+
+    async def aquery_batch(
+        self,
+        field_ids: Sequence[str],
+        custom_queries: Sequence[str | None] | None = None,
+        max_concurrency: int = LLM_MAX_CONCURRENCY,
+        on_result: Callable[[int, QueryResult], None] | None = None,
+        group_min_overlap: float = GROUP_MIN_OVERLAP,
+        use_cache: bool = True,
+        on_token: Callable[[int, str], None] | None = None,
+    ) -> list[QueryResult]:
+        """여러 필드의 RAG 질의를 동시에 수행.
+
+        같은 질의를 묻는 필드(canonicalize_queries())는 한 번만 생성하여 모든 필드에 같은 답변을 채웁니다.
+        검색은 retrieve_batch()로 한 번에 하고, 답변 캐시에 있는 필드는 LLM 없이 바로 완료합니다.
+        나머지 중 검색된 청크가 많이 겹치는 필드들은 공통 문맥 하나로
+        한 번에 답변을 생성합니다(JSON 응답). 묶음 답변에서 빠지거나 파싱되지 않은 필드는 개별로 다시
+        생성합니다. LLM 요청은 최대 max_concurrency개씩 동시에 보내며, 필드별 실패는 예외 대신
+        answer가 "[생성 실패: ...]"인 QueryResult로 반환합니다.
 
         Args:
-            field_ids: 질의할 필드 ID 목록.
+            field_ids: 질의할 필드 ID 또는 PLACEHOLDER_QUERIES 키 목록.
+            custom_queries: field_ids와 같은 순서의 커스텀 질의 (None 항목은 기본 질의).
+            max_concurrency: 동시에 진행할 최대 LLM 요청 수.
+            on_result: 필드가 끝날 때마다 (입력 위치, 결과)로 호출되는 콜백 (진행률 표시용).
+            group_min_overlap: 묶음 생성 기준 겹침 비율 (0이면 모든 필드를 개별 생성).
+            use_cache: False이면 캐시된 답변을 쓰지 않고 모두 새로 생성.
+            on_token: 개별 생성하는 필드의 답변 조각이 도착할 때마다 (입력 위치, 조각)으로 호출되는 콜백
+                (스트리밍 표시용). 묶음 생성·캐시 답변은 on_result로만 전달됩니다.
 
         Returns:
             QueryResult 목록 (입력 순서 유지).
         """
-        return [self.query(field_id) for field_id in field_ids]
+        requested_ids = list(field_ids)
+        field_ids, custom_queries, slots = self.canonicalize_queries(requested_ids, custom_queries)
+        if len(field_ids) < len(requested_ids):
+            logger.info("중복 질의 통합: %d개 필드 → %d개 질의", len(requested_ids), len(field_ids))
+        # 대표 필드 위치 → 같은 답변을 받을 입력 위치
+        fan_out: dict[int, list[int]] = {}
+        for i, slot in enumerate(slots):
+            fan_out.setdefault(slot, []).append(i)
+
+        try:
+            retrieved: list[Retrieval | None] = await asyncio.to_thread(
+                self.retrieve_batch, field_ids, custom_queries
+            )
+        except Exception as e:
+            logger.warning("일괄 검색 실패, 필드별로 검색합니다: %s", e)
+            retrieved = [None] * len(field_ids)
+
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        results: list[QueryResult | None] = [None] * len(requested_ids)
+        done = [False] * len(field_ids)
+
+        def _finish(slot: int, result: QueryResult) -> None:
+            done[slot] = True
+            for i in fan_out[slot]:
+                results[i] = replace(result, field_id=requested_ids[i])
+                if on_result is not None:
+                    on_result(i, results[i])
+
+        def _emit(slot: int, token: str) -> None:
+            for i in fan_out[slot]:
+                on_token(i, token)
+
+        async def _run(i: int) -> None:
+            async with semaphore:
+                try:
+                    # 일괄 검색된 필드는 아래에서 이미 캐시를 확인함
+                    result = await self.aquery(
+                        field_ids[i],
+                        custom_queries[i],
+                        retrieved=retrieved[i],
+                        use_cache=use_cache and retrieved[i] is None,
+                        on_token=None if on_token is None else (lambda token, slot=i: _emit(slot, token)),
+                    )
+                except Exception as e:
+                    logger.error("질의 실패: %s — %s", field_ids[i], e)
+                    result = QueryResult(field_id=field_ids[i], answer=f"[생성 실패: {e}]", error=str(e))
+            _finish(i, result)
+
+        async def _run_group(members: list[int]) -> None:
+            async with semaphore:
+                try:
+                    answers = await self._agenerate_group(
+                        [self._query_text(field_ids[i], custom_queries[i]) for i in members],
+                        [retrieved[i] for i in members],
+                    )
+                except Exception as e:
+                    logger.warning("묶음 생성 실패, 필드별로 생성합니다: %s — %s", [field_ids[i] for i in members], e)
+                    answers = {}
+            retry = []
+            for n, i in enumerate(members):
+                if n in answers:
+                    self._store_answer(self._query_text(field_ids[i], custom_queries[i]), retrieved[i], answers[n])
+                    _finish(i, self._build_result(field_ids[i], answers[n], retrieved[i]))
+                else:
+                    retry.append(_run(i))
+            await asyncio.gather(*retry)
+
+        pending = [i for i, r in enumerate(retrieved) if r is not None and not self._is_hopeless(field_ids[i], r)]
+        if use_cache:
+            uncached = []
+            for i in pending:
+                query_text = self._query_text(field_ids[i], custom_queries[i])
+                cached = self._cached_result(field_ids[i], query_text, retrieved[i])
+                if cached is None:
+                    uncached.append(i)
+                else:
+                    _finish(i, cached)
+            if len(uncached) < len(pending):
+                logger.info("답변 캐시: %d개 필드 중 %d개 적중", len(pending), len(pending) - len(uncached))
+            pending = uncached
+
+        # 관련 청크가 없는 필드는 LLM 호출 없이 개별 처리되므로 묶지 않음
+        groupable = pending if group_min_overlap > 0 else []
+        groups = [
+            [groupable[n] for n in members]
+            for members in _group_by_shared_chunks(
+                [[_chunk_key(doc) for doc in retrieved[i].chunks] for i in groupable], group_min_overlap
+            )
+        ]
+        grouped = {i for members in groups if len(members) > 1 for i in members}
+        tasks = [_run_group(members) for members in groups if len(members) > 1]
+        tasks += [_run(i) for i in range(len(field_ids)) if i not in grouped and not done[i]]
+        if grouped:
+            logger.info("묶음 생성: %d개 필드를 %d회 호출로 생성", len(grouped), sum(len(m) > 1 for m in groups))
+        await asyncio.gather(*tasks)
+        return results
+
+    async def _agenerate_group(self, query_texts: list[str], retrievals: list[Retrieval]) -> dict[int, str]:
+        """여러 질문을 공통 문맥 하나로 한 번에 답변.
+
+        Returns:
+            {묶음 내 위치: 답변}. JSON에서 찾지 못했거나 빈 답변인 질문은 빠짐.
+        """
+        context: dict[str, Document] = {}
+        for retrieval in retrievals:
+            for doc in retrieval.chunks:
+                context.setdefault(_chunk_key(doc), doc)
+        questions = "\n".join(f"q{n + 1}: {text}" for n, text in enumerate(query_texts))
+
+        raw_text: str = await self._group_chain.ainvoke({
+            "context": _format_docs(list(context.values())),
+            "questions": questions,
+        })
+        parsed = self._parse_json_response(raw_text)
+        answers: dict[int, str] = {}
+        for n in range(len(query_texts)):
+            answer = parsed.get(f"q{n + 1}")
+            if isinstance(answer, str) and answer.strip():
+                answers[n] = answer.strip()
+        return answers
 
     def analyze_template_fields(self, template_text: str) -> list[FieldMapping]:
         """auto 모드: 병원 양식 텍스트에서 작성 항목을 자동 인식하여 표준 필드에 매핑.
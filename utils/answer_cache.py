@@ -0,0 +1,126 @@
+"""생성된 RAG 답변의 디스크 캐시.
+
+(코퍼스 fingerprint, 정규화된 질의, 검색된 청크, LLM 모델, 프롬프트 버전) → 답변을 SQLite에 저장하여
+같은 제품 자료로 여러 병원 문서를 만들 때 같은 항목을 LLM으로 다시 생성하지 않게 합니다.
+키 구성 요소가 하나라도 바뀌면(자료 재인덱싱, 질의 문구·검색 결과·모델·프롬프트 변경) 다른 키가 되므로
+옛 답변은 자동으로 쓰이지 않고, 오래 조회되지 않은 항목부터 용량 제한에 따라 축출됩니다.
+"""
+
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+
+from config.settings import ANSWER_CACHE_MAX_MB, ANSWER_CACHE_PATH
+from utils.embedding_cache import normalize_text
+
+logger = logging.getLogger(__name__)
+
+# 용량 초과 시 최대 용량의 이 비율까지 줄여서 매 저장마다 축출이 반복되지 않게 함
+_EVICT_TARGET_RATIO = 0.9
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS answers (
+    key TEXT PRIMARY KEY,
+    answer TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_answers_last_access ON answers(last_access);
+"""
+
+
+def answer_key(
+    fingerprint: str,
+    query_text: str,
+    chunk_ids: list[str],
+    model: str,
+    prompt_version: str,
+) -> str:
+    """답변 캐시 키 (SHA-256).
+
+    Args:
+        fingerprint: 코퍼스 fingerprint (인덱스 manifest의 fingerprint).
+        query_text: 질의 텍스트 (유니코드·공백 정규화 후 사용).
+        chunk_ids: 프롬프트 문맥에 들어간 청크 ID (순서 포함).
+        model: 답변을 생성한 LLM 모델명.
+        prompt_version: 프롬프트 템플릿 버전 해시.
+    """
+    raw = "\0".join([fingerprint, normalize_text(query_text), "\x1f".join(chunk_ids), model, prompt_version])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class AnswerCache:
+    """용량 제한과 LRU 축출을 지원하는 SQLite 답변 캐시 (여러 스레드에서 공유 가능)."""
+
+    def __init__(self, path: str | Path, max_bytes: int) -> None:
+        """AnswerCache 초기화.
+
+        Args:
+            path: SQLite 파일 경로.
+            max_bytes: 저장할 답변의 최대 총 바이트 수.
+        """
+        self._path = Path(path)
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self._path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> str | None:
+        """캐시된 답변. 없으면 None."""
+        with self._lock:
+            row = self._conn.execute("SELECT answer FROM answers WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE answers SET last_access = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+            self.hits += 1
+        return row[0]
+
+    def put(self, key: str, answer: str) -> None:
+        """답변을 저장하고 용량을 넘으면 오래 조회되지 않은 항목부터 축출."""
+        size = len(answer.encode("utf-8"))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO answers (key, answer, size, last_access) VALUES (?, ?, ?, ?)",
+                (key, answer, size, time.time()),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM answers").fetchone()
+        return count
+
+    def _evict(self) -> None:
+        """용량 초과 시 last_access가 오래된 항목부터 삭제 (호출자가 lock 보유)."""
+        (total,) = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM answers").fetchone()
+        if total <= self._max_bytes:
+            return
+
+        target = int(self._max_bytes * _EVICT_TARGET_RATIO)
+        victims: list[tuple[str]] = []
+        for key, size in self._conn.execute("SELECT key, size FROM answers ORDER BY last_access"):
+            if total <= target:
+                break
+            victims.append((key,))
+            total -= size
+        self._conn.executemany("DELETE FROM answers WHERE key = ?", victims)
+        logger.info("답변 캐시 용량 초과: %d개 항목 축출", len(victims))
+
+
+@lru_cache(maxsize=None)
+def get_answer_cache() -> AnswerCache | None:
+    """설정 기반 프로세스 공용 AnswerCache. ANSWER_CACHE_MAX_MB가 0이면 None."""
+    if ANSWER_CACHE_MAX_MB <= 0:
+        return None
+    return AnswerCache(ANSWER_CACHE_PATH, ANSWER_CACHE_MAX_MB * 1024 * 1024)
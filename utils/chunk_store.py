@@ -0,0 +1,176 @@
+"""디스크 기반 청크 docstore.
+
+저장된 인덱스의 청크(본문 + metadata)를 SQLite 파일에 두고 검색 결과로 필요한 청크만 읽으며,
+자주 조회되는 청크는 작은 LRU에 보관합니다. FAISS 인덱스의 정수 위치가 곧 행 번호이므로
+위치 → 청크 ID 매핑도 메모리에 올리지 않아, 제품별 상주 메모리는 사실상 벡터 데이터뿐입니다.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from collections.abc import Iterator, Mapping
+from pathlib import Path
+
+from langchain_community.docstore.base import Docstore
+from langchain_community.docstore.in_memory import InMemoryDocstore
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
+
+from config.settings import CHUNK_CACHE_SIZE
+
+logger = logging.getLogger(__name__)
+
+CHUNK_STORE_FILENAME = "chunks.sqlite"
+
+_SCHEMA = """
+CREATE TABLE chunks (
+    pos INTEGER PRIMARY KEY,
+    id TEXT NOT NULL UNIQUE,
+    page_content TEXT NOT NULL,
+    metadata TEXT NOT NULL
+);
+"""
+
+
+def write_chunk_store(path: str | Path, vectorstore: FAISS) -> None:
+    """벡터스토어의 청크를 인덱스 위치 순서로 SQLite 파일에 기록.
+
+    임시 파일에 쓴 뒤 교체하므로, 기존 파일을 열어 둔 프로세스는 옛 파일을 계속 읽습니다.
+
+    Args:
+        path: 청크 저장 파일 경로.
+        vectorstore: 저장할 FAISS 벡터스토어 (메모리·디스크 docstore 모두 가능).
+    """
+    path = Path(path)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp_path.unlink(missing_ok=True)
+
+    def rows() -> Iterator[tuple[int, str, str, str]]:
+        for pos in range(vectorstore.index.ntotal):
+            doc_id = vectorstore.index_to_docstore_id[pos]
+            doc = vectorstore.docstore.search(doc_id)
+            yield pos, doc_id, doc.page_content, json.dumps(doc.metadata, ensure_ascii=False)
+
+    conn = sqlite3.connect(str(tmp_path))
+    try:
+        conn.executescript(_SCHEMA)
+        conn.executemany("INSERT INTO chunks (pos, id, page_content, metadata) VALUES (?, ?, ?, ?)", rows())
+        conn.commit()
+    finally:
+        conn.close()
+    os.replace(tmp_path, path)
+
+
+class SqliteDocstore(Docstore):
+    """SQLite 파일을 읽기 전용으로 여는 docstore (LRU 캐시 포함).
+
+    청크 추가·삭제는 지원하지 않으므로 증분 인덱싱은 to_memory()로 변환한 docstore에서 수행합니다.
+    여러 스레드(Streamlit 세션)에서 공유할 수 있습니다.
+    """
+
+    def __init__(self, path: str | Path, cache_size: int = CHUNK_CACHE_SIZE) -> None:
+        """SqliteDocstore 초기화.
+
+        Args:
+            path: write_chunk_store()로 기록한 파일 경로.
+            cache_size: 메모리에 보관할 최근 조회 청크 수 (0이면 캐시하지 않음).
+
+        Raises:
+            sqlite3.Error: 파일이 없거나 청크 저장 파일이 아닌 경우.
+        """
+        uri = f"{Path(path).resolve().as_uri()}?mode=ro"
+        self._conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        self._conn.execute("SELECT 1 FROM chunks LIMIT 1")
+        self._lock = threading.Lock()
+        self._cache: OrderedDict[str, Document] = OrderedDict()
+        self._cache_size = cache_size
+        self.index_to_docstore_id = _PositionIds(self)
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM chunks").fetchone()
+        return count
+
+    def search(self, search: str) -> Document | str:
+        """청크 ID로 Document 조회. 없으면 InMemoryDocstore와 같은 안내 문자열."""
+        with self._lock:
+            doc = self._cache.get(search)
+            if doc is not None:
+                self._cache.move_to_end(search)
+                return doc
+            row = self._conn.execute(
+                "SELECT page_content, metadata FROM chunks WHERE id = ?", (search,)
+            ).fetchone()
+            if row is None:
+                return f"ID {search} not found."
+            doc = Document(id=search, page_content=row[0], metadata=json.loads(row[1]))
+            if self._cache_size > 0:
+                self._cache[search] = doc
+                if len(self._cache) > self._cache_size:
+                    self._cache.popitem(last=False)
+        return doc
+
+    def id_at(self, pos: int) -> str | None:
+        """인덱스 위치의 청크 ID. 없으면 None."""
+        with self._lock:
+            row = self._conn.execute("SELECT id FROM chunks WHERE pos = ?", (pos,)).fetchone()
+        return row[0] if row else None
+
+    def ids(self) -> list[str]:
+        """인덱스 위치 순서의 모든 청크 ID."""
+        with self._lock:
+            return [doc_id for (doc_id,) in self._conn.execute("SELECT id FROM chunks ORDER BY pos")]
+
+    def metadata_rows(self) -> list[tuple[int, str, dict]]:
+        """모든 청크의 (인덱스 위치, 청크 ID, metadata) — 본문은 읽지 않음."""
+        with self._lock:
+            return [
+                (pos, doc_id, json.loads(metadata))
+                for pos, doc_id, metadata in self._conn.execute(
+                    "SELECT pos, id, metadata FROM chunks ORDER BY pos"
+                )
+            ]
+
+    def to_memory(self) -> tuple[InMemoryDocstore, dict[int, str]]:
+        """모든 청크를 읽어 수정 가능한 (InMemoryDocstore, 위치 → 청크 ID) 쌍으로 변환."""
+        docs: dict[str, Document] = {}
+        index_to_id: dict[int, str] = {}
+        with self._lock:
+            for pos, doc_id, text, metadata in self._conn.execute(
+                "SELECT pos, id, page_content, metadata FROM chunks ORDER BY pos"
+            ):
+                docs[doc_id] = Document(id=doc_id, page_content=text, metadata=json.loads(metadata))
+                index_to_id[pos] = doc_id
+        return InMemoryDocstore(docs), index_to_id
+
+    def close(self) -> None:
+        """파일 핸들 닫기 (여러 번 호출해도 됨)."""
+        with self._lock:
+            self._conn.close()
+            self._cache.clear()
+
+
+class _PositionIds(Mapping):
+    """FAISS.index_to_docstore_id 대체 — 위치 → 청크 ID를 필요할 때 SQLite에서 조회."""
+
+    def __init__(self, store: SqliteDocstore) -> None:
+        self._store = store
+
+    def __getitem__(self, pos: int) -> str:
+        doc_id = self._store.id_at(int(pos))
+        if doc_id is None:
+            raise KeyError(pos)
+        return doc_id
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(range(len(self)))
+
+    def values(self) -> list[str]:
+        # 기본 구현은 위치마다 조회하므로 한 번에 읽음
+        return self._store.ids()
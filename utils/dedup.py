@@ -0,0 +1,147 @@
+"""MinHash/LSH 기반 준중복(near-duplicate) 청크 탐지.
+
+같은 허가사항의 여러 버전이나 논문 초록처럼 거의 같은 청크를 임베딩 전에 찾아,
+하나만 인덱스에 남기고 나머지의 출처(source, page)는 남긴 청크의 metadata에 합칩니다.
+"""
+
+import zlib
+
+import numpy as np
+
+from config.settings import DEDUP_NUM_PERM, DEDUP_THRESHOLD
+from utils.embedding_cache import normalize_text
+
+# 한국어는 띄어쓰기가 불규칙하므로 단어 대신 글자 n-gram으로 shingle을 만듦
+_SHINGLE_SIZE = 5
+# 메르센 소수 2^31-1 — (a*x + b) mod p 가 uint64 범위를 넘지 않음
+_PRIME = np.uint64((1 << 31) - 1)
+# LSH 밴드당 행 수 — 128개 순열이면 16개 밴드, 후보 임계값 약 (1/16)^(1/8) ≈ 0.71
+_ROWS_PER_BAND = 8
+
+
+def _shingles(text: str) -> np.ndarray:
+    """정규화된 텍스트의 글자 n-gram 해시 집합."""
+    text = normalize_text(text).lower()
+    if len(text) <= _SHINGLE_SIZE:
+        grams = {text}
+    else:
+        grams = {text[i:i + _SHINGLE_SIZE] for i in range(len(text) - _SHINGLE_SIZE + 1)}
+    return np.fromiter((zlib.crc32(g.encode("utf-8")) for g in grams), dtype=np.uint64, count=len(grams))
+
+
+class MinHashDeduplicator:
+    """MinHash 서명과 LSH 밴딩으로 준중복 청크를 찾는 인덱스.
+
+    LSH 버킷으로 후보만 추린 뒤 서명으로 추정한 Jaccard 유사도가
+    threshold 이상인 기존 청크를 중복으로 판정합니다.
+    """
+
+    def __init__(
+        self,
+        threshold: float = DEDUP_THRESHOLD,
+        num_perm: int = DEDUP_NUM_PERM,
+        seed: int = 1,
+    ) -> None:
+        """MinHashDeduplicator 초기화.
+
+        Args:
+            threshold: 중복으로 판정할 최소 추정 Jaccard 유사도 (글자 5-gram 기준).
+            num_perm: MinHash 순열 수. _ROWS_PER_BAND의 배수로 올림.
+            seed: 순열 계수 난수 시드 (같은 시드면 프로세스와 무관하게 같은 서명).
+        """
+        self.threshold = threshold
+        self._bands = max(1, -(-num_perm // _ROWS_PER_BAND))
+        num_perm = self._bands * _ROWS_PER_BAND
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, int(_PRIME), size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, int(_PRIME), size=num_perm, dtype=np.uint64)
+        self._signatures: dict[str, np.ndarray] = {}
+        self._buckets: list[dict[bytes, set[str]]] = [{} for _ in range(self._bands)]
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def signature(self, text: str) -> np.ndarray:
+        """텍스트의 MinHash 서명."""
+        shingles = _shingles(text)
+        hashed = (np.outer(self._a, shingles) + self._b[:, None]) % _PRIME
+        return hashed.min(axis=1)
+
+    def find(self, signature: np.ndarray) -> str | None:
+        """서명과 가장 비슷한 기존 청크 ID.
+
+        Returns:
+            추정 유사도가 threshold 이상인 청크 중 가장 비슷한 것의 ID. 없으면 None.
+        """
+        candidates: set[str] = set()
+        for band, key in enumerate(self._band_keys(signature)):
+            candidates.update(self._buckets[band].get(key, ()))
+
+        best_id, best_score = None, self.threshold
+        for chunk_id in candidates:
+            score = float(np.mean(self._signatures[chunk_id] == signature))
+            if score >= best_score:
+                best_id, best_score = chunk_id, score
+        return best_id
+
+    def add(self, chunk_id: str, signature: np.ndarray) -> None:
+        """청크 서명을 인덱스에 등록."""
+        self._signatures[chunk_id] = signature
+        for band, key in enumerate(self._band_keys(signature)):
+            self._buckets[band].setdefault(key, set()).add(chunk_id)
+
+    def remove(self, chunk_id: str) -> None:
+        """청크를 인덱스에서 제거 (없으면 무시)."""
+        signature = self._signatures.pop(chunk_id, None)
+        if signature is None:
+            return
+        for band, key in enumerate(self._band_keys(signature)):
+            bucket = self._buckets[band].get(key)
+            if bucket is not None:
+                bucket.discard(chunk_id)
+                if not bucket:
+                    del self._buckets[band][key]
+
+    def _band_keys(self, signature: np.ndarray) -> list[bytes]:
+        return [
+            signature[i * _ROWS_PER_BAND:(i + 1) * _ROWS_PER_BAND].tobytes()
+            for i in range(self._bands)
+        ]
+
+
+def create_deduplicator() -> MinHashDeduplicator | None:
+    """설정 기반 MinHashDeduplicator. DEDUP_THRESHOLD가 0이면 None (중복 제거 비활성화)."""
+    if DEDUP_THRESHOLD <= 0:
+        return None
+    return MinHashDeduplicator()
+
+
+def add_provenance(metadata: dict, source: str, page: int) -> bool:
+    """청크 metadata의 출처 목록(provenance)에 (source, page)를 추가.
+
+    provenance가 없으면 청크 자신의 source/page로 시작합니다.
+
+    Returns:
+        새로 추가되었으면 True, 이미 있으면 False.
+    """
+    provenance = metadata.setdefault(
+        "provenance",
+        [{"source": metadata.get("source", "unknown"), "page": metadata.get("page", 0)}],
+    )
+    entry = {"source": source, "page": page}
+    if entry in provenance:
+        return False
+    provenance.append(entry)
+    return True
+
+
+def remove_provenance(metadata: dict, source: str) -> None:
+    """출처 목록에서 source 파일의 항목을 제거 (청크 자신의 파일은 남김)."""
+    provenance = metadata.get("provenance")
+    if not provenance:
+        return
+    kept = [p for p in provenance if p["source"] != source or p["source"] == metadata.get("source")]
+    if len(kept) > 1:
+        metadata["provenance"] = kept
+    else:
+        metadata.pop("provenance")
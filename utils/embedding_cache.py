@@ -0,0 +1,314 @@
+"""청크·질의 임베딩의 내용 주소 기반(content-addressed) 디스크 캐시.
+
+(임베딩 모델, 정규화된 청크 텍스트 해시) → 벡터를 SQLite에 저장하여
+같은 텍스트가 여러 제품·재업로드·재구축에서 다시 API로 전송되지 않게 합니다.
+질의 벡터는 문서 벡터와 다른 임베딩 작업(task type)이므로 별도 모델 키(QUERY_SUFFIX)로 저장합니다.
+"""
+
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+import unicodedata
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from config.settings import EMBEDDING_CACHE_MAX_MB, EMBEDDING_CACHE_PATH
+from utils.embedding_pipeline import BatchedEmbeddings, embed_queries
+
+logger = logging.getLogger(__name__)
+
+# 질의 임베딩의 캐시 모델 키 접미사 (같은 텍스트의 문서 벡터와 구분)
+QUERY_SUFFIX = "#query"
+
+# 용량 초과 시 최대 용량의 이 비율까지 줄여서 매 저장마다 축출이 반복되지 않게 함
+_EVICT_TARGET_RATIO = 0.9
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS vectors (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    vector BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_vectors_last_access ON vectors(last_access);
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+
+def normalize_text(text: str) -> str:
+    """캐시 키용 텍스트 정규화 (유니코드 NFC + 공백 축약)."""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def cache_key(model: str, text: str) -> str:
+    """(모델, 정규화된 텍스트)의 SHA-256 캐시 키."""
+    raw = f"{model}\0{normalize_text(text)}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CacheStats:
+    """임베딩 캐시 통계."""
+
+    hits: int
+    misses: int
+    entries: int
+    size_bytes: int
+
+    @property
+    def hit_rate(self) -> float:
+        """적중률 (조회가 없었으면 0.0)."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class EmbeddingCache:
+    """용량 제한과 LRU 축출을 지원하는 SQLite 임베딩 캐시.
+
+    여러 스레드에서 공유할 수 있으며, hits/misses는 이 인스턴스의 카운터이고
+    누적값은 DB의 counters 테이블에 함께 기록됩니다.
+    """
+
+    def __init__(self, path: str | Path, max_bytes: int) -> None:
+        """EmbeddingCache 초기화.
+
+        Args:
+            path: SQLite 파일 경로.
+            max_bytes: 저장할 벡터의 최대 총 바이트 수.
+        """
+        self._path = Path(path)
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self._path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self.hits = 0
+        self.misses = 0
+
+    def get_many(self, model: str, texts: list[str]) -> list[np.ndarray | None]:
+        """텍스트 목록에 대한 캐시된 벡터 조회.
+
+        Args:
+            model: 임베딩 모델 키.
+            texts: 원문 텍스트 목록.
+
+        Returns:
+            입력 순서의 벡터 목록. 캐시에 없으면 None.
+        """
+        keys = [cache_key(model, t) for t in texts]
+        found: dict[str, np.ndarray] = {}
+
+        with self._lock:
+            # SQLite 변수 개수 제한(기본 999)을 넘지 않도록 나누어 조회
+            for start in range(0, len(keys), 500):
+                batch = keys[start:start + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM vectors WHERE key IN ({placeholders})",
+                    batch,
+                ).fetchall()
+                found.update((k, np.frombuffer(v, dtype=np.float32)) for k, v in rows)
+
+            if found:
+                now = time.time()
+                self._conn.executemany(
+                    "UPDATE vectors SET last_access = ? WHERE key = ?",
+                    [(now, k) for k in found],
+                )
+            hits = sum(1 for k in keys if k in found)
+            self._record(hits, len(keys) - hits)
+            self._conn.commit()
+
+        return [found.get(k) for k in keys]
+
+    def put_many(self, model: str, texts: list[str], vectors: list[list[float]]) -> None:
+        """벡터를 캐시에 저장하고 용량을 넘으면 오래 사용되지 않은 항목부터 축출.
+
+        Args:
+            model: 임베딩 모델 키.
+            texts: 원문 텍스트 목록.
+            vectors: texts와 같은 순서의 벡터 목록.
+        """
+        now = time.time()
+        rows = []
+        for text, vector in zip(texts, vectors):
+            blob = np.asarray(vector, dtype=np.float32).tobytes()
+            rows.append((cache_key(model, text), model, blob, len(blob), now))
+
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO vectors (key, model, vector, size, last_access) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._evict()
+            self._conn.commit()
+
+    def stats(self) -> CacheStats:
+        """현재 인스턴스의 적중/미스와 캐시 크기."""
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM vectors"
+            ).fetchone()
+        return CacheStats(hits=self.hits, misses=self.misses, entries=entries, size_bytes=size)
+
+    def lifetime_stats(self) -> CacheStats:
+        """캐시 파일 생성 이후 누적 적중/미스와 캐시 크기."""
+        current = self.stats()
+        with self._lock:
+            counters = dict(self._conn.execute("SELECT name, value FROM counters").fetchall())
+        return CacheStats(
+            hits=counters.get("hits", 0),
+            misses=counters.get("misses", 0),
+            entries=current.entries,
+            size_bytes=current.size_bytes,
+        )
+
+    def _record(self, hits: int, misses: int) -> None:
+        """적중/미스 카운터 갱신 (호출자가 lock 보유)."""
+        self.hits += hits
+        self.misses += misses
+        self._conn.executemany(
+            "INSERT INTO counters (name, value) VALUES (?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+            [("hits", hits), ("misses", misses)],
+        )
+
+    def _evict(self) -> None:
+        """용량 초과 시 last_access가 오래된 항목부터 삭제 (호출자가 lock 보유)."""
+        (total,) = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM vectors").fetchone()
+        if total <= self._max_bytes:
+            return
+
+        target = int(self._max_bytes * _EVICT_TARGET_RATIO)
+        victims: list[tuple[str]] = []
+        for key, size in self._conn.execute("SELECT key, size FROM vectors ORDER BY last_access"):
+            if total <= target:
+                break
+            victims.append((key,))
+            total -= size
+        self._conn.executemany("DELETE FROM vectors WHERE key = ?", victims)
+        logger.info("임베딩 캐시 용량 초과: %d개 항목 축출", len(victims))
+
+
+class CachedEmbeddings(Embeddings):
+    """문서 임베딩 앞에 EmbeddingCache를 두는 Embeddings 래퍼.
+
+    캐시에 없는 텍스트만(같은 요청 내 중복은 한 번만) 원본 임베딩으로 전송합니다.
+    원본이 BatchedEmbeddings이면 배치가 끝날 때마다 캐시에 저장하므로,
+    중간에 실패해도 완료된 배치는 다음 실행에서 재사용됩니다 (체크포인트).
+    질의 임베딩도 캐시하며, 한 번 조회한 질의 벡터는 메모리에 두어 같은 질의는 DB도 거치지 않습니다.
+    키가 질의 텍스트 자체이므로 질의 문구가 바뀌면 자동으로 새로 임베딩합니다.
+    """
+
+    def __init__(self, embedding: Embeddings, cache: EmbeddingCache, model: str) -> None:
+        """CachedEmbeddings 초기화.
+
+        Args:
+            embedding: 실제 임베딩을 계산할 Embeddings 인스턴스.
+            cache: 사용할 EmbeddingCache.
+            model: 캐시 키에 포함할 임베딩 모델명.
+        """
+        self._embedding = embedding
+        self._cache = cache
+        self._model = model
+        self._query_model = f"{model}{QUERY_SUFFIX}"
+        # 정규화된 질의 텍스트 → 벡터
+        self._queries: dict[str, list[float]] = {}
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        cached = self._cache.get_many(self._model, texts)
+
+        # 캐시 미스 텍스트를 정규화 키 기준으로 중복 제거
+        pending: dict[str, list[int]] = {}
+        for i, vector in enumerate(cached):
+            if vector is None:
+                pending.setdefault(normalize_text(texts[i]), []).append(i)
+
+        if pending:
+            miss_texts = [texts[indices[0]] for indices in pending.values()]
+            if isinstance(self._embedding, BatchedEmbeddings):
+                new_vectors = self._embedding.embed_documents(miss_texts, on_batch=self._checkpoint)
+            else:
+                new_vectors = self._embedding.embed_documents(miss_texts)
+                self._checkpoint(miss_texts, new_vectors)
+            for indices, vector in zip(pending.values(), new_vectors):
+                for i in indices:
+                    cached[i] = vector
+
+        return [np.asarray(v, dtype=np.float32).tolist() for v in cached]
+
+    def embed_query(self, text: str) -> list[float]:
+        key = normalize_text(text)
+        vector = self._queries.get(key)
+        if vector is None:
+            (cached,) = self._cache.get_many(self._query_model, [text])
+            if cached is None:
+                cached = np.asarray(self._embedding.embed_query(text), dtype=np.float32)
+                self._cache.put_many(self._query_model, [text], [cached])
+            vector = cached.tolist()
+            self._queries[key] = vector
+        return list(vector)
+
+    def embed_queries(self, texts: list[str]) -> list[list[float]]:
+        """여러 질의 벡터. 메모리·캐시에 없는 질의만 한 번의 요청으로 임베딩하여 저장."""
+        self.preload_queries(texts)
+        pending: dict[str, str] = {}
+        for text in texts:
+            key = normalize_text(text)
+            if key not in self._queries:
+                pending.setdefault(key, text)
+
+        if pending:
+            miss_texts = list(pending.values())
+            vectors = np.asarray(embed_queries(self._embedding, miss_texts), dtype=np.float32)
+            self._cache.put_many(self._query_model, miss_texts, list(vectors))
+            for key, vector in zip(pending, vectors):
+                self._queries[key] = vector.tolist()
+        return [list(self._queries[normalize_text(text)]) for text in texts]
+
+    def preload_queries(self, texts: list[str]) -> int:
+        """고정 질의 목록의 저장된 벡터를 메모리에 로드 (API 호출 없음).
+
+        캐시에 없는 질의는 처음 질의할 때 임베딩되어 저장됩니다.
+
+        Args:
+            texts: 질의 텍스트 목록 (PLACEHOLDER_QUERIES·FIELD_QUERIES 값).
+
+        Returns:
+            캐시에서 로드한 질의 수.
+        """
+        pending: dict[str, str] = {}
+        for text in texts:
+            key = normalize_text(text)
+            if key not in self._queries:
+                pending.setdefault(key, text)
+
+        found = self._cache.get_many(self._query_model, list(pending.values()))
+        for key, vector in zip(pending, found):
+            if vector is not None:
+                self._queries[key] = vector.tolist()
+        return sum(vector is not None for vector in found)
+
+    def _checkpoint(self, texts: list[str], vectors: list[list[float]]) -> None:
+        """완료된 임베딩을 캐시에 저장."""
+        self._cache.put_many(self._model, texts, vectors)
+
+
+@lru_cache(maxsize=None)
+def get_embedding_cache() -> EmbeddingCache | None:
+    """설정 기반 프로세스 공용 EmbeddingCache. EMBEDDING_CACHE_MAX_MB가 0이면 None."""
+    if EMBEDDING_CACHE_MAX_MB <= 0:
+        return None
+    return EmbeddingCache(EMBEDDING_CACHE_PATH, EMBEDDING_CACHE_MAX_MB * 1024 * 1024)
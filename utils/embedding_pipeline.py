@@ -0,0 +1,288 @@
+"""배치 단위 임베딩 파이프라인: 동시성 제한, 분당 요청/토큰 제한, 429 재시도, 체크포인트, 차원 축소."""
+
+import logging
+import random
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+from langchain_google_genai import GoogleGenerativeAIEmbeddings
+
+from config.settings import (
+    EMBEDDING_BATCH_SIZE,
+    EMBEDDING_DIM,
+    EMBEDDING_MAX_CONCURRENCY,
+    EMBEDDING_MAX_RETRIES,
+    EMBEDDING_MODEL,
+    EMBEDDING_RPM,
+    EMBEDDING_TPM,
+)
+
+logger = logging.getLogger(__name__)
+
+# 재시도 대기 시간 (초): 2, 4, 8, ... 최대 60
+_BACKOFF_BASE = 2.0
+_BACKOFF_MAX = 60.0
+
+BatchCallback = Callable[[list[str], list[list[float]]], None]
+
+
+def embedding_model_id(model: str = EMBEDDING_MODEL, dim: int = EMBEDDING_DIM) -> str:
+    """캐시 키·인덱스 manifest에 쓰는 임베딩 식별자 (축소 차원이면 "모델@차원")."""
+    return f"{model}@{dim}" if dim else model
+
+
+def embed_queries(embedding: Embeddings, texts: list[str]) -> list[list[float]]:
+    """여러 질의를 한 번에 임베딩.
+
+    래퍼(배치·정규화·캐시)는 각자의 embed_queries로 위임하고, Gemini 임베딩은 배치 요청으로
+    질의용(RETRIEVAL_QUERY) 벡터를 받습니다. 그 밖의 임베딩은 embed_query를 차례로 호출합니다.
+
+    Args:
+        embedding: 질의 임베딩에 쓸 Embeddings 인스턴스.
+        texts: 질의 텍스트 목록.
+
+    Returns:
+        입력 순서의 질의 벡터 목록 (embed_query 결과와 같은 벡터).
+    """
+    if not texts:
+        return []
+    if hasattr(embedding, "embed_queries"):
+        return embedding.embed_queries(texts)
+    if isinstance(embedding, GoogleGenerativeAIEmbeddings):
+        return embedding.embed_documents(texts, task_type="RETRIEVAL_QUERY")
+    return [embedding.embed_query(text) for text in texts]
+
+
+def estimate_tokens(text: str) -> int:
+    """토큰 수 보수적 추정 (한국어는 글자당 토큰이 많으므로 2자당 1토큰)."""
+    return max(1, len(text) // 2)
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """429 / RESOURCE_EXHAUSTED 계열 할당량 초과 오류인지 판단."""
+    if getattr(error, "code", None) == 429 or getattr(error, "status_code", None) == 429:
+        return True
+    message = f"{type(error).__name__} {error}"
+    return any(marker in message for marker in ("429", "ResourceExhausted", "RESOURCE_EXHAUSTED"))
+
+
+class TokenBucket:
+    """분당 허용량 기반 토큰 버킷 (스레드 안전).
+
+    용량은 1분 허용량이며, 요청량이 용량보다 크면 용량만큼만 차감하여
+    단일 대형 요청이 영원히 대기하지 않게 합니다.
+    """
+
+    def __init__(self, per_minute: int) -> None:
+        """TokenBucket 초기화.
+
+        Args:
+            per_minute: 분당 허용량. 0 이하이면 제한 없음.
+        """
+        self._capacity = float(per_minute)
+        self._rate = per_minute / 60.0
+        self._tokens = float(per_minute)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, amount: int = 1) -> float:
+        """amount만큼 차감될 때까지 대기.
+
+        Returns:
+            대기한 시간 (초).
+        """
+        if self._capacity <= 0:
+            return 0.0
+        amount = min(float(amount), self._capacity)
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+                self._updated = now
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return waited
+                delay = (amount - self._tokens) / self._rate
+            time.sleep(delay)
+            waited += delay
+
+
+@dataclass
+class EmbeddingRunStats:
+    """한 번의 embed_documents 실행 통계."""
+
+    chunks: int = 0
+    batches: int = 0
+    retries: int = 0
+    throttled_seconds: float = 0.0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def chunks_per_second(self) -> float:
+        """처리량 (청크/초)."""
+        return self.chunks / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+
+class BatchedEmbeddings(Embeddings):
+    """문서 임베딩을 배치로 나누어 제한된 동시성과 속도로 전송하는 Embeddings 래퍼.
+
+    - 배치 크기와 동시 요청 수를 설정으로 제한
+    - 분당 요청 수(RPM)와 분당 토큰 수(TPM)를 토큰 버킷으로 제한
+    - 429 응답은 지수 백오프로 재시도
+    - 완료된 배치마다 on_batch 콜백을 호출하여 중간 실패 시에도 결과를 보존
+    """
+
+    def __init__(
+        self,
+        embedding: Embeddings,
+        batch_size: int = EMBEDDING_BATCH_SIZE,
+        max_concurrency: int = EMBEDDING_MAX_CONCURRENCY,
+        requests_per_minute: int = EMBEDDING_RPM,
+        tokens_per_minute: int = EMBEDDING_TPM,
+        max_retries: int = EMBEDDING_MAX_RETRIES,
+    ) -> None:
+        """BatchedEmbeddings 초기화.
+
+        Args:
+            embedding: 실제 임베딩을 계산할 Embeddings 인스턴스.
+            batch_size: 요청당 최대 텍스트 수.
+            max_concurrency: 동시에 진행할 최대 요청 수.
+            requests_per_minute: 분당 최대 요청 수 (0이면 제한 없음).
+            tokens_per_minute: 분당 최대 추정 토큰 수 (0이면 제한 없음).
+            max_retries: 429 응답 시 배치당 최대 재시도 횟수.
+        """
+        self._embedding = embedding
+        self._batch_size = max(1, batch_size)
+        self._max_concurrency = max(1, max_concurrency)
+        self._request_bucket = TokenBucket(requests_per_minute)
+        self._token_bucket = TokenBucket(tokens_per_minute)
+        self._max_retries = max_retries
+        self._stats_lock = threading.Lock()
+        self.last_stats = EmbeddingRunStats()
+
+    def embed_documents(
+        self,
+        texts: list[str],
+        on_batch: BatchCallback | None = None,
+    ) -> list[list[float]]:
+        """텍스트를 배치 단위로 임베딩.
+
+        Args:
+            texts: 임베딩할 텍스트 목록.
+            on_batch: 배치가 완료될 때마다 (배치 텍스트, 벡터)로 호출되는 체크포인트 콜백.
+
+        Returns:
+            입력 순서의 벡터 목록.
+
+        Raises:
+            RuntimeError: 재시도 후에도 실패한 배치가 있는 경우. 완료된 배치는 이미 콜백으로 전달됨.
+        """
+        batches = [texts[i:i + self._batch_size] for i in range(0, len(texts), self._batch_size)]
+        results: list[list[list[float]] | None] = [None] * len(batches)
+        stats = EmbeddingRunStats(chunks=len(texts), batches=len(batches))
+        self.last_stats = stats
+        started = time.monotonic()
+
+        def _run(index: int) -> None:
+            vectors = self._embed_batch(batches[index], stats)
+            if on_batch is not None:
+                on_batch(batches[index], vectors)
+            results[index] = vectors
+
+        errors: list[Exception] = []
+        with ThreadPoolExecutor(max_workers=min(self._max_concurrency, max(len(batches), 1))) as pool:
+            futures = [pool.submit(_run, i) for i in range(len(batches))]
+            for future in futures:
+                if future.cancelled():
+                    continue
+                try:
+                    future.result()
+                except Exception as e:
+                    errors.append(e)
+                    # 복구 불가능한 실패 — 아직 시작하지 않은 배치는 보내지 않음
+                    for pending in futures:
+                        pending.cancel()
+
+        stats.elapsed_seconds = time.monotonic() - started
+        completed = sum(1 for r in results if r is not None)
+        logger.info(
+            "임베딩 %d/%d 배치 완료: %d개 청크, %.1f청크/초 (재시도 %d회, 속도 제한 대기 %.1f초)",
+            completed,
+            len(batches),
+            sum(len(b) for b, r in zip(batches, results) if r is not None),
+            stats.chunks_per_second,
+            stats.retries,
+            stats.throttled_seconds,
+        )
+
+        if errors:
+            raise RuntimeError(
+                f"임베딩 실패: {len(batches) - completed}/{len(batches)}개 배치 미완료 "
+                f"(완료된 배치는 저장됨). 원인: {errors[0]}"
+            ) from errors[0]
+
+        return [vector for batch_vectors in results for vector in batch_vectors]
+
+    def embed_query(self, text: str) -> list[float]:
+        return self._embedding.embed_query(text)
+
+    def embed_queries(self, texts: list[str]) -> list[list[float]]:
+        return embed_queries(self._embedding, texts)
+
+    def _embed_batch(self, batch: list[str], stats: EmbeddingRunStats) -> list[list[float]]:
+        """속도 제한을 지키며 한 배치를 임베딩하고, 429이면 지수 백오프로 재시도."""
+        tokens = sum(estimate_tokens(t) for t in batch)
+        attempt = 0
+        while True:
+            waited = self._request_bucket.acquire(1) + self._token_bucket.acquire(tokens)
+            try:
+                vectors = self._embedding.embed_documents(batch)
+            except Exception as e:
+                if not is_rate_limit_error(e) or attempt >= self._max_retries:
+                    raise
+                delay = min(_BACKOFF_MAX, _BACKOFF_BASE * 2 ** attempt)
+                delay *= 0.5 + random.random() / 2  # 동시 요청들이 같은 시점에 재시도하지 않도록 지터
+                attempt += 1
+                logger.warning("임베딩 할당량 초과(429), %.1f초 후 재시도 (%d/%d)", delay, attempt, self._max_retries)
+                with self._stats_lock:
+                    stats.retries += 1
+                    stats.throttled_seconds += waited + delay
+                time.sleep(delay)
+                continue
+
+            with self._stats_lock:
+                stats.throttled_seconds += waited
+            return vectors
+
+
+class NormalizedEmbeddings(Embeddings):
+    """벡터를 L2 정규화하는 Embeddings 래퍼.
+
+    출력 차원을 줄인(MRL 절단) Gemini 임베딩은 단위 벡터가 아니므로,
+    문서·질의 벡터를 같은 방식으로 재정규화해 거리 비교가 일관되게 합니다.
+    """
+
+    def __init__(self, embedding: Embeddings) -> None:
+        self._embedding = embedding
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return _l2_normalize(self._embedding.embed_documents(texts)).tolist()
+
+    def embed_query(self, text: str) -> list[float]:
+        return _l2_normalize([self._embedding.embed_query(text)])[0].tolist()
+
+    def embed_queries(self, texts: list[str]) -> list[list[float]]:
+        return _l2_normalize(embed_queries(self._embedding, texts)).tolist()
+
+
+def _l2_normalize(vectors: list[list[float]]) -> np.ndarray:
+    """행 단위 L2 정규화 (영벡터는 그대로)."""
+    array = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(array, axis=1, keepdims=True)
+    return array / np.where(norms == 0, 1, norms)
@@ -0,0 +1,174 @@
+"""임베딩 제공자.
+
+기본 제공자는 Gemini 임베딩 API이며, "local"은 API 키·네트워크 없이 CPU에서 해시 기반
+단어 빈도 벡터를 계산합니다. EMBEDDING_PROVIDER 설정이나 products.json의 "embedding_provider"로
+선택하며, 폐쇄망 노트북의 오프라인 인덱싱, 테스트, 벤치마크에 사용합니다.
+"""
+
+import logging
+import math
+import zlib
+from abc import ABC, abstractmethod
+from collections import Counter
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+from langchain_google_genai import GoogleGenerativeAIEmbeddings
+
+from config.settings import (
+    EMBEDDING_DIM,
+    EMBEDDING_MODEL,
+    EMBEDDING_PROVIDER,
+    LOCAL_EMBEDDING_DIM,
+    RETRIEVER_MIN_SIMILARITY,
+)
+from utils.embedding_cache import CachedEmbeddings, get_embedding_cache
+from utils.embedding_pipeline import BatchedEmbeddings, NormalizedEmbeddings, embedding_model_id
+from utils.lexical_index import tokenize
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EMBEDDING_PROVIDER = "google"
+
+
+class HashingEmbeddings(Embeddings):
+    """토큰을 해시 버킷에 모은 단어 빈도 벡터 (feature hashing).
+
+    토큰화는 BM25 어휘 인덱스와 같으며(한글 글자 bigram, 영문·숫자 단어), 빈도는 1 + log(tf)로 완화하고
+    해시 부호로 버킷 충돌의 편향을 상쇄한 뒤 L2 정규화합니다. 코퍼스 통계(IDF)를 쓰지 않으므로
+    증분 인덱싱에서도 기존 벡터가 그대로 유효하고, 같은 텍스트는 어느 프로세스에서나 같은 벡터가 됩니다.
+    """
+
+    def __init__(self, dim: int = LOCAL_EMBEDDING_DIM) -> None:
+        """HashingEmbeddings 초기화.
+
+        Args:
+            dim: 벡터 차원 (해시 버킷 수).
+        """
+        self.dim = dim
+
+    def _embed(self, text: str) -> list[float]:
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for term, tf in Counter(tokenize(text)).items():
+            h = zlib.crc32(term.encode("utf-8"))
+            vector[h % self.dim] += (1.0 + math.log(tf)) * (1.0 if h & 0x80000000 else -1.0)
+        norm = float(np.linalg.norm(vector))
+        if norm:
+            vector /= norm
+        return vector.tolist()
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: str) -> list[float]:
+        return self._embed(text)
+
+
+class EmbeddingProvider(ABC):
+    """임베딩 제공자 기본 클래스."""
+
+    # 설정값으로 쓰는 제공자 이름
+    name: str = ""
+    # 임베딩 생성에 Google API 키가 필요한지 여부
+    requires_api_key: bool = False
+    # 관련 청크가 없다고 볼 최상위 코사인 유사도 기본값 (RETRIEVER_MIN_SIMILARITY가 비어 있을 때, None이면 게이트 끔)
+    default_min_similarity: float | None = None
+
+    @property
+    def min_similarity(self) -> float | None:
+        """유사도 게이트 임계값 (RETRIEVER_MIN_SIMILARITY 설정 우선, None이면 게이트 끔)."""
+        if RETRIEVER_MIN_SIMILARITY is not None:
+            return RETRIEVER_MIN_SIMILARITY
+        return self.default_min_similarity
+
+    @property
+    @abstractmethod
+    def model_id(self) -> str:
+        """임베딩 캐시 키·인덱스 manifest·fingerprint에 쓰는 식별자."""
+
+    @abstractmethod
+    def create(self, api_key: str | None = None) -> Embeddings:
+        """인덱싱과 질의에 쓸 Embeddings 인스턴스."""
+
+
+class GoogleEmbeddingProvider(EmbeddingProvider):
+    """Gemini 임베딩 API (기본값)."""
+
+    name = "google"
+    requires_api_key = True
+    # 실제 질의·코퍼스로 보정한 값이 없으므로 기본은 게이트 끔 (RETRIEVER_MIN_SIMILARITY로 켬)
+
+    @property
+    def model_id(self) -> str:
+        return embedding_model_id()
+
+    def create(self, api_key: str | None = None) -> Embeddings:
+        """Gemini 임베딩 인스턴스.
+
+        EMBEDDING_DIM이 설정되어 있으면 축소 차원으로 요청하고 재정규화합니다.
+        배치·속도 제한 파이프라인으로 감싸고, 임베딩 캐시가 활성화되어 있으면
+        그 앞에 캐시를 두어 캐시 미스만 파이프라인으로 전송합니다.
+        완료된 배치를 저장하는 체크포인트도 캐시가 담당하므로, 캐시가 꺼져 있으면
+        (EMBEDDING_CACHE_MAX_MB=0) 인덱스 구축이 중단될 때 완료된 배치도 다시 임베딩해야 합니다.
+        """
+        base: Embeddings = GoogleGenerativeAIEmbeddings(
+            model=EMBEDDING_MODEL,
+            google_api_key=api_key,
+            output_dimensionality=EMBEDDING_DIM or None,
+        )
+        if EMBEDDING_DIM:
+            base = NormalizedEmbeddings(base)
+        embedding = BatchedEmbeddings(base)
+        cache = get_embedding_cache()
+        if cache is None:
+            return embedding
+        return CachedEmbeddings(embedding, cache, self.model_id)
+
+
+class LocalHashingProvider(EmbeddingProvider):
+    """로컬 CPU 해시 벡터 (API 키·네트워크 불필요).
+
+    계산이 API 왕복보다 훨씬 빠르므로 배치 파이프라인과 임베딩 캐시를 거치지 않습니다.
+    의미 유사도는 Gemini 임베딩보다 약하므로 어휘 일치 위주의 검색 품질을 기대해야 합니다.
+    """
+
+    name = "local"
+    # 어휘가 거의 겹치지 않으면 0에 가까움
+    default_min_similarity = 0.05
+    # 해시·토큰화 방식이 바뀌면 올려서 기존 인덱스를 무효화
+    revision = 1
+
+    def __init__(self, dim: int = LOCAL_EMBEDDING_DIM) -> None:
+        self.dim = dim
+
+    @property
+    def model_id(self) -> str:
+        return f"local-hashing-v{self.revision}@{self.dim}"
+
+    def create(self, api_key: str | None = None) -> Embeddings:
+        return HashingEmbeddings(self.dim)
+
+
+EMBEDDING_PROVIDERS: dict[str, type[EmbeddingProvider]] = {
+    cls.name: cls for cls in (GoogleEmbeddingProvider, LocalHashingProvider)
+}
+
+
+def get_embedding_provider(name: str | None = None) -> EmbeddingProvider:
+    """이름으로 임베딩 제공자를 선택.
+
+    Args:
+        name: 제공자 이름 (products.json의 embedding_provider). None이면 EMBEDDING_PROVIDER 설정값.
+
+    Returns:
+        EmbeddingProvider 인스턴스.
+
+    Raises:
+        ValueError: 알 수 없는 제공자 이름인 경우.
+    """
+    name = (name or EMBEDDING_PROVIDER).lower()
+    if name not in EMBEDDING_PROVIDERS:
+        raise ValueError(
+            f"알 수 없는 임베딩 제공자: {name} (사용 가능: {', '.join(EMBEDDING_PROVIDERS)})"
+        )
+    return EMBEDDING_PROVIDERS[name]()
@@ -0,0 +1,678 @@
+"""제품별 FAISS 인덱스 디스크 영속화, 코퍼스 fingerprint 및 검색 인덱스 종류 관리.
+
+인덱스는 제품 폴더 아래(예: products/polivy/index/)에 저장되며,
+manifest.json의 fingerprint가 현재 코퍼스와 일치할 때만 재사용됩니다.
+저장할 때마다 새 버전 폴더(예: index/v20261016T120000123456-4242/)에 파일을 쓰고 manifest가 그 폴더를
+가리키게 바꾸므로, 다른 세션이 열어 둔 파일을 덮어쓰지 않습니다 (Windows에서는 열린 파일을 교체할 수 없음).
+구축·갱신은 flat 인덱스로 하고, 저장 전에 INDEX_TYPE(hnsw/ivf) 인덱스로 변환합니다.
+조회용으로 로드하는 인덱스는 읽기 전용 메모리 매핑으로 열어(INDEX_MMAP) 프로세스 간에 공유하고,
+청크 본문·metadata는 메모리에 올리지 않고 디스크 docstore(chunks.sqlite)에서 필요할 때 읽습니다.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import time
+from datetime import datetime
+from pathlib import Path
+
+import faiss
+import numpy as np
+from langchain_community.vectorstores import FAISS
+from langchain_core.embeddings import Embeddings
+
+from config.settings import (
+    BOILERPLATE_MIN_RATIO,
+    CHUNK_OVERLAP,
+    CHUNK_SIZE,
+    DEDUP_THRESHOLD,
+    INDEX_ANN_MIN_VECTORS,
+    INDEX_COMPACT_RATIO,
+    INDEX_DIRNAME,
+    INDEX_HNSW_EF_CONSTRUCTION,
+    INDEX_HNSW_EF_SEARCH,
+    INDEX_HNSW_M,
+    INDEX_IVF_NLIST,
+    INDEX_IVF_NPROBE,
+    INDEX_MMAP,
+    INDEX_STORAGE,
+    INDEX_TYPE,
+)
+from utils.chunk_store import CHUNK_STORE_FILENAME, SqliteDocstore, write_chunk_store
+from utils.embedding_pipeline import embedding_model_id
+from utils.lexical_index import LEXICAL_INDEX_FILENAME, BM25Index
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILENAME = "manifest.json"
+INDEX_NAME = "index"
+# 양자화 저장(float16/int8) 인덱스와 함께 두는 원래 float32 벡터 (증분 갱신·저장 형식 변경 시 재임베딩 방지)
+ORIGINAL_VECTORS_FILENAME = "vectors.faiss"
+# 저장 버전 폴더 이름 접두사 (뒤에 시각이 붙어 이름순이 곧 저장 순서)
+_VERSION_PREFIX = "v"
+# Windows에서 읽는 중인 manifest 교체 재시도 횟수와 간격(초)
+_REPLACE_RETRIES = 10
+_REPLACE_RETRY_DELAY = 0.05
+
+# 인덱스 포맷이 바뀌면 올려서 기존 인덱스를 무효화 (2: 청크를 index.pkl 대신 chunks.sqlite에 저장)
+INDEX_FORMAT_VERSION = 2
+
+INDEX_TYPES = ("flat", "hnsw", "ivf")
+# 저장 형식별 faiss 스칼라 양자화 종류 (float32는 양자화하지 않음)
+_SQ_TYPES = {
+    "float16": faiss.ScalarQuantizer.QT_fp16,
+    "int8": faiss.ScalarQuantizer.QT_8bit,
+}
+INDEX_STORAGES = ("float32", *_SQ_TYPES)
+# 저장된 벡터를 그대로 복원할 수 있는 저장 형식 (그 외는 양자화된 값만 복원됨)
+LOSSLESS_STORAGE = "float32"
+# IVF 학습에 클러스터당 필요한 최소 벡터 수 (faiss 권장값)
+_IVF_MIN_POINTS_PER_CLUSTER = 39
+# 벡터 코드(flat/HNSW 저장소/IVF 리스트)를 파일에서 직접 매핑하는 faiss 읽기 플래그.
+# 구버전 faiss(1.9 미만)에는 없으므로 0이면 일반 로드
+_MMAP_FLAGS = (
+    faiss.IO_FLAG_MMAP_IFC | faiss.IO_FLAG_READ_ONLY if hasattr(faiss, "IO_FLAG_MMAP_IFC") else 0
+)
+
+
+def get_index_dir(master_data_dir: str | Path) -> Path:
+    """제품 Master Data 폴더에 대응하는 인덱스 저장 폴더 경로.
+
+    Args:
+        master_data_dir: products.json의 master_data_dir (예: products/polivy/master_data/).
+
+    Returns:
+        Master Data 폴더와 같은 레벨의 인덱스 폴더 (예: products/polivy/index/).
+    """
+    return Path(master_data_dir).parent / INDEX_DIRNAME
+
+
+def file_content_hash(file_path: str | Path) -> str:
+    """파일 내용의 SHA-256 해시 (대용량 PDF도 블록 단위로 읽음)."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def compute_corpus_fingerprint(
+    file_hashes: dict[str, str],
+    chunk_size: int = CHUNK_SIZE,
+    chunk_overlap: int = CHUNK_OVERLAP,
+    embedding_model: str | None = None,
+    extractor_id: str = "",
+    dedup_threshold: float = DEDUP_THRESHOLD,
+    boilerplate_ratio: float = BOILERPLATE_MIN_RATIO,
+    index_config: str | None = None,
+) -> str:
+    """코퍼스 fingerprint 계산.
+
+    파일명(청크 metadata의 source)과 내용 해시, 추출 백엔드, 청킹·반복 문구·중복 제거 설정, 임베딩 모델이
+    하나라도 바뀌면 다른 값이 나옵니다.
+
+    Args:
+        file_hashes: {파일명: 내용 해시}.
+        chunk_size: 청크당 최대 문자 수.
+        chunk_overlap: 인접 청크 간 겹치는 문자 수.
+        embedding_model: 임베딩 모델 식별자 (None이면 embedding_model_id(), 출력 차원 포함).
+        extractor_id: PDF 추출 백엔드 식별자 (PdfExtractor.extractor_id).
+        dedup_threshold: 준중복 청크 병합 임계값 (0이면 중복 제거 안 함).
+        boilerplate_ratio: 반복 머리말/꼬리말 판정 페이지 비율 (0이면 제거 안 함).
+        index_config: 검색 인덱스 구성 (None이면 index_spec()).
+
+    Returns:
+        16진수 SHA-256 fingerprint.
+    """
+    payload = {
+        "format": INDEX_FORMAT_VERSION,
+        "files": sorted(file_hashes.items()),
+        "chunk_size": chunk_size,
+        "chunk_overlap": chunk_overlap,
+        "embedding_model": embedding_model or embedding_model_id(),
+        "pdf_extractor": extractor_id,
+        "dedup_threshold": dedup_threshold,
+        "boilerplate_ratio": boilerplate_ratio,
+        "index": index_config or index_spec(),
+    }
+    raw = json.dumps(payload, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def read_manifest(index_dir: str | Path) -> dict | None:
+    """인덱스 폴더의 manifest를 읽음. 없거나 손상되었으면 None."""
+    manifest_path = Path(index_dir) / MANIFEST_FILENAME
+    if not manifest_path.exists():
+        return None
+    try:
+        with open(manifest_path, encoding="utf-8") as f:
+            return json.load(f)
+    except json.JSONDecodeError:
+        logger.warning("manifest 손상, 무시합니다: %s", manifest_path)
+        return None
+
+
+def index_data_dir(index_dir: str | Path, manifest: dict | None = None) -> Path:
+    """manifest가 가리키는 인덱스 파일 폴더 (버전 폴더가 없는 이전 manifest는 index_dir 자체).
+
+    Args:
+        index_dir: 인덱스 저장 폴더.
+        manifest: 이미 읽은 manifest. None이면 index_dir에서 읽음.
+    """
+    index_dir = Path(index_dir)
+    manifest = read_manifest(index_dir) if manifest is None else manifest
+    version = (manifest or {}).get("version")
+    return index_dir / version if version else index_dir
+
+
+def _write_json_atomic(path: Path, data: dict) -> None:
+    """임시 파일에 쓴 뒤 교체하여 동시 접근 시에도 반쯤 쓰인 파일이 보이지 않게 함.
+
+    Windows에서는 다른 프로세스가 읽는 중인 파일을 교체할 수 없으므로 잠시 뒤 다시 시도합니다.
+    """
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    for attempt in range(_REPLACE_RETRIES):
+        try:
+            os.replace(tmp_path, path)
+            return
+        except PermissionError:
+            if attempt == _REPLACE_RETRIES - 1:
+                raise
+            time.sleep(_REPLACE_RETRY_DELAY)
+
+
+def _remove_old_versions(index_dir: Path, keep: set[str]) -> None:
+    """keep보다 오래된 버전 폴더와 이전 레이아웃의 인덱스 파일 정리.
+
+    다른 세션이 아직 열어 둔 파일은(Windows) 지울 수 없으므로 남겨 두고 다음 저장 때 다시 시도합니다.
+    """
+    oldest_kept = min(keep)
+    for path in index_dir.glob(f"{_VERSION_PREFIX}*"):
+        if path.is_dir() and path.name not in keep and path.name < oldest_kept:
+            shutil.rmtree(path, ignore_errors=True)
+    for name in (f"{INDEX_NAME}.faiss", f"{INDEX_NAME}.pkl", CHUNK_STORE_FILENAME, LEXICAL_INDEX_FILENAME,
+                 ORIGINAL_VECTORS_FILENAME):
+        try:
+            (index_dir / name).unlink(missing_ok=True)
+        except PermissionError:
+            logger.debug("사용 중인 이전 인덱스 파일은 다음 저장 때 정리: %s", index_dir / name)
+
+
+def save_index(
+    vectorstore: FAISS,
+    index_dir: str | Path,
+    fingerprint: str,
+    file_hashes: dict[str, str],
+    file_chunks: dict[str, list[str]] | None = None,
+    deleted_since_compaction: int = 0,
+    extractor_id: str = "",
+    file_refs: dict[str, list[str]] | None = None,
+    embedding_model: str | None = None,
+    original_index: faiss.Index | None = None,
+) -> None:
+    """벡터스토어와 manifest를 디스크에 저장.
+
+    인덱스 파일은 새 버전 폴더에 기록하고 manifest는 마지막에 그 폴더를 가리키도록 교체하므로,
+    manifest의 fingerprint가 일치하면 인덱스 파일도 완전히 기록된 상태임이 보장되고,
+    이전 버전을 열어 둔 세션(메모리 매핑·SQLite)은 저장과 무관하게 옛 파일을 계속 읽습니다.
+    직전 버전보다 오래된 버전 폴더는 저장 후 정리합니다.
+    양자화 저장 인덱스이면 original_index의 원래 벡터도 함께 저장하여, 이후 증분 갱신이
+    기존 청크를 다시 임베딩하지 않게 합니다 (디스크는 float32 벡터만큼 더 쓰고, 검색용 인덱스만 작아짐).
+
+    Args:
+        vectorstore: 저장할 FAISS 벡터스토어.
+        index_dir: 인덱스 저장 폴더.
+        fingerprint: compute_corpus_fingerprint() 결과.
+        file_hashes: {파일명: 내용 해시}.
+        file_chunks: {파일명: 해당 파일의 청크 ID 목록}. 증분 인덱싱에서 삭제 대상 식별용.
+        deleted_since_compaction: 마지막 압축 이후 삭제된 벡터 수.
+        extractor_id: PDF 추출 백엔드 식별자.
+        file_refs: {파일명: 그 파일의 중복 청크가 병합된 다른 파일의 청크 ID 목록}.
+            병합 대상 청크가 삭제되면 해당 파일을 다시 처리하기 위해 기록.
+        embedding_model: 임베딩 식별자 (EmbeddingProvider.model_id). None이면 embedding_model_id().
+        original_index: optimize_index() 전의 float32 flat 인덱스 (같은 순서의 원래 벡터).
+            vectorstore.index가 양자화 저장일 때만 기록.
+    """
+    index_dir = Path(index_dir)
+    index_dir.mkdir(parents=True, exist_ok=True)
+    previous = read_manifest(index_dir)
+
+    version = f"{_VERSION_PREFIX}{datetime.now():%Y%m%dT%H%M%S%f}-{os.getpid()}"
+    data_dir = index_dir / version
+    data_dir.mkdir()
+    faiss.write_index(vectorstore.index, str(data_dir / f"{INDEX_NAME}.faiss"))
+    has_originals = original_index is not None and index_storage(vectorstore.index) != LOSSLESS_STORAGE
+    if has_originals:
+        faiss.write_index(original_index, str(data_dir / ORIGINAL_VECTORS_FILENAME))
+    write_chunk_store(data_dir / CHUNK_STORE_FILENAME, vectorstore)
+    # 같은 청크 집합으로 어휘 인덱스도 다시 만듦 (증분 갱신에서도 전체 재구축 — 임베딩 대비 비용이 작음)
+    BM25Index.from_vectorstore(vectorstore).save(data_dir / LEXICAL_INDEX_FILENAME)
+
+    _write_json_atomic(
+        index_dir / MANIFEST_FILENAME,
+        {
+            "fingerprint": fingerprint,
+            "version": version,
+            "format": INDEX_FORMAT_VERSION,
+            "embedding_model": embedding_model or embedding_model_id(),
+            "chunk_size": CHUNK_SIZE,
+            "chunk_overlap": CHUNK_OVERLAP,
+            "pdf_extractor": extractor_id,
+            "dedup_threshold": DEDUP_THRESHOLD,
+            "boilerplate_ratio": BOILERPLATE_MIN_RATIO,
+            "index": index_spec(),
+            "index_class": type(vectorstore.index).__name__,
+            "index_storage": index_storage(vectorstore.index),
+            "original_vectors": has_originals,
+            "files": file_hashes,
+            "file_chunks": file_chunks or {},
+            "file_refs": file_refs or {},
+            "deleted_since_compaction": deleted_since_compaction,
+            "chunks": vectorstore.index.ntotal,
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+        },
+    )
+    # 직전 버전은 방금 manifest를 읽은 세션이 아직 열고 있을 수 있으므로 남겨 둠
+    _remove_old_versions(index_dir, {version, (previous or {}).get("version") or version})
+    logger.info("인덱스 저장 완료: %s (%d개 청크)", data_dir, vectorstore.index.ntotal)
+
+
+def load_index(
+    index_dir: str | Path,
+    fingerprint: str,
+    embedding: Embeddings,
+    mmap: bool = INDEX_MMAP,
+    in_memory: bool = False,
+) -> FAISS | None:
+    """fingerprint가 일치하는 저장된 인덱스를 로드.
+
+    mmap=True이면 벡터를 메모리로 복사하지 않고 인덱스 파일을 읽기 전용으로 매핑하므로,
+    로드가 즉시 끝나고 검색에 실제로 쓰인 페이지만 디스크에서 읽힙니다.
+    같은 호스트의 여러 프로세스(Streamlit 레플리카)는 OS 페이지 캐시의 같은 사본을 공유합니다.
+    청크는 디스크 docstore(SqliteDocstore)에서 조회할 때만 읽습니다.
+    매핑된 인덱스와 디스크 docstore는 수정할 수 없으므로 벡터를 추가·삭제하려면 load_index_for_update()를 사용합니다.
+
+    Args:
+        index_dir: 인덱스 저장 폴더.
+        fingerprint: 현재 코퍼스의 fingerprint.
+        embedding: 질의 임베딩에 사용할 Embeddings 인스턴스.
+        mmap: 인덱스 파일을 메모리 매핑으로 열지 여부.
+        in_memory: 청크를 모두 메모리 docstore로 읽을지 여부 (청크를 수정하는 증분 인덱싱용).
+
+    Returns:
+        FAISS 벡터스토어. 인덱스가 없거나 fingerprint가 다르면 None.
+    """
+    index_dir = Path(index_dir)
+    manifest = read_manifest(index_dir)
+    if manifest is None:
+        return None
+    if manifest.get("fingerprint") != fingerprint:
+        logger.info("인덱스 fingerprint 불일치, 재구축 필요: %s", index_dir)
+        return None
+
+    data_dir = index_data_dir(index_dir, manifest)
+    try:
+        index = _read_faiss_index(data_dir, mmap)
+        chunk_store = SqliteDocstore(data_dir / CHUNK_STORE_FILENAME)
+        if in_memory:
+            docstore, index_to_docstore_id = chunk_store.to_memory()
+            chunk_store.close()
+        else:
+            docstore, index_to_docstore_id = chunk_store, chunk_store.index_to_docstore_id
+    except Exception as e:
+        logger.warning("저장된 인덱스 로드 실패, 재구축합니다: %s", e)
+        return None
+
+    vectorstore = FAISS(embedding, index, docstore, index_to_docstore_id)
+    logger.info(
+        "저장된 인덱스 로드: %s (%s, %d개 청크%s)",
+        data_dir,
+        type(index).__name__,
+        index.ntotal,
+        ", 메모리 매핑" if mmap and _MMAP_FLAGS else "",
+    )
+    return vectorstore
+
+
+def load_lexical_index(index_dir: str | Path) -> BM25Index | None:
+    """인덱스 폴더에 저장된 BM25 어휘 인덱스. 없으면 None."""
+    return BM25Index.load(index_data_dir(index_dir) / LEXICAL_INDEX_FILENAME)
+
+
+def reopen_saved_index(vectorstore: FAISS, index_dir: str | Path) -> None:
+    """방금 저장한 인덱스를 조회용으로 다시 열어 vectorstore의 인덱스와 docstore를 교체.
+
+    구축·갱신한 프로세스도 메모리의 청크·벡터 사본을 버리고, 다른 프로세스와 같이
+    디스크 docstore와 (INDEX_MMAP이면) 메모리 매핑된 인덱스를 쓰게 합니다.
+    이전에 열어 둔 디스크 docstore는 닫아 이전 버전 폴더를 정리할 수 있게 합니다.
+
+    Args:
+        vectorstore: save_index()로 index_dir에 저장한 FAISS 벡터스토어.
+        index_dir: 인덱스 저장 폴더.
+    """
+    data_dir = index_data_dir(index_dir)
+    if INDEX_MMAP and _MMAP_FLAGS:
+        vectorstore.index = _read_faiss_index(data_dir, mmap=True)
+    chunk_store = SqliteDocstore(data_dir / CHUNK_STORE_FILENAME)
+    close_vectorstore(vectorstore)
+    vectorstore.docstore = chunk_store
+    vectorstore.index_to_docstore_id = chunk_store.index_to_docstore_id
+
+
+def close_vectorstore(vectorstore: FAISS | None) -> None:
+    """벡터스토어가 연 디스크 docstore의 파일 핸들을 닫음.
+
+    열린 SQLite 파일은 Windows에서 교체·삭제할 수 없으므로, 더 쓰지 않는 벡터스토어는 닫아 둡니다.
+    닫은 뒤에는 청크를 조회할 수 없습니다.
+    """
+    if vectorstore is not None and isinstance(vectorstore.docstore, SqliteDocstore):
+        vectorstore.docstore.close()
+
+
+def _read_faiss_index(data_dir: Path, mmap: bool) -> faiss.Index:
+    """인덱스 파일을 읽고 검색 파라미터를 적용."""
+    flags = _MMAP_FLAGS if mmap else 0
+    index = faiss.read_index(str(data_dir / f"{INDEX_NAME}.faiss"), flags)
+    apply_search_params(index)
+    return index
+
+
+def load_index_for_update(
+    index_dir: str | Path,
+    embedding: Embeddings,
+    extractor_id: str = "",
+    embedding_model: str | None = None,
+) -> tuple[FAISS, dict] | None:
+    """증분 인덱싱용으로 저장된 인덱스를 fingerprint와 무관하게 로드.
+
+    파일 구성은 달라도 되지만, 추출 백엔드와 청킹·반복 문구·중복 제거 설정, 임베딩 모델이 현재 설정과 같아야
+    기존 벡터를 재사용할 수 있습니다. 양자화 저장(float16/int8)된 인덱스는 함께 저장된 원래 벡터
+    (ORIGINAL_VECTORS_FILENAME)로 갱신하므로 저장 형식이 바뀌어도 재임베딩하지 않습니다.
+    원래 벡터가 없는 이전 인덱스는 INDEX_STORAGE가 바뀌었으면 재사용하지 않고(전체 재구축),
+    같으면 청크를 다시 임베딩해 원래 벡터로 복원합니다(_flat_copy()).
+
+    Args:
+        index_dir: 인덱스 저장 폴더.
+        embedding: 질의 임베딩에 사용할 Embeddings 인스턴스.
+        extractor_id: 현재 PDF 추출 백엔드 식별자.
+        embedding_model: 현재 임베딩 식별자. None이면 embedding_model_id().
+
+    Returns:
+        (FAISS 벡터스토어, manifest). 재사용할 수 없으면 None.
+    """
+    manifest = read_manifest(index_dir)
+    if manifest is None or "file_chunks" not in manifest:
+        return None
+
+    expected = {
+        "format": INDEX_FORMAT_VERSION,
+        "embedding_model": embedding_model or embedding_model_id(),
+        "chunk_size": CHUNK_SIZE,
+        "chunk_overlap": CHUNK_OVERLAP,
+        "pdf_extractor": extractor_id,
+        "dedup_threshold": DEDUP_THRESHOLD,
+        "boilerplate_ratio": BOILERPLATE_MIN_RATIO,
+    }
+    if any(manifest.get(k) != v for k, v in expected.items()):
+        logger.info("인덱스 설정이 변경되어 증분 인덱싱 불가: %s", index_dir)
+        return None
+    # 원래 벡터 없이 양자화된 벡터를 다른 저장 형식으로 옮기면 손실이 남으므로 원본 임베딩으로 다시 구축
+    stored_storage = manifest.get("index_storage", _spec_storage(manifest.get("index", "")))
+    originals_path = index_data_dir(index_dir, manifest) / ORIGINAL_VECTORS_FILENAME
+    has_originals = manifest.get("original_vectors", False) and originals_path.exists()
+    if stored_storage != LOSSLESS_STORAGE and stored_storage != INDEX_STORAGE and not has_originals:
+        logger.info(
+            "벡터 저장 형식 변경(%s → %s), 양자화된 벡터는 재사용하지 않고 재구축: %s",
+            stored_storage,
+            INDEX_STORAGE,
+            index_dir,
+        )
+        return None
+
+    # 매핑된 인덱스와 디스크 docstore는 수정할 수 없으므로 메모리로 읽음
+    vectorstore = load_index(index_dir, manifest["fingerprint"], embedding, mmap=False, in_memory=True)
+    if vectorstore is None:
+        return None
+    # 근사 인덱스는 벡터 삭제를 지원하지 않을 수 있으므로 갱신은 float32 flat 인덱스에서 수행
+    if has_originals:
+        originals = faiss.read_index(str(originals_path))
+        if originals.ntotal == vectorstore.index.ntotal:
+            vectorstore.index = originals
+        else:
+            logger.warning("원래 벡터 파일의 벡터 수가 인덱스와 달라 무시합니다: %s", originals_path)
+    if not isinstance(vectorstore.index, faiss.IndexFlat):
+        vectorstore.index = _flat_copy(vectorstore)
+    return vectorstore, manifest
+
+
+def needs_compaction(deleted_since_compaction: int, ntotal: int) -> bool:
+    """삭제 누적량이 INDEX_COMPACT_RATIO를 넘었는지 판단."""
+    return deleted_since_compaction > INDEX_COMPACT_RATIO * max(ntotal, 1)
+
+
+def compact_index(vectorstore: FAISS) -> None:
+    """남은 벡터만으로 FAISS 인덱스를 새로 만들어 교체.
+
+    remove_ids()는 벡터를 지워도 내부 버퍼 용량을 줄이지 않으므로,
+    삭제가 누적되면 남은 벡터를 복원해 다시 적재합니다 (_flat_copy()).
+    결과는 인덱스 종류·저장 형식과 무관하게 항상 float32 flat 인덱스이므로,
+    저장 전에 optimize_index()로 설정된 종류·저장 형식으로 다시 변환해야 합니다.
+
+    Args:
+        vectorstore: 압축할 FAISS 벡터스토어 (index를 제자리 교체).
+    """
+    vectorstore.index = _flat_copy(vectorstore)
+    logger.info("인덱스 압축 완료: %d개 벡터", vectorstore.index.ntotal)
+
+
+def index_storage(index: faiss.Index) -> str:
+    """인덱스의 벡터 저장 형식 ("float32" | "float16" | "int8")."""
+    if isinstance(index, faiss.IndexHNSW):
+        index = faiss.downcast_index(index.storage)
+    if isinstance(index, (faiss.IndexScalarQuantizer, faiss.IndexIVFScalarQuantizer)):
+        qtype = index.sq.qtype
+        return next((name for name, sq_type in _SQ_TYPES.items() if sq_type == qtype), f"sq{qtype}")
+    return LOSSLESS_STORAGE
+
+
+def _spec_storage(spec: str) -> str:
+    """index_spec() 문자열의 저장 형식 (index_storage가 없는 이전 manifest용)."""
+    storage = spec.rpartition("/")[2]
+    return storage if storage in _SQ_TYPES else LOSSLESS_STORAGE
+
+
+def _flat_copy(vectorstore: FAISS) -> faiss.IndexFlat:
+    """벡터스토어 인덱스의 벡터를 같은 순서의 새 float32 flat 인덱스로 복사.
+
+    float32 저장이면 저장된 벡터를 그대로 복원하고, 양자화 저장이면 복원값이 원래 벡터와 다르므로
+    (압축·갱신을 반복할수록 오차 누적) 청크를 다시 임베딩합니다 — 임베딩 캐시가 있으면 API 호출 없음.
+    저장된 인덱스의 갱신은 원래 벡터 파일을 쓰므로, 재임베딩은 원래 벡터가 없는 이전 인덱스에만 해당합니다.
+    """
+    index = vectorstore.index
+    flat = faiss.IndexFlat(index.d, index.metric_type)
+    if index.ntotal == 0:
+        return flat
+    if index_storage(index) == LOSSLESS_STORAGE:
+        flat.add(index.reconstruct_n(0, index.ntotal))
+        return flat
+
+    logger.info("양자화 인덱스(%s)의 원래 벡터를 재임베딩으로 복원: %d개 청크", index_storage(index), index.ntotal)
+    texts = [
+        vectorstore.docstore.search(vectorstore.index_to_docstore_id[pos]).page_content
+        for pos in range(index.ntotal)
+    ]
+    vectors = np.asarray(vectorstore.embeddings.embed_documents(texts), dtype=np.float32)
+    if vectorstore._normalize_L2:
+        faiss.normalize_L2(vectors)
+    flat.add(vectors)
+    return flat
+
+
+def index_spec(index_type: str = INDEX_TYPE, storage: str = INDEX_STORAGE) -> str:
+    """fingerprint·manifest용 검색 인덱스 구성 문자열 (검색 시점 파라미터 제외).
+
+    Raises:
+        ValueError: 알 수 없는 index_type 또는 storage인 경우.
+    """
+    if index_type not in INDEX_TYPES:
+        raise ValueError(f"알 수 없는 인덱스 종류: '{index_type}' (사용 가능: {', '.join(INDEX_TYPES)})")
+    if storage not in INDEX_STORAGES:
+        raise ValueError(f"알 수 없는 벡터 저장 형식: '{storage}' (사용 가능: {', '.join(INDEX_STORAGES)})")
+    if index_type == "hnsw":
+        spec = f"hnsw:M={INDEX_HNSW_M},efC={INDEX_HNSW_EF_CONSTRUCTION},min={INDEX_ANN_MIN_VECTORS}"
+    elif index_type == "ivf":
+        spec = f"ivf:nlist={INDEX_IVF_NLIST or 'auto'},min={INDEX_ANN_MIN_VECTORS}"
+    else:
+        spec = "flat"
+    return spec if storage == "float32" else f"{spec}/{storage}"
+
+
+def _auto_nlist(ntotal: int) -> int:
+    """벡터 수 기준 IVF 클러스터 수 (약 4√n, 학습 데이터가 충분한 범위로 제한)."""
+    return max(1, min(int(4 * np.sqrt(ntotal)), ntotal // _IVF_MIN_POINTS_PER_CLUSTER))
+
+
+def build_search_index(
+    vectors: np.ndarray,
+    metric_type: int = faiss.METRIC_L2,
+    index_type: str = INDEX_TYPE,
+    storage: str = INDEX_STORAGE,
+    min_vectors: int = INDEX_ANN_MIN_VECTORS,
+    hnsw_m: int = INDEX_HNSW_M,
+    ef_construction: int = INDEX_HNSW_EF_CONSTRUCTION,
+    nlist: int = INDEX_IVF_NLIST,
+) -> faiss.Index:
+    """벡터로 검색 인덱스를 구축.
+
+    Args:
+        vectors: (n, d) float32 벡터. 인덱스 내 순서는 입력 순서와 같음.
+        metric_type: faiss 거리 척도.
+        index_type: "flat" | "hnsw" | "ivf".
+        storage: 벡터 저장 형식 "float32" | "float16" | "int8".
+        min_vectors: 이보다 벡터가 적으면 index_type과 무관하게 flat.
+        hnsw_m: HNSW 그래프 이웃 수.
+        ef_construction: HNSW 구축 시 탐색 폭.
+        nlist: IVF 클러스터 수. 0이면 자동.
+
+    Returns:
+        검색 파라미터(efSearch/nprobe)가 설정된 faiss 인덱스.
+
+    Raises:
+        ValueError: 알 수 없는 index_type 또는 storage인 경우.
+    """
+    index_spec(index_type, storage)
+
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    ntotal, dim = vectors.shape
+    sq_type = _SQ_TYPES.get(storage)
+    if index_type == "flat" or ntotal < min_vectors:
+        if sq_type is None:
+            index = faiss.IndexFlat(dim, metric_type)
+        else:
+            index = faiss.IndexScalarQuantizer(dim, sq_type, metric_type)
+    elif index_type == "hnsw":
+        if sq_type is None:
+            index = faiss.IndexHNSWFlat(dim, hnsw_m, metric_type)
+        else:
+            index = faiss.IndexHNSWSQ(dim, sq_type, hnsw_m, metric_type)
+        index.hnsw.efConstruction = ef_construction
+    else:
+        quantizer = faiss.IndexFlat(dim, metric_type)
+        nlist = nlist or _auto_nlist(ntotal)
+        if sq_type is None:
+            index = faiss.IndexIVFFlat(quantizer, dim, nlist, metric_type)
+        else:
+            index = faiss.IndexIVFScalarQuantizer(quantizer, dim, nlist, sq_type, metric_type)
+
+    # IVF 클러스터와 int8 양자화 범위 학습 (flat/float16은 학습이 필요 없음)
+    if not index.is_trained:
+        index.train(vectors)
+    index.add(vectors)
+    if isinstance(index, faiss.IndexIVF):
+        # 증분 갱신·압축 시 reconstruct_n()으로 벡터를 복원하기 위해 필요
+        index.make_direct_map()
+
+    apply_search_params(index)
+    return index
+
+
+def apply_search_params(
+    index: faiss.Index,
+    ef_search: int = INDEX_HNSW_EF_SEARCH,
+    nprobe: int = INDEX_IVF_NPROBE,
+) -> None:
+    """근사 인덱스의 검색 시점 파라미터 설정 (재구축 없이 정확도/속도 조절)."""
+    if isinstance(index, faiss.IndexHNSW):
+        index.hnsw.efSearch = ef_search
+    elif isinstance(index, faiss.IndexIVF):
+        index.nprobe = min(nprobe, index.nlist)
+
+
+def filtered_search_params(index: faiss.Index, positions: np.ndarray) -> faiss.SearchParameters:
+    """지정한 인덱스 위치의 벡터만 검색하는 파라미터 (메타데이터 사전 필터).
+
+    flat 인덱스는 제외된 벡터의 거리를 계산하지 않으며, 근사 인덱스는 현재 efSearch/nprobe를 유지합니다.
+
+    Args:
+        index: 검색할 FAISS 인덱스.
+        positions: 검색 대상 벡터의 인덱스 위치 (int64).
+
+    Returns:
+        index.search(..., params=)에 넘길 SearchParameters.
+    """
+    selector = faiss.IDSelectorBatch(np.ascontiguousarray(positions, dtype=np.int64))
+    if isinstance(index, faiss.IndexHNSW):
+        return faiss.SearchParametersHNSW(sel=selector, efSearch=index.hnsw.efSearch)
+    if isinstance(index, faiss.IndexIVF):
+        return faiss.SearchParametersIVF(sel=selector, nprobe=index.nprobe)
+    return faiss.SearchParameters(sel=selector)
+
+
+def distances_to_similarity(index: faiss.Index, distances: np.ndarray) -> np.ndarray:
+    """index.search()가 반환한 거리를 코사인 유사도로 변환.
+
+    L2 인덱스의 거리는 제곱 거리이며, 단위 벡터이면 ‖a−b‖² = 2 − 2·cos이므로 1 − d/2가 코사인 유사도입니다.
+    내적 인덱스는 거리가 곧 유사도입니다.
+    """
+    if index.metric_type == faiss.METRIC_INNER_PRODUCT:
+        return distances
+    return 1.0 - distances / 2.0
+
+
+def optimize_index(
+    vectorstore: FAISS,
+    index_type: str = INDEX_TYPE,
+    storage: str = INDEX_STORAGE,
+) -> bool:
+    """flat 인덱스를 설정된 검색 인덱스 종류·벡터 저장 형식으로 변환.
+
+    Args:
+        vectorstore: 변환할 FAISS 벡터스토어 (index를 제자리 교체).
+        index_type: "flat" | "hnsw" | "ivf".
+        storage: 벡터 저장 형식 "float32" | "float16" | "int8".
+
+    Returns:
+        인덱스를 새로 만들었으면 True (float32 flat 유지이면 False).
+
+    Raises:
+        ValueError: 알 수 없는 index_type 또는 storage인 경우.
+    """
+    index_spec(index_type, storage)
+    index = vectorstore.index
+    if (index_type == "flat" or index.ntotal < INDEX_ANN_MIN_VECTORS) and storage == "float32":
+        return False
+    started = time.perf_counter()
+    vectorstore.index = build_search_index(
+        index.reconstruct_n(0, index.ntotal), index.metric_type, index_type, storage
+    )
+    logger.info(
+        "검색 인덱스 변환: %s (%d개 벡터, %.1f초)",
+        type(vectorstore.index).__name__,
+        vectorstore.index.ntotal,
+        time.perf_counter() - started,
+    )
+    return True
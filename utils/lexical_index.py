@@ -0,0 +1,228 @@
+"""로컬 BM25 어휘 검색 인덱스와 Reciprocal Rank Fusion.
+
+약품명·임상시험명(POLARIX, GO29365)·수치 같은 정확한 용어는 임베딩보다 어휘 검색이 잘 찾고,
+질의 임베딩 API 호출도 필요 없습니다. 한국어는 띄어쓰기·조사가 불규칙하므로 글자 bigram,
+영문·숫자는 단어 단위로 토큰화합니다. 인덱스는 FAISS 인덱스 옆에 저장됩니다.
+"""
+
+import logging
+import math
+import os
+import re
+import unicodedata
+from collections import Counter
+from collections.abc import Iterable
+from pathlib import Path
+
+import numpy as np
+from langchain_community.vectorstores import FAISS
+
+from config.settings import BM25_B, BM25_K1, RRF_K
+
+logger = logging.getLogger(__name__)
+
+LEXICAL_INDEX_FILENAME = "lexical.npz"
+
+# 한글 음절 연속 구간 | 영문·숫자 단어 (소수점 포함, 예: 2.5)
+_TOKEN_RE = re.compile(r"[가-힣]+|[a-z0-9]+(?:\.[0-9]+)?")
+
+
+def tokenize(text: str) -> list[str]:
+    """한글은 글자 bigram(한 글자 단어는 그대로), 영문·숫자는 소문자 단어로 토큰화."""
+    text = unicodedata.normalize("NFKC", text).lower()
+    tokens: list[str] = []
+    for match in _TOKEN_RE.finditer(text):
+        word = match.group()
+        if "가" <= word[0] <= "힣" and len(word) > 1:
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+        else:
+            tokens.append(word)
+    return tokens
+
+
+class BM25Index:
+    """청크 ID 단위 BM25 역색인 (CSR 형식 posting 배열)."""
+
+    def __init__(
+        self,
+        doc_ids: list[str],
+        vocab: list[str],
+        indptr: np.ndarray,
+        postings: np.ndarray,
+        tfs: np.ndarray,
+        doc_len: np.ndarray,
+        k1: float = BM25_K1,
+        b: float = BM25_B,
+    ) -> None:
+        """BM25Index 초기화. 보통 build() 또는 load()로 생성합니다.
+
+        Args:
+            doc_ids: 문서 번호 → 청크 ID (docstore ID).
+            vocab: 용어 번호 → 토큰.
+            indptr: 용어 t의 posting이 postings[indptr[t]:indptr[t+1]]에 있음.
+            postings: 용어별로 모인 문서 번호.
+            tfs: postings와 같은 위치의 용어 빈도.
+            doc_len: 문서별 토큰 수.
+            k1: 용어 빈도 포화 파라미터.
+            b: 문서 길이 정규화 파라미터.
+        """
+        self.doc_ids = doc_ids
+        self._vocab = {term: i for i, term in enumerate(vocab)}
+        self._indptr = indptr
+        self._postings = postings
+        self._tfs = tfs
+        self._doc_len = doc_len
+        self._k1 = k1
+        avgdl = float(doc_len.mean()) if len(doc_len) else 1.0
+        # 질의마다 반복되는 길이 정규화 항을 미리 계산
+        self._norm = (k1 * (1 - b + b * doc_len / max(avgdl, 1.0))).astype(np.float32)
+        self._doc_index: dict[str, int] | None = None
+
+    def __len__(self) -> int:
+        return len(self.doc_ids)
+
+    @classmethod
+    def build(cls, documents: Iterable[tuple[str, str]]) -> "BM25Index":
+        """(청크 ID, 텍스트) 목록으로 인덱스 구축."""
+        doc_ids: list[str] = []
+        vocab: dict[str, int] = {}
+        term_ids: list[int] = []
+        doc_idx: list[int] = []
+        tfs: list[int] = []
+        doc_len: list[int] = []
+        for doc_id, text in documents:
+            counts = Counter(tokenize(text))
+            for term, tf in counts.items():
+                term_ids.append(vocab.setdefault(term, len(vocab)))
+                doc_idx.append(len(doc_ids))
+                tfs.append(tf)
+            doc_len.append(sum(counts.values()))
+            doc_ids.append(doc_id)
+
+        term_array = np.asarray(term_ids, dtype=np.int64)
+        order = np.argsort(term_array, kind="stable")
+        indptr = np.zeros(len(vocab) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(term_array, minlength=len(vocab)), out=indptr[1:])
+        return cls(
+            doc_ids,
+            list(vocab),
+            indptr,
+            np.asarray(doc_idx, dtype=np.int32)[order],
+            np.asarray(tfs, dtype=np.float32)[order],
+            np.asarray(doc_len, dtype=np.float32),
+        )
+
+    @classmethod
+    def from_vectorstore(cls, vectorstore: FAISS) -> "BM25Index":
+        """FAISS 벡터스토어의 docstore에 있는 모든 청크로 인덱스 구축."""
+        return cls.build(
+            (doc_id, vectorstore.docstore.search(doc_id).page_content)
+            for doc_id in vectorstore.index_to_docstore_id.values()
+        )
+
+    def matches(self, vectorstore: FAISS) -> bool:
+        """벡터스토어와 같은 청크 집합으로 만든 인덱스인지 확인."""
+        ids = vectorstore.index_to_docstore_id.values()
+        return len(ids) == len(self.doc_ids) and set(ids) == set(self.doc_ids)
+
+    def mask(self, doc_ids: Iterable[str]) -> np.ndarray:
+        """청크 ID 집합에 속한 문서만 True인 배열 (search()의 mask 인자)."""
+        if self._doc_index is None:
+            self._doc_index = {doc_id: i for i, doc_id in enumerate(self.doc_ids)}
+        mask = np.zeros(len(self.doc_ids), dtype=bool)
+        mask[[self._doc_index[d] for d in doc_ids if d in self._doc_index]] = True
+        return mask
+
+    def search(self, query: str, k: int, mask: np.ndarray | None = None) -> list[tuple[str, float]]:
+        """BM25 점수 상위 k개 청크.
+
+        Args:
+            query: 질의 텍스트.
+            k: 반환할 청크 수.
+            mask: mask()로 만든 검색 대상 표시. None이면 모든 청크.
+
+        Returns:
+            [(청크 ID, 점수)] 점수 내림차순. 질의 토큰이 하나도 없는 청크는 제외.
+        """
+        n = len(self.doc_ids)
+        if k <= 0 or n == 0:
+            return []
+        scores = np.zeros(n, dtype=np.float32)
+        for term, query_tf in Counter(tokenize(query)).items():
+            t = self._vocab.get(term)
+            if t is None:
+                continue
+            start, end = self._indptr[t], self._indptr[t + 1]
+            docs, tf = self._postings[start:end], self._tfs[start:end]
+            df = end - start
+            idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+            scores[docs] += query_tf * idf * tf * (self._k1 + 1) / (tf + self._norm[docs])
+        if mask is not None:
+            scores[~mask] = 0.0
+
+        hits = np.flatnonzero(scores)
+        if len(hits) > k:
+            hits = hits[np.argpartition(-scores[hits], k - 1)[:k]]
+        hits = hits[np.argsort(-scores[hits], kind="stable")]
+        return [(self.doc_ids[i], float(scores[i])) for i in hits]
+
+    def save(self, path: str | Path) -> None:
+        """인덱스를 .npz 파일로 저장 (임시 파일에 쓴 뒤 교체)."""
+        path = Path(path)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            np.savez(
+                f,
+                doc_ids=np.array(self.doc_ids, dtype=str),
+                vocab=np.array(list(self._vocab), dtype=str),
+                indptr=self._indptr,
+                postings=self._postings,
+                tfs=self._tfs,
+                doc_len=self._doc_len,
+            )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str | Path) -> "BM25Index | None":
+        """저장된 인덱스를 로드. 없거나 손상되었으면 None."""
+        path = Path(path)
+        if not path.exists():
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                return cls(
+                    data["doc_ids"].tolist(),
+                    data["vocab"].tolist(),
+                    data["indptr"],
+                    data["postings"],
+                    data["tfs"],
+                    data["doc_len"],
+                )
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning("어휘 인덱스 로드 실패, 무시합니다: %s (%s)", path, e)
+            return None
+
+
+def reciprocal_rank_fusion(rankings: list[list[str]], k: int, rrf_k: int = RRF_K) -> list[str]:
+    """여러 검색 결과 순위를 Reciprocal Rank Fusion으로 결합.
+
+    점수 척도가 다른 검색 결과(벡터 거리, BM25 점수)를 순위만으로 합칩니다.
+
+    Args:
+        rankings: 검색별 청크 ID 목록 (관련도 내림차순).
+        k: 반환할 청크 수.
+        rrf_k: 하위 순위의 영향력을 줄이는 상수 (클수록 순위 간 차이가 완만).
+
+    Returns:
+        결합 점수 상위 k개 청크 ID. 점수가 같으면 먼저 나온 순서 유지.
+    """
+    return [doc_id for doc_id, _ in reciprocal_rank_fusion_scores(rankings, rrf_k)[:k]]
+
+
+def reciprocal_rank_fusion_scores(rankings: list[list[str]], rrf_k: int = RRF_K) -> list[tuple[str, float]]:
+    """reciprocal_rank_fusion()의 결합 점수 — [(청크 ID, RRF 점수)] 점수 내림차순."""
+    scores: dict[str, float] = {}
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking, start=1):
+            scores[doc_id] = scores.get(doc_id, 0.0) + 1.0 / (rrf_k + rank)
+    return sorted(scores.items(), key=lambda item: -item[1])
@@ -0,0 +1,171 @@
+"""PDF 텍스트 추출 백엔드.
+
+기본 백엔드는 PyPDF2이며, pymupdf / pypdfium2 / pdfplumber가 설치되어 있으면
+PDF_EXTRACTOR 설정이나 products.json의 "pdf_extractor"로 선택할 수 있습니다.
+백엔드별 속도·메모리·빈 페이지 비율은 benchmarks/pdf_extractors.py로 비교합니다.
+"""
+
+import importlib
+import logging
+from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+
+import PyPDF2
+
+from config.settings import PDF_EXTRACTOR
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EXTRACTOR = "pypdf2"
+
+
+class PdfExtractor(ABC):
+    """PDF 텍스트 추출 백엔드 기본 클래스.
+
+    상태를 갖지 않으므로 프로세스 풀 워커로 그대로 전달할 수 있습니다.
+    """
+
+    # 설정값으로 쓰는 백엔드 이름
+    name: str = ""
+    # 설치 여부와 버전 확인에 쓰는 배포 패키지명
+    distribution: str = ""
+    # import할 모듈명 (배포 메타데이터가 없을 때 __version__으로 버전 확인)
+    module: str = ""
+    # 추출 로직이 바뀌면 올려서 페이지 텍스트 캐시를 무효화
+    revision: int = 1
+
+    @classmethod
+    def package_version(cls) -> str | None:
+        """백엔드 패키지 버전. 설치되지 않았으면 None.
+
+        PyInstaller exe처럼 배포 메타데이터가 없는 환경에서는 모듈의 __version__을 쓰고,
+        그것도 없으면 "unknown"을 반환합니다.
+        """
+        try:
+            return version(cls.distribution)
+        except PackageNotFoundError:
+            pass
+        try:
+            module = importlib.import_module(cls.module)
+        except ImportError:
+            return None
+        return str(getattr(module, "__version__", "unknown"))
+
+    @classmethod
+    def is_available(cls) -> bool:
+        """백엔드 패키지가 설치되어 있는지 여부."""
+        return cls.package_version() is not None
+
+    @property
+    def extractor_id(self) -> str:
+        """페이지 텍스트 캐시·인덱스 fingerprint에 쓰는 식별자 (이름-버전-리비전)."""
+        return f"{self.name}-{self.package_version() or 'unknown'}-v{self.revision}"
+
+    @abstractmethod
+    def iter_page_texts(self, file_path: str | Path) -> Iterator[str]:
+        """페이지 순서대로 원문 텍스트를 하나씩 반환 (텍스트가 없는 페이지는 빈 문자열)."""
+
+
+class PyPDF2Extractor(PdfExtractor):
+    """PyPDF2 백엔드 (순수 파이썬, 기본값)."""
+
+    name = "pypdf2"
+    distribution = "PyPDF2"
+    module = "PyPDF2"
+
+    def iter_page_texts(self, file_path: str | Path) -> Iterator[str]:
+        with open(file_path, "rb") as f:
+            reader = PyPDF2.PdfReader(f)
+            for page in reader.pages:
+                yield page.extract_text() or ""
+
+
+class PyMuPDFExtractor(PdfExtractor):
+    """PyMuPDF(MuPDF) 백엔드."""
+
+    name = "pymupdf"
+    distribution = "pymupdf"
+    module = "pymupdf"
+
+    def iter_page_texts(self, file_path: str | Path) -> Iterator[str]:
+        pymupdf = importlib.import_module("pymupdf")
+        with pymupdf.open(str(file_path)) as doc:
+            for page in doc:
+                yield page.get_text()
+
+
+class PdfiumExtractor(PdfExtractor):
+    """pypdfium2(PDFium) 백엔드."""
+
+    name = "pypdfium2"
+    distribution = "pypdfium2"
+    module = "pypdfium2"
+
+    def iter_page_texts(self, file_path: str | Path) -> Iterator[str]:
+        pdfium = importlib.import_module("pypdfium2")
+        pdf = pdfium.PdfDocument(str(file_path))
+        try:
+            for i in range(len(pdf)):
+                page = pdf[i]
+                textpage = page.get_textpage()
+                try:
+                    yield textpage.get_text_range()
+                finally:
+                    textpage.close()
+                    page.close()
+        finally:
+            pdf.close()
+
+
+class PdfPlumberExtractor(PdfExtractor):
+    """pdfplumber(pdfminer.six) 백엔드 — 느리지만 표·다단 레이아웃에 강함."""
+
+    name = "pdfplumber"
+    distribution = "pdfplumber"
+    module = "pdfplumber"
+
+    def iter_page_texts(self, file_path: str | Path) -> Iterator[str]:
+        pdfplumber = importlib.import_module("pdfplumber")
+        with pdfplumber.open(str(file_path)) as pdf:
+            for page in pdf.pages:
+                yield page.extract_text() or ""
+                # 페이지별 파싱 캐시를 비워 대용량 PDF에서도 메모리가 누적되지 않게 함
+                page.flush_cache()
+
+
+EXTRACTORS: dict[str, type[PdfExtractor]] = {
+    cls.name: cls
+    for cls in (PyPDF2Extractor, PyMuPDFExtractor, PdfiumExtractor, PdfPlumberExtractor)
+}
+
+
+def available_extractors() -> list[str]:
+    """설치되어 사용 가능한 백엔드 이름 목록."""
+    return [name for name, cls in EXTRACTORS.items() if cls.is_available()]
+
+
+def get_extractor(name: str | None = None) -> PdfExtractor:
+    """이름으로 추출 백엔드를 선택.
+
+    Args:
+        name: 백엔드 이름. None이면 PDF_EXTRACTOR 설정값.
+
+    Returns:
+        PdfExtractor 인스턴스. 설치되지 않은 백엔드이면 경고 후 PyPDF2 백엔드.
+
+    Raises:
+        ValueError: 알 수 없는 백엔드 이름인 경우.
+    """
+    name = (name or PDF_EXTRACTOR).lower()
+    if name not in EXTRACTORS:
+        raise ValueError(
+            f"알 수 없는 PDF 추출 백엔드: '{name}' "
+            f"(사용 가능: {', '.join(EXTRACTORS)})"
+        )
+    cls = EXTRACTORS[name]
+    if not cls.is_available():
+        logger.warning("PDF 추출 백엔드 '%s'가 설치되어 있지 않아 %s를 사용합니다.", name, DEFAULT_EXTRACTOR)
+        cls = EXTRACTORS[DEFAULT_EXTRACTOR]
+    return cls()
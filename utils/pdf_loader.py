@@ -1,24 +1,104 @@
-"""PDF 텍스트 추출, 청킹, FAISS 벡터스토어 빌드."""
+"""PDF 텍스트 추출, 청킹, FAISS 벡터스토어 빌드.
+
+인덱스 구축은 페이지 → 청크 → 임베딩 배치 → 인덱스 추가의 스트리밍 파이프라인으로,
+구축 중 메모리 사용량은 코퍼스 크기가 아니라 INDEX_BATCH_CHUNKS에 비례합니다.
+"""
 
 import logging
+import math
+import re
+import tempfile
+from collections import Counter, deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from functools import partial
 from pathlib import Path
 
-import PyPDF2
 from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain_community.vectorstores import FAISS
-from langchain_google_genai import GoogleGenerativeAIEmbeddings
 
-from config.settings import CHUNK_OVERLAP, CHUNK_SIZE, EMBEDDING_MODEL
+from config.settings import (
+    BOILERPLATE_MIN_RATIO,
+    CHUNK_OVERLAP,
+    CHUNK_SIZE,
+    INDEX_BATCH_CHUNKS,
+    PDF_WORKERS,
+)
+from utils.dedup import MinHashDeduplicator, add_provenance, create_deduplicator, remove_provenance
+from utils.embedding_cache import get_embedding_cache
+from utils.embedding_pipeline import BatchedEmbeddings
+from utils.embedding_providers import get_embedding_provider
+from utils.pdf_extractors import PdfExtractor, get_extractor
+from utils.text_store import PageTextStore, get_text_store
+from utils.index_store import (
+    compact_index,
+    compute_corpus_fingerprint,
+    file_content_hash,
+    load_index,
+    load_index_for_update,
+    reopen_saved_index,
+    needs_compaction,
+    optimize_index,
+    save_index,
+)
 
 logger = logging.getLogger(__name__)
 
 
-def extract_text_from_pdf(file_path: str | Path) -> list[Document]:
+def iter_pdf_pages(
+    file_path: str | Path,
+    extractor: PdfExtractor | None = None,
+) -> Iterator[Document]:
+    """PDF 파일에서 페이지별 텍스트를 하나씩 추출하는 제너레이터.
+
+    텍스트가 없는 페이지(스캔 이미지 등)는 경고 후 건너뜁니다.
+
+    Args:
+        file_path: PDF 파일 경로.
+        extractor: 추출 백엔드. None이면 PDF_EXTRACTOR 설정값.
+
+    Yields:
+        페이지 Document. metadata에 source, page 포함.
+    """
+    file_path = Path(file_path)
+    extractor = extractor or get_extractor()
+
+    for page_num, text in enumerate(extractor.iter_page_texts(file_path)):
+        text = text.strip()
+        if not text:
+            logger.warning(
+                "페이지 %d에서 텍스트를 추출하지 못했습니다: %s (스캔 이미지일 수 있음)",
+                page_num + 1,
+                file_path.name,
+            )
+            continue
+        yield Document(
+            page_content=text,
+            metadata={"source": file_path.name, "page": page_num + 1},
+        )
+
+
+def _no_text_error(file_name: str) -> ValueError:
+    """텍스트를 추출할 수 없는 PDF에 대한 예외."""
+    return ValueError(
+        f"'{file_name}'에서 텍스트를 추출할 수 없습니다. "
+        "텍스트 기반 PDF인지 확인하세요."
+    )
+
+
+def extract_text_from_pdf(
+    file_path: str | Path,
+    extractor: PdfExtractor | None = None,
+) -> list[Document]:
     """PDF 파일에서 페이지별 텍스트를 추출하여 LangChain Document 목록으로 반환.
 
     Args:
         file_path: PDF 파일 경로.
+        extractor: 추출 백엔드. None이면 PDF_EXTRACTOR 설정값.
 
     Returns:
         페이지별 Document 목록. metadata에 source, page 포함.
@@ -26,35 +106,199 @@ def extract_text_from_pdf(file_path: str | Path) -> list[Document]:
     Raises:
         ValueError: 텍스트를 추출할 수 없는 경우 (빈 PDF 또는 스캔 이미지).
     """
-    file_path = Path(file_path)
-    documents: list[Document] = []
-
-    with open(file_path, "rb") as f:
-        reader = PyPDF2.PdfReader(f)
-        for page_num, page in enumerate(reader.pages):
-            text = page.extract_text() or ""
-            text = text.strip()
-            if not text:
-                logger.warning(
-                    "페이지 %d에서 텍스트를 추출하지 못했습니다: %s (스캔 이미지일 수 있음)",
-                    page_num + 1,
-                    file_path.name,
-                )
+    documents = list(iter_pdf_pages(file_path, extractor))
+    if not documents:
+        raise _no_text_error(Path(file_path).name)
+    return documents
+
+
+def iter_cached_pdf_pages(
+    file_path: str | Path,
+    text_store: PageTextStore | None,
+    extractor: PdfExtractor | None = None,
+    file_hash: str | None = None,
+) -> Iterator[Document]:
+    """페이지 텍스트 저장소를 거쳐 PDF 페이지를 하나씩 반환.
+
+    저장소에 같은 내용·같은 추출기의 기록이 있으면 PDF를 파싱하지 않고 읽고,
+    없으면 추출하면서 저장소에 기록합니다.
+
+    Args:
+        file_path: PDF 파일 경로.
+        text_store: 페이지 텍스트 저장소. None이면 항상 PDF에서 직접 추출.
+        extractor: 추출 백엔드. None이면 PDF_EXTRACTOR 설정값.
+        file_hash: 이미 계산한 파일 내용 해시. None이면 파일을 읽어 계산.
+
+    Yields:
+        페이지 Document. metadata에 source, page 포함.
+    """
+    extractor = extractor or get_extractor()
+    if text_store is None:
+        yield from iter_pdf_pages(file_path, extractor)
+        return
+
+    name = Path(file_path).name
+    file_hash = file_hash or file_content_hash(file_path)
+    cached = text_store.iter_pages(file_hash, extractor.extractor_id)
+    if cached is not None:
+        for page, text in cached:
+            yield Document(page_content=text, metadata={"source": name, "page": page})
+        return
+
+    with text_store.writer(file_hash, extractor.extractor_id) as writer:
+        for document in iter_pdf_pages(file_path, extractor):
+            writer.add(document.metadata["page"], document.page_content)
+            yield document
+
+
+# 머리말/꼬리말 후보로 보는 페이지 앞뒤 줄 수
+_BOILERPLATE_EDGE_LINES = 3
+# 반복 여부를 판단할 최소 페이지 수
+_BOILERPLATE_MIN_PAGES = 3
+# 이보다 긴 줄은 본문으로 간주
+_BOILERPLATE_MAX_LINE = 200
+_DIGITS = re.compile(r"\d+")
+# 페이지 텍스트 저장소 없이 처리할 때 파일별 임시 저장소에 쓰는 키 (파일마다 폴더가 따로이므로 고정값)
+_SPOOL_KEY = "spool"
+
+
+@dataclass
+class BoilerplateStats:
+    """머리말/꼬리말 제거 통계."""
+
+    documents: int = 0
+    lines_removed: int = 0
+    chars_removed: int = 0
+    chars_total: int = 0
+
+    @property
+    def removed_ratio(self) -> float:
+        """제거된 문자 비율."""
+        return self.chars_removed / self.chars_total if self.chars_total else 0.0
+
+    def merge(self, other: "BoilerplateStats") -> None:
+        """다른 통계를 누적."""
+        self.documents += other.documents
+        self.lines_removed += other.lines_removed
+        self.chars_removed += other.chars_removed
+        self.chars_total += other.chars_total
+
+
+def _boilerplate_key(line: str) -> str:
+    """반복 줄 비교용 키 (공백 축약, 숫자는 쪽 번호처럼 달라질 수 있으므로 #로 치환)."""
+    return _DIGITS.sub("#", " ".join(line.split()))
+
+
+def _edge_lines(lines: list[str]) -> list[int]:
+    """페이지의 머리말/꼬리말 영역(비어 있지 않은 앞뒤 줄) 인덱스.
+
+    짧은 페이지에서 본문까지 영역에 들어가지 않도록 양쪽 각각 전체 줄 수의 1/3을 넘지 않습니다.
+    """
+    filled = [i for i, line in enumerate(lines) if line.strip()]
+    edge = min(_BOILERPLATE_EDGE_LINES, max(1, len(filled) // 3))
+    return sorted(set(filled[:edge] + filled[-edge:]))
+
+
+def strip_boilerplate(
+    pages: Iterable[Document] | Callable[[], Iterable[Document]],
+    min_ratio: float = BOILERPLATE_MIN_RATIO,
+    stats: BoilerplateStats | None = None,
+) -> Iterator[Document]:
+    """한 문서의 페이지들에서 반복되는 머리말·꼬리말·저작권 줄을 제거.
+
+    페이지 앞뒤 _BOILERPLATE_EDGE_LINES줄 중 숫자를 무시하고 같은 줄이
+    전체 페이지의 min_ratio 이상에 나타나면 반복 문구로 보고 지웁니다.
+    판단에 문서 전체가 필요하므로 페이지를 두 번 순회합니다. 첫 번째 순회에서는 앞뒤 줄의
+    출현 횟수만 세고, 두 번째 순회에서 페이지를 하나씩 정리해 내보내므로 페이지 텍스트를 쌓아 두지 않습니다.
+
+    Args:
+        pages: 한 문서의 페이지 Document 이터러블, 또는 호출할 때마다 새 페이지 이터러블을 돌려주는 함수
+            (예: partial(iter_cached_pdf_pages, path, text_store) — 두 번째 순회는 텍스트 저장소에서 읽음).
+            한 번만 순회할 수 있는 이터레이터를 주면 문서의 페이지를 모두 메모리에 읽습니다.
+        min_ratio: 반복 문구로 볼 최소 페이지 비율. 0이면 제거하지 않음.
+        stats: 제거 통계를 누적할 객체.
+
+    Yields:
+        반복 문구가 제거된 페이지 Document. 반복 문구만 있던 페이지는 생략.
+    """
+    if callable(pages):
+        open_pages = pages
+    else:
+        open_pages = partial(iter, list(pages) if isinstance(pages, Iterator) else pages)
+
+    boilerplate: set[str] = set()
+    if min_ratio > 0:
+        counts: Counter[str] = Counter()
+        page_count = 0
+        for page in open_pages():
+            page_count += 1
+            lines = page.page_content.splitlines()
+            # 한 줄짜리 페이지는 머리말과 본문을 구분할 수 없으므로 판정에서 제외
+            if sum(1 for line in lines if line.strip()) < 2:
                 continue
-            documents.append(
-                Document(
-                    page_content=text,
-                    metadata={"source": file_path.name, "page": page_num + 1},
-                )
-            )
+            counts.update({
+                _boilerplate_key(lines[i])
+                for i in _edge_lines(lines)
+                if len(lines[i]) <= _BOILERPLATE_MAX_LINE
+            })
+        if page_count >= _BOILERPLATE_MIN_PAGES:
+            min_pages = max(2, math.ceil(min_ratio * page_count))
+            boilerplate = {key for key, count in counts.items() if count >= min_pages}
+
+    source = None
+    lines_removed = chars_removed = chars_total = 0
+    for page in open_pages():
+        if source is None:
+            source = page.metadata.get("source", "unknown")
+        chars_total += len(page.page_content)
+        if boilerplate:
+            lines = page.page_content.splitlines()
+            removed = {i for i in _edge_lines(lines) if _boilerplate_key(lines[i]) in boilerplate}
+            if removed:
+                lines_removed += len(removed)
+                chars_removed += sum(len(lines[i]) for i in removed)
+                text = "\n".join(line for i, line in enumerate(lines) if i not in removed).strip()
+                if not text:
+                    continue
+                page = Document(page_content=text, metadata=page.metadata)
+        yield page
+
+    if stats is not None:
+        stats.merge(BoilerplateStats(1, lines_removed, chars_removed, chars_total))
+    if lines_removed:
+        logger.debug("%s: 반복 머리말/꼬리말 %d줄 제거 (%d자)", source, lines_removed, chars_removed)
+
+
+def iter_chunks(
+    documents: Iterable[Document],
+    chunk_size: int = CHUNK_SIZE,
+    chunk_overlap: int = CHUNK_OVERLAP,
+) -> Iterator[Document]:
+    """Document를 하나씩 받아 청크로 분할하는 제너레이터.
 
-    if not documents:
-        raise ValueError(
-            f"'{file_path.name}'에서 텍스트를 추출할 수 없습니다. "
-            "텍스트 기반 PDF인지 확인하세요."
-        )
+    chunk_id의 순번은 입력 전체에 걸쳐 이어지므로 chunk_documents()와 결과가 같습니다.
 
-    return documents
+    Args:
+        documents: LangChain Document 이터러블 (예: iter_pdf_pages()).
+        chunk_size: 청크당 최대 문자 수.
+        chunk_overlap: 인접 청크 간 겹치는 문자 수.
+
+    Yields:
+        metadata에 chunk_id가 추가된 청크 Document.
+    """
+    splitter = RecursiveCharacterTextSplitter(
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        separators=["\n\n", "\n", " ", ""],
+    )
+    i = 0
+    for document in documents:
+        for chunk in splitter.split_documents([document]):
+            source = chunk.metadata.get("source", "unknown")
+            page = chunk.metadata.get("page", 0)
+            chunk.metadata["chunk_id"] = f"{source}_p{page}_c{i}"
+            i += 1
+            yield chunk
 
 
 def chunk_documents(
@@ -72,87 +316,583 @@ def chunk_documents(
     Returns:
         청킹된 Document 목록. metadata에 chunk_id 추가.
     """
-    splitter = RecursiveCharacterTextSplitter(
-        chunk_size=chunk_size,
-        chunk_overlap=chunk_overlap,
-        separators=["\n\n", "\n", " ", ""],
+    return list(iter_chunks(documents, chunk_size, chunk_overlap))
+
+
+def _iter_document_chunks(
+    file_path: str | Path,
+    text_store: PageTextStore | None = None,
+    extractor: PdfExtractor | None = None,
+    stats: BoilerplateStats | None = None,
+    file_hash: str | None = None,
+) -> Iterator[Document]:
+    """한 PDF 파일의 반복 문구 제거 + 청킹을 페이지 단위로 지연 처리.
+
+    반복 문구 판정을 위해 페이지를 두 번 순회합니다. 첫 번째 순회에서 추출하며 text_store에 기록한
+    텍스트를 두 번째 순회에서 다시 읽으므로 PDF는 한 번만 파싱합니다. text_store가 없으면
+    파일 하나 동안만 쓰는 임시 저장소를 씁니다 (_iter_spooled_chunks()).
+    """
+    if text_store is None:
+        return _iter_spooled_chunks(file_path, extractor, stats)
+    file_hash = file_hash or file_content_hash(file_path)
+    pages = strip_boilerplate(
+        partial(iter_cached_pdf_pages, file_path, text_store, extractor, file_hash), stats=stats
+    )
+    return iter_chunks(pages)
+
+
+def _iter_spooled_chunks(
+    file_path: str | Path,
+    extractor: PdfExtractor | None,
+    stats: BoilerplateStats | None,
+) -> Iterator[Document]:
+    """페이지 텍스트 저장소 없이 처리할 때 페이지 텍스트를 임시 폴더에 기록하며 청킹.
+
+    반복 문구 제거가 꺼져 있으면 페이지를 한 번만 순회하므로 임시 기록 없이 바로 청킹합니다.
+    """
+    if BOILERPLATE_MIN_RATIO <= 0:
+        pages = strip_boilerplate(partial(iter_pdf_pages, file_path, extractor or get_extractor()), stats=stats)
+        yield from iter_chunks(pages)
+        return
+    with tempfile.TemporaryDirectory(prefix="pdf-pages-", ignore_cleanup_errors=True) as spool_dir:
+        yield from _iter_document_chunks(file_path, PageTextStore(spool_dir), extractor, stats, _SPOOL_KEY)
+
+
+def _extract_and_chunk(
+    file_path: str | Path,
+    text_store: PageTextStore | None = None,
+    extractor: PdfExtractor | None = None,
+    file_hash: str | None = None,
+) -> tuple[list[Document], BoilerplateStats] | None:
+    """한 PDF 파일의 텍스트 추출 (프로세스 풀 작업 단위).
+
+    text_store가 있으면 페이지 텍스트를 저장소에 기록만 하고 None을 반환하며, 반복 문구 제거와
+    청킹은 호출한 프로세스가 저장소를 읽으며 페이지 단위로 합니다. 저장소가 없으면 반복 문구 제거와
+    청킹까지 마친 파일 하나의 청크 목록을 돌려주므로, 이때 메모리 사용량은 가장 큰 파일의 청크 수에 비례합니다.
+    """
+    if text_store is not None:
+        if not sum(1 for _ in iter_cached_pdf_pages(file_path, text_store, extractor, file_hash)):
+            raise _no_text_error(Path(file_path).name)
+        return None
+
+    stats = BoilerplateStats()
+    chunks = list(_iter_document_chunks(file_path, None, extractor, stats))
+    if not chunks:
+        raise _no_text_error(Path(file_path).name)
+    return chunks, stats
+
+
+def _iter_pool_results(
+    file_paths: list[str | Path],
+    workers: int,
+    text_store: PageTextStore | None = None,
+    extractor: PdfExtractor | None = None,
+    stats: BoilerplateStats | None = None,
+    file_hashes: dict[str, str] | None = None,
+) -> Iterator[tuple[str, Iterable[Document] | Exception]]:
+    """프로세스 풀에서 파일별로 추출·청킹하고 입력 순서대로 결과를 내보냄.
+
+    text_store가 있으면 워커는 페이지 텍스트를 저장소에 기록하기만 하고, 청크는 저장소에서
+    페이지 단위로 읽으며 지연 생성합니다. 저장소가 없으면 워커가 파일별 청크 목록을 만들어 보냅니다.
+    동시에 진행 중인 파일은 workers의 2배로 제한하여 결과가 메모리에 쌓이지 않게 하고,
+    워커가 비정상 종료되면 해당 파일은 단독 프로세스에서 재시도한 뒤
+    나머지 진행 중 파일은 새 풀에 다시 제출합니다.
+
+    Args:
+        file_paths: PDF 파일 경로 목록.
+        workers: 최대 워커 프로세스 수.
+        text_store: 페이지 텍스트 저장소.
+        extractor: 추출 백엔드.
+        stats: 반복 문구 제거 통계를 누적할 객체.
+        file_hashes: 이미 계산한 {파일명: 내용 해시}. 없는 파일은 필요할 때 계산.
+
+    Yields:
+        (파일명, 청크 이터러블 또는 실패 예외).
+    """
+    max_workers = min(workers, len(file_paths))
+    window = workers * 2
+    hashes = [(file_hashes or {}).get(Path(p).name) for p in file_paths]
+    pool = ProcessPoolExecutor(max_workers=max_workers)
+    pending: deque = deque()
+    next_index = 0
+
+    def _submit(executor: ProcessPoolExecutor, j: int):
+        return executor.submit(_extract_and_chunk, file_paths[j], text_store, extractor, hashes[j])
+
+    try:
+        while pending or next_index < len(file_paths):
+            while next_index < len(file_paths) and len(pending) < window:
+                pending.append((next_index, _submit(pool, next_index)))
+                next_index += 1
+
+            i, future = pending.popleft()
+            try:
+                result = future.result()
+            except BrokenProcessPool:
+                logger.warning("워커 프로세스 비정상 종료, 단독 재시도: %s", Path(file_paths[i]).name)
+                with ProcessPoolExecutor(max_workers=1) as solo:
+                    try:
+                        result = _submit(solo, i).result()
+                    except Exception as e:
+                        result = e
+                pool.shutdown(wait=False, cancel_futures=True)
+                pool = ProcessPoolExecutor(max_workers=max_workers)
+                pending = deque((j, _submit(pool, j)) for j, _ in pending)
+            except Exception as e:
+                result = e
+            if result is None:
+                result = _iter_document_chunks(file_paths[i], text_store, extractor, stats, hashes[i])
+            elif isinstance(result, tuple):
+                result, file_stats = result
+                if stats is not None:
+                    stats.merge(file_stats)
+            yield Path(file_paths[i]).name, result
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _iter_file_chunks(
+    file_paths: list[str | Path],
+    workers: int | None = None,
+    text_store: PageTextStore | None = None,
+    extractor: PdfExtractor | None = None,
+    stats: BoilerplateStats | None = None,
+    file_hashes: dict[str, str] | None = None,
+) -> Iterator[tuple[str, Iterable[Document] | Exception]]:
+    """파일별 청크 스트림(반복 머리말/꼬리말 제거 후 청킹)을 입력 순서대로 내보냄.
+
+    workers가 2 이상이고 파일이 여러 개이면 프로세스 풀에서 병렬로 처리하고,
+    아니면 현재 프로세스에서 페이지 단위로 지연 처리합니다.
+    chunk_id는 파일 단위로 매겨지므로 처리 방식과 무관하게 동일합니다.
+
+    Args:
+        file_paths: PDF 파일 경로 목록.
+        workers: 최대 워커 프로세스 수. None이면 PDF_WORKERS 설정값.
+        text_store: 페이지 텍스트 저장소. None이면 항상 PDF에서 직접 추출.
+        extractor: 추출 백엔드. None이면 PDF_EXTRACTOR 설정값.
+        stats: 반복 문구 제거 통계를 누적할 객체.
+        file_hashes: 이미 계산한 {파일명: 내용 해시}. 없는 파일은 필요할 때 계산.
+
+    Yields:
+        (파일명, 청크 이터러블 또는 실패 예외). 지연 처리되는 파일의 예외는 순회 중에 발생할 수 있음.
+    """
+    workers = PDF_WORKERS if workers is None else workers
+    extractor = extractor or get_extractor()
+    if workers > 1 and len(file_paths) > 1:
+        yield from _iter_pool_results(file_paths, workers, text_store, extractor, stats, file_hashes)
+    else:
+        for path in file_paths:
+            name = Path(path).name
+            yield name, _iter_document_chunks(path, text_store, extractor, stats, (file_hashes or {}).get(name))
+
+
+def _log_cache_stats() -> None:
+    """임베딩 캐시 적중/미스 현황 로그."""
+    cache = get_embedding_cache()
+    if cache is None:
+        return
+    stats = cache.stats()
+    logger.info(
+        "임베딩 캐시: 적중 %d / 미스 %d (적중률 %.0f%%), %d개 항목 %.1fMB",
+        stats.hits,
+        stats.misses,
+        stats.hit_rate * 100,
+        stats.entries,
+        stats.size_bytes / (1024 * 1024),
     )
-    chunks = splitter.split_documents(documents)
 
-    # chunk_id 추가
-    for i, chunk in enumerate(chunks):
-        source = chunk.metadata.get("source", "unknown")
-        page = chunk.metadata.get("page", 0)
-        chunk.metadata["chunk_id"] = f"{source}_p{page}_c{i}"
 
-    return chunks
+class _StreamingIndexer:
+    """청크를 INDEX_BATCH_CHUNKS 단위로 임베딩하여 FAISS 인덱스에 바로 추가.
+
+    dedup이 주어지면 이미 인덱스에 있거나 대기 중인 청크와 거의 같은 청크는 임베딩하지 않고,
+    그 출처를 남은 청크의 metadata["provenance"]에 합칩니다.
+    처리 도중 실패한 파일은 이미 추가된 청크까지 인덱스에서 제거합니다.
+    페이지는 파일 단위로 쌓지 않고 하나씩 청킹하므로 메모리에 머무는 청크는 batch_size개 안팎입니다
+    (텍스트 저장소 없이 프로세스 풀로 추출할 때만 파일 하나의 청크 목록 단위).
+    """
+
+    def __init__(
+        self,
+        embedding: Embeddings,
+        vectorstore: FAISS | None = None,
+        batch_size: int = INDEX_BATCH_CHUNKS,
+        text_store: PageTextStore | None = None,
+        extractor: PdfExtractor | None = None,
+        dedup: MinHashDeduplicator | None = None,
+    ) -> None:
+        self.embedding = embedding
+        self.vectorstore = vectorstore
+        self.text_store = text_store
+        self.extractor = extractor
+        self.dedup = dedup
+        self.batch_size = max(1, batch_size)
+        self.file_chunks: dict[str, list[str]] = {}
+        # {파일명: 그 파일의 중복 청크가 병합된, 다른 파일 소유 청크 ID 목록}
+        self.file_refs: dict[str, list[str]] = {}
+        self.failed_files: list[str] = []
+        self.added = 0
+        self.merged = 0
+        self.boilerplate = BoilerplateStats()
+        self._pending: dict[str, Document] = {}
+
+        if isinstance(embedding, BatchedEmbeddings):
+            logger.warning(
+                "임베딩 캐시가 꺼져 있어(EMBEDDING_CACHE_MAX_MB=0) 배치 체크포인트 없이 인덱싱합니다. "
+                "중간에 실패하면 완료된 배치도 다시 임베딩합니다."
+            )
+        if dedup is not None and vectorstore is not None:
+            for chunk_id in vectorstore.index_to_docstore_id.values():
+                dedup.add(chunk_id, dedup.signature(vectorstore.docstore.search(chunk_id).page_content))
+
+    def add_files(
+        self,
+        file_paths: list[str | Path],
+        workers: int | None = None,
+        file_hashes: dict[str, str] | None = None,
+    ) -> None:
+        """파일들의 청크를 스트리밍으로 인덱스에 추가 (file_hashes: 이미 계산한 {파일명: 내용 해시})."""
+        for name, chunks in _iter_file_chunks(
+            file_paths, workers, self.text_store, self.extractor, self.boilerplate, file_hashes
+        ):
+            self.file_chunks[name] = []
+            try:
+                if isinstance(chunks, Exception):
+                    raise chunks
+                merged = 0
+                for chunk in chunks:
+                    if self._merge_duplicate(name, chunk):
+                        merged += 1
+                        continue
+                    self._pending[chunk.metadata["chunk_id"]] = chunk
+                    self.file_chunks[name].append(chunk.metadata["chunk_id"])
+                    if len(self._pending) >= self.batch_size:
+                        self.flush()
+                if not self.file_chunks[name] and not merged:
+                    raise _no_text_error(name)
+                self.merged += merged
+                logger.info("%s: %d개 청크 생성 (중복 병합 %d개)", name, len(self.file_chunks[name]), merged)
+            except Exception as e:
+                logger.warning("파일 처리 실패: %s (%s)", name, e)
+                self._discard(name)
+                self.failed_files.append(name)
+
+    def flush(self) -> None:
+        """대기 중인 청크를 임베딩하여 인덱스에 추가."""
+        if not self._pending:
+            return
+        texts = [c.page_content for c in self._pending.values()]
+        metadatas = [c.metadata for c in self._pending.values()]
+        ids = list(self._pending)
+        vectors = self.embedding.embed_documents(texts)
+
+        if self.vectorstore is None:
+            self.vectorstore = FAISS.from_embeddings(
+                zip(texts, vectors), self.embedding, metadatas=metadatas, ids=ids
+            )
+        else:
+            self.vectorstore.add_embeddings(zip(texts, vectors), metadatas=metadatas, ids=ids)
+        self.added += len(ids)
+        self._pending = {}
+
+    def _merge_duplicate(self, name: str, chunk: Document) -> bool:
+        """준중복 청크이면 출처만 기존 청크에 병합하고 True, 아니면 서명을 등록하고 False."""
+        if self.dedup is None:
+            return False
+        signature = self.dedup.signature(chunk.page_content)
+        match = self.dedup.find(signature)
+        if match is None:
+            self.dedup.add(chunk.metadata["chunk_id"], signature)
+            return False
+
+        target = self._lookup(match)
+        add_provenance(target.metadata, chunk.metadata.get("source", name), chunk.metadata.get("page", 0))
+        if target.metadata.get("source") != name:
+            refs = self.file_refs.setdefault(name, [])
+            if match not in refs:
+                refs.append(match)
+        return True
+
+    def _lookup(self, chunk_id: str) -> Document:
+        """대기 중이거나 인덱스에 추가된 청크 Document (metadata를 제자리 수정할 수 있음)."""
+        if chunk_id in self._pending:
+            return self._pending[chunk_id]
+        return self.vectorstore.docstore.search(chunk_id)
+
+    def _discard(self, name: str) -> None:
+        """실패한 파일의 대기 중/추가된 청크와 다른 청크에 병합된 출처를 제거."""
+        ids = set(self.file_chunks.pop(name, []))
+        for chunk_id in self.file_refs.pop(name, []):
+            remove_provenance(self._lookup(chunk_id).metadata, name)
+        if self.dedup is not None:
+            for chunk_id in ids:
+                self.dedup.remove(chunk_id)
+        self._pending = {k: c for k, c in self._pending.items() if k not in ids}
+        if self.vectorstore is not None:
+            stored = ids.intersection(self.vectorstore.index_to_docstore_id.values())
+            if stored:
+                self.vectorstore.delete(list(stored))
+                self.added -= len(stored)
+
+
+def _log_boilerplate_stats(stats: BoilerplateStats) -> None:
+    """반복 머리말/꼬리말 제거 현황 로그."""
+    if not stats.documents:
+        return
+    logger.info(
+        "반복 머리말/꼬리말 제거: %d개 문서에서 %d줄, %d자 (%.1f%%)",
+        stats.documents,
+        stats.lines_removed,
+        stats.chars_removed,
+        stats.removed_ratio * 100,
+    )
+
+
+def _no_chunks_error(failed_files: list[str]) -> ValueError:
+    """처리 가능한 PDF가 하나도 없을 때의 예외."""
+    return ValueError(
+        "처리 가능한 PDF가 없습니다. "
+        f"실패한 파일: {', '.join(failed_files) if failed_files else '없음'}"
+    )
+
+
+def _update_vectorstore(
+    file_paths: list[str | Path],
+    file_hashes: dict[str, str],
+    fingerprint: str,
+    index_dir: str | Path,
+    embedding: Embeddings,
+    extractor: PdfExtractor,
+    embedding_model: str,
+) -> FAISS | None:
+    """저장된 인덱스에 신규/변경 파일만 임베딩하고, 삭제/변경된 파일의 벡터를 제거.
+
+    Args:
+        file_paths: 현재 PDF 파일 경로 목록.
+        file_hashes: {파일명: 내용 해시}.
+        fingerprint: 현재 코퍼스 fingerprint.
+        index_dir: 인덱스 저장 폴더.
+        embedding: 임베딩 인스턴스.
+        extractor: 추출 백엔드.
+        embedding_model: 임베딩 식별자 (저장된 인덱스와 같아야 재사용).
+
+    Returns:
+        갱신된 FAISS 벡터스토어. 재사용할 인덱스가 없으면 None.
+
+    Raises:
+        ValueError: 갱신 후 인덱스에 남은 청크가 없는 경우.
+    """
+    loaded = load_index_for_update(index_dir, embedding, extractor.extractor_id, embedding_model)
+    if loaded is None:
+        return None
+    vectorstore, manifest = loaded
+
+    old_hashes: dict[str, str] = manifest["files"]
+    file_chunks: dict[str, list[str]] = manifest["file_chunks"]
+    file_refs: dict[str, list[str]] = manifest.get("file_refs", {})
+    paths_by_name = {Path(p).name: p for p in file_paths}
+
+    # 변경된 파일은 stale(기존 벡터 삭제)과 fresh(재임베딩) 양쪽에 포함
+    stale = [name for name, h in old_hashes.items() if file_hashes.get(name) != h]
+    fresh = [name for name, h in file_hashes.items() if old_hashes.get(name) != h]
+    stale_ids = {cid for name in stale for cid in file_chunks.get(name, [])}
+
+    # 중복 청크를 stale 청크에 병합해 둔 파일은 내용이 그대로여도 다시 처리해야 함
+    while peers := [
+        name for name in old_hashes
+        if name not in stale and stale_ids.intersection(file_refs.get(name, []))
+    ]:
+        stale.extend(peers)
+        fresh.extend(peers)
+        stale_ids.update(cid for name in peers for cid in file_chunks.get(name, []))
+
+    try:
+        if stale_ids:
+            vectorstore.delete(list(stale_ids))
+    except ValueError as e:
+        # manifest와 인덱스가 어긋난 경우 — 전체 재구축으로 복구
+        logger.warning("증분 인덱싱 실패, 전체 재구축합니다: %s", e)
+        return None
+
+    # 남은 청크에 병합되어 있던 stale 파일의 출처 제거
+    for name in stale:
+        for cid in file_refs.pop(name, []):
+            if cid not in stale_ids:
+                remove_provenance(vectorstore.docstore.search(cid).metadata, name)
+
+    indexer = _StreamingIndexer(
+        embedding,
+        vectorstore,
+        text_store=get_text_store(),
+        extractor=extractor,
+        dedup=create_deduplicator(),
+    )
+    indexer.add_files([paths_by_name[n] for n in fresh if n in paths_by_name], file_hashes=file_hashes)
+    indexer.flush()
+
+    if vectorstore.index.ntotal == 0:
+        raise _no_chunks_error(indexer.failed_files)
+
+    for name in stale:
+        file_chunks.pop(name, None)
+    file_chunks.update(indexer.file_chunks)
+    file_chunks.update({name: [] for name in indexer.failed_files})
+    file_refs.update(indexer.file_refs)
+
+    deleted = manifest.get("deleted_since_compaction", 0) + len(stale_ids)
+    if needs_compaction(deleted, vectorstore.index.ntotal):
+        compact_index(vectorstore)
+        deleted = 0
+    flat_index = vectorstore.index
+    if optimize_index(vectorstore):
+        # 근사 인덱스는 남은 벡터로 새로 만들어지므로 삭제 누적분도 사라짐
+        deleted = 0
+
+    if indexer.failed_files:
+        logger.warning("처리 실패한 파일: %s", ", ".join(indexer.failed_files))
+    logger.info(
+        "증분 인덱싱 완료: 추가/변경 %d개 파일(%d개 청크, 중복 병합 %d개), 제거 %d개 청크, 총 %d개 청크",
+        len(fresh),
+        indexer.added,
+        indexer.merged,
+        len(stale_ids),
+        vectorstore.index.ntotal,
+    )
+    _log_boilerplate_stats(indexer.boilerplate)
+    _log_cache_stats()
+
+    save_index(
+        vectorstore, index_dir, fingerprint, file_hashes, file_chunks, deleted,
+        extractor_id=extractor.extractor_id,
+        file_refs=file_refs,
+        embedding_model=embedding_model,
+        original_index=flat_index,
+    )
+    reopen_saved_index(vectorstore, index_dir)
+    return vectorstore
 
 
 def build_vectorstore(
     file_paths: list[str | Path],
     api_key: str,
+    index_dir: str | Path | None = None,
+    incremental: bool = False,
+    extractor: str | None = None,
+    embedding_provider: str | None = None,
 ) -> FAISS:
-    """PDF 파일들을 읽어 FAISS 인메모리 벡터스토어를 구축.
+    """PDF 파일들을 읽어 FAISS 벡터스토어를 구축.
+
+    index_dir가 주어지면 코퍼스 fingerprint(PDF 내용 해시, 추출 백엔드, 청킹 설정, 임베딩 모델)가
+    일치하는 저장된 인덱스를 재사용하고, 새로 구축한 인덱스는 그 폴더에 저장합니다.
+    incremental=True이면 fingerprint가 달라도 저장된 인덱스를 기준으로
+    신규/변경 파일만 임베딩하고 삭제/변경된 파일의 벡터를 제거합니다.
+    벡터 수가 INDEX_ANN_MIN_VECTORS 이상이면 INDEX_TYPE(hnsw/ivf) 근사 검색 인덱스로 변환합니다.
 
     Args:
         file_paths: PDF 파일 경로 목록.
-        api_key: Google API 키.
+        api_key: Google API 키. API 키가 필요 없는 임베딩 제공자(local)면 비워도 됨.
+        index_dir: 인덱스 저장 폴더. None이면 인메모리 전용 (세션 종료 시 휘발).
+        incremental: 저장된 인덱스를 증분 갱신할지 여부 (index_dir 필요).
+        extractor: PDF 추출 백엔드 이름 (products.json의 pdf_extractor). None이면 PDF_EXTRACTOR 설정값.
+        embedding_provider: 임베딩 제공자 이름 (products.json의 embedding_provider).
+            None이면 EMBEDDING_PROVIDER 설정값.
 
     Returns:
-        FAISS 벡터스토어 인스턴스 (인메모리, 세션 종료 시 휘발).
+        FAISS 벡터스토어 인스턴스. index_dir가 있으면 청크는 읽기 전용 디스크 docstore에서 읽고
+        (INDEX_MMAP이면 인덱스도 읽기 전용 메모리 매핑), 벡터를 직접 추가·삭제하지 말고
+        build_vectorstore(incremental=True)로 갱신합니다.
 
     Raises:
-        ValueError: API 키가 없거나 모든 PDF에서 텍스트 추출에 실패한 경우.
+        ValueError: 임베딩 제공자에 필요한 API 키가 없거나, 알 수 없는 추출 백엔드·임베딩 제공자이거나,
+            모든 PDF에서 텍스트 추출에 실패한 경우.
     """
-    if not api_key:
+    provider = get_embedding_provider(embedding_provider)
+    if provider.requires_api_key and not api_key:
         raise ValueError("Google API 키가 필요합니다.")
 
-    all_chunks: list[Document] = []
-    failed_files: list[str] = []
+    pdf_extractor = get_extractor(extractor)
+    embedding = provider.create(api_key)
 
-    for path in file_paths:
-        try:
-            docs = extract_text_from_pdf(path)
-            chunks = chunk_documents(docs)
-            all_chunks.extend(chunks)
-            logger.info("%s: %d개 청크 생성", Path(path).name, len(chunks))
-        except ValueError as e:
-            logger.warning("파일 처리 실패: %s", e)
-            failed_files.append(str(path))
-
-    if not all_chunks:
-        raise ValueError(
-            "처리 가능한 PDF가 없습니다. "
-            f"실패한 파일: {', '.join(failed_files) if failed_files else '없음'}"
+    file_hashes: dict[str, str] | None = None
+    if index_dir is not None:
+        file_hashes = {Path(p).name: file_content_hash(p) for p in file_paths}
+        fingerprint = compute_corpus_fingerprint(
+            file_hashes, embedding_model=provider.model_id, extractor_id=pdf_extractor.extractor_id
         )
+        cached = load_index(index_dir, fingerprint, embedding)
+        if cached is not None:
+            return cached
+        if incremental:
+            updated = _update_vectorstore(
+                file_paths, file_hashes, fingerprint, index_dir, embedding, pdf_extractor, provider.model_id
+            )
+            if updated is not None:
+                return updated
+
+    indexer = _StreamingIndexer(
+        embedding,
+        text_store=get_text_store(),
+        extractor=pdf_extractor,
+        dedup=create_deduplicator(),
+    )
+    indexer.add_files(file_paths, file_hashes=file_hashes)
+    indexer.flush()
+    vectorstore = indexer.vectorstore
+
+    if vectorstore is None or vectorstore.index.ntotal == 0:
+        raise _no_chunks_error(indexer.failed_files)
 
-    if failed_files:
-        logger.warning("처리 실패한 파일: %s", ", ".join(failed_files))
+    if indexer.failed_files:
+        logger.warning("처리 실패한 파일: %s", ", ".join(indexer.failed_files))
 
-    embedding = GoogleGenerativeAIEmbeddings(
-        model=EMBEDDING_MODEL,
-        google_api_key=api_key,
+    logger.info(
+        "FAISS 벡터스토어 구축 완료: 총 %d개 청크 (중복 병합 %d개)",
+        vectorstore.index.ntotal,
+        indexer.merged,
     )
-    vectorstore = FAISS.from_documents(all_chunks, embedding)
-    logger.info("FAISS 벡터스토어 구축 완료: 총 %d개 청크", len(all_chunks))
+    _log_boilerplate_stats(indexer.boilerplate)
+    _log_cache_stats()
+
+    flat_index = vectorstore.index
+    optimize_index(vectorstore)
+
+    if index_dir is not None:
+        file_chunks = {**indexer.file_chunks, **{name: [] for name in indexer.failed_files}}
+        save_index(
+            vectorstore, index_dir, fingerprint, file_hashes, file_chunks,
+            extractor_id=pdf_extractor.extractor_id,
+            file_refs=indexer.file_refs,
+            embedding_model=provider.model_id,
+            original_index=flat_index,
+        )
+        reopen_saved_index(vectorstore, index_dir)
+
     return vectorstore
 
 
-def count_chunks_from_paths(file_paths: list[str | Path]) -> int:
+def count_chunks_from_paths(
+    file_paths: list[str | Path],
+    extractor: str | None = None,
+) -> int:
     """PDF 파일들에서 예상 청크 수를 계산 (인덱싱 전 미리보기용).
 
+    페이지 텍스트 저장소를 사용하므로, 여기서 추출한 텍스트는 이후 인덱스 구축에서 재사용됩니다.
+
     Args:
         file_paths: PDF 파일 경로 목록.
+        extractor: PDF 추출 백엔드 이름. None이면 PDF_EXTRACTOR 설정값.
 
     Returns:
         예상 총 청크 수.
     """
+    text_store = get_text_store()
+    pdf_extractor = get_extractor(extractor)
     total = 0
     for path in file_paths:
         try:
-            docs = extract_text_from_pdf(path)
-            chunks = chunk_documents(docs)
-            total += len(chunks)
+            total += sum(1 for _ in _iter_document_chunks(path, text_store, pdf_extractor))
         except ValueError:
             pass
+        except Exception as e:
+            logger.warning("청크 수 계산 실패: %s (%s)", Path(path).name, e)
     return total
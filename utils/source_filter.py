@@ -0,0 +1,105 @@
+"""출처 문서 분류별 청크 파티션 (메타데이터 사전 필터 검색용).
+
+청크 metadata의 source(중복 병합된 청크는 provenance의 모든 출처)를 파일명 패턴으로
+문서 분류(label, pivotal, hta, ...)에 배정하고, 분류별 FAISS 인덱스 위치를 미리 모아 둡니다.
+분류는 질의 시점에 계산하므로 패턴을 바꿔도 인덱스를 다시 만들 필요가 없습니다.
+"""
+
+import fnmatch
+import logging
+from collections.abc import Iterable, Iterator
+from pathlib import PurePath
+
+import numpy as np
+from langchain_community.vectorstores import FAISS
+
+from config.source_classes import OTHER_SOURCE_CLASS, SOURCE_CLASS_PATTERNS
+from utils.chunk_store import SqliteDocstore
+
+logger = logging.getLogger(__name__)
+
+
+def classify_source(source: str, patterns: dict[str, list[str]] | None = None) -> str:
+    """파일명을 문서 분류로 배정.
+
+    Args:
+        source: 청크 metadata의 source (파일명 또는 경로).
+        patterns: 분류 → 파일명 glob 패턴 목록. None이면 SOURCE_CLASS_PATTERNS.
+
+    Returns:
+        처음으로 패턴이 맞는 분류. 맞는 분류가 없으면 OTHER_SOURCE_CLASS.
+    """
+    name = PurePath(source.replace("\\", "/")).name.lower()
+    for doc_class, globs in (patterns or SOURCE_CLASS_PATTERNS).items():
+        if any(fnmatch.fnmatchcase(name, glob.lower()) for glob in globs):
+            return doc_class
+    return OTHER_SOURCE_CLASS
+
+
+def _iter_chunk_metadata(vectorstore: FAISS) -> Iterator[tuple[int, str, dict]]:
+    """(인덱스 위치, 청크 ID, metadata) — 디스크 docstore는 본문을 읽지 않음."""
+    docstore = vectorstore.docstore
+    if isinstance(docstore, SqliteDocstore):
+        yield from docstore.metadata_rows()
+        return
+    for pos, doc_id in vectorstore.index_to_docstore_id.items():
+        yield pos, doc_id, docstore.search(doc_id).metadata
+
+
+class SourcePartitions:
+    """문서 분류별 청크의 인덱스 위치와 청크 ID."""
+
+    def __init__(self, members: dict[str, list[tuple[int, str]]]) -> None:
+        """SourcePartitions 초기화.
+
+        Args:
+            members: 분류 → [(인덱스 위치, 청크 ID)].
+        """
+        self._positions = {
+            doc_class: np.array(sorted(pos for pos, _ in items), dtype=np.int64)
+            for doc_class, items in members.items()
+        }
+        self._ids = {doc_class: {doc_id for _, doc_id in items} for doc_class, items in members.items()}
+
+    @classmethod
+    def from_vectorstore(
+        cls,
+        vectorstore: FAISS,
+        patterns: dict[str, list[str]] | None = None,
+    ) -> "SourcePartitions":
+        """벡터스토어의 청크 metadata로 분류별 파티션 구성.
+
+        중복 병합된 청크는 provenance에 있는 모든 출처의 분류에 속합니다.
+
+        Args:
+            vectorstore: 인덱싱된 FAISS 벡터스토어.
+            patterns: 분류 → 파일명 glob 패턴 목록 (products.json의 source_classes). None이면 기본값.
+        """
+        members: dict[str, list[tuple[int, str]]] = {}
+        for pos, doc_id, metadata in _iter_chunk_metadata(vectorstore):
+            origins = metadata.get("provenance") or [metadata]
+            classes = {classify_source(str(origin.get("source", "")), patterns) for origin in origins}
+            for doc_class in classes:
+                members.setdefault(doc_class, []).append((pos, doc_id))
+        partitions = cls(members)
+        logger.info(
+            "문서 분류별 청크 수: %s",
+            ", ".join(f"{c}={len(p)}" for c, p in sorted(partitions._positions.items())),
+        )
+        return partitions
+
+    @property
+    def classes(self) -> list[str]:
+        """청크가 하나 이상 있는 분류."""
+        return sorted(self._positions)
+
+    def positions(self, doc_classes: Iterable[str]) -> np.ndarray:
+        """분류들에 속한 청크의 인덱스 위치 (정렬, 중복 없음). 해당 청크가 없으면 빈 배열."""
+        arrays = [self._positions[c] for c in doc_classes if c in self._positions]
+        if not arrays:
+            return np.empty(0, dtype=np.int64)
+        return np.unique(np.concatenate(arrays))
+
+    def ids(self, doc_classes: Iterable[str]) -> set[str]:
+        """분류들에 속한 청크 ID."""
+        return set().union(*(self._ids.get(c, set()) for c in doc_classes))
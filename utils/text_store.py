@@ -0,0 +1,95 @@
+"""PDF 페이지별 추출 텍스트의 디스크 저장소.
+
+(파일 내용 해시, 추출기 버전)을 키로 페이지 텍스트를 gzip JSON Lines로 저장하여,
+청크 수 미리보기·인덱스 구축·청크 크기 변경 후 재구축이 PDF를 다시 파싱하지 않게 합니다.
+"""
+
+import gzip
+import json
+import logging
+import os
+from collections.abc import Iterator
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+
+from config.settings import TEXT_CACHE_DIR, TEXT_CACHE_ENABLED
+
+logger = logging.getLogger(__name__)
+
+
+class PageTextWriter:
+    """PageTextStore.writer()가 반환하는 페이지 기록기."""
+
+    def __init__(self, file) -> None:
+        self._file = file
+        self.pages = 0
+
+    def add(self, page: int, text: str) -> None:
+        """페이지 텍스트 한 건 기록."""
+        line = json.dumps({"page": page, "text": text}, ensure_ascii=False)
+        self._file.write(line + "\n")
+        self.pages += 1
+
+
+class PageTextStore:
+    """파일 내용 해시 기준 페이지 텍스트 저장소.
+
+    경로만 보관하므로 프로세스 풀 워커로 그대로 전달할 수 있습니다.
+    """
+
+    def __init__(self, root: str | Path) -> None:
+        """PageTextStore 초기화.
+
+        Args:
+            root: 저장 폴더.
+        """
+        self.root = Path(root)
+
+    def path_for(self, file_hash: str, extractor_id: str) -> Path:
+        """저장 파일 경로 (해시 앞 2자리로 하위 폴더 분산)."""
+        return self.root / file_hash[:2] / f"{file_hash}.{extractor_id}.jsonl.gz"
+
+    def iter_pages(self, file_hash: str, extractor_id: str) -> Iterator[tuple[int, str]] | None:
+        """저장된 페이지 텍스트를 하나씩 읽는 이터레이터.
+
+        Returns:
+            (페이지 번호, 텍스트) 이터레이터. 저장된 항목이 없으면 None.
+        """
+        path = self.path_for(file_hash, extractor_id)
+        if not path.exists():
+            return None
+        return self._read(path)
+
+    @contextmanager
+    def writer(self, file_hash: str, extractor_id: str) -> Iterator[PageTextWriter]:
+        """페이지 텍스트 기록 컨텍스트.
+
+        정상 종료된 경우에만 최종 경로로 교체하므로, 추출 도중 실패하거나
+        중단된 파일은 저장소에 남지 않습니다.
+        """
+        path = self.path_for(file_hash, extractor_id)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+                writer = PageTextWriter(f)
+                yield writer
+            os.replace(tmp_path, path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+    @staticmethod
+    def _read(path: Path) -> Iterator[tuple[int, str]]:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                record = json.loads(line)
+                yield record["page"], record["text"]
+
+
+@lru_cache(maxsize=None)
+def get_text_store() -> PageTextStore | None:
+    """설정 기반 공용 PageTextStore. TEXT_CACHE_ENABLED가 꺼져 있으면 None."""
+    if not TEXT_CACHE_ENABLED:
+        return None
+    return PageTextStore(TEXT_CACHE_DIR)